@@ -0,0 +1,24 @@
+-- Schedule version used to invalidate cached utilization reports
+CREATE TABLE IF NOT EXISTS schedule_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO schedule_version DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+CREATE OR REPLACE FUNCTION bump_schedule_version() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE schedule_version SET version = version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bookings_schedule_version ON bookings;
+CREATE TRIGGER bookings_schedule_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bookings
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version();
+
+DROP TRIGGER IF EXISTS class_schedule_schedule_version ON class_schedule;
+CREATE TRIGGER class_schedule_schedule_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON class_schedule
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version();
@@ -0,0 +1,64 @@
+-- Converts the original heap payments table into monthly range partitions with billing periods
+ALTER TABLE payments ADD COLUMN IF NOT EXISTS billing_period DATE;
+DROP INDEX IF EXISTS payments_email_billing_period_key;
+
+ALTER TABLE payments RENAME CONSTRAINT payments_pkey TO payments_heap_pkey;
+ALTER TABLE payments RENAME CONSTRAINT payments_email_fkey TO payments_heap_email_fkey;
+ALTER TABLE payments RENAME TO payments_heap;
+ALTER SEQUENCE payments_payment_id_seq OWNED BY NONE;
+
+CREATE TABLE payments (
+    payment_id INT NOT NULL DEFAULT nextval('payments_payment_id_seq'),
+    email VARCHAR(255) REFERENCES member_accounts(email),
+    amount DECIMAL(10, 2) NOT NULL,
+    payment_date DATE NOT NULL,
+    payment_type VARCHAR(255) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    billing_period DATE,
+    PRIMARY KEY (payment_id, payment_date)
+) PARTITION BY RANGE (payment_date);
+
+ALTER SEQUENCE payments_payment_id_seq OWNED BY payments.payment_id;
+
+CREATE TABLE payments_default PARTITION OF payments DEFAULT;
+
+CREATE INDEX payments_email_idx ON payments (email);
+CREATE INDEX payments_status_idx ON payments (status, payment_date);
+CREATE UNIQUE INDEX payments_email_billing_period_key ON payments (email, billing_period, payment_date);
+
+CREATE OR REPLACE FUNCTION create_payment_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    first_day DATE := date_trunc('month', month_start)::DATE;
+    next_day DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'payments_' || to_char(date_trunc('month', month_start), 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE payments INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM payments_default WHERE payment_date >= %L AND payment_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved', first_day, next_day, partition_name);
+    EXECUTE format('ALTER TABLE payments ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, first_day, next_day);
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT create_payment_partition(month)
+FROM (SELECT DISTINCT date_trunc('month', payment_date)::DATE AS month FROM payments_heap) months;
+
+INSERT INTO payments (payment_id, email, amount, payment_date, payment_type, status, billing_period)
+SELECT payment_id, email, amount, payment_date, payment_type, status, billing_period FROM payments_heap;
+
+DROP TABLE payments_heap;
+
+CREATE TABLE IF NOT EXISTS payment_archives (
+    partition_name TEXT PRIMARY KEY,
+    range_start DATE NOT NULL,
+    range_end DATE NOT NULL,
+    row_count BIGINT NOT NULL,
+    file_path TEXT NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
@@ -0,0 +1,8 @@
+-- Supporting indexes for foreign keys and the app's filter columns
+CREATE INDEX IF NOT EXISTS bookings_room_id_idx ON bookings (room_id);
+CREATE INDEX IF NOT EXISTS bookings_trainer_id_idx ON bookings (trainer_id);
+CREATE INDEX IF NOT EXISTS equipment_room_id_idx ON equipment (room_id, equipment_id);
+CREATE INDEX IF NOT EXISTS equipment_quality_idx ON equipment (quality);
+CREATE INDEX IF NOT EXISTS class_schedule_trainer_id_idx ON class_schedule (trainer_id);
+CREATE INDEX IF NOT EXISTS class_schedule_room_id_idx ON class_schedule (room_id);
+CREATE INDEX IF NOT EXISTS member_accounts_name_idx ON member_accounts (name);
@@ -0,0 +1,41 @@
+-- Achievements become bits of one BIGINT, described by an extensible catalog
+CREATE TABLE IF NOT EXISTS achievement_catalog (
+    achievement_id SMALLINT PRIMARY KEY CHECK (achievement_id BETWEEN 0 AND 62),
+    name VARCHAR(255) NOT NULL UNIQUE
+);
+
+INSERT INTO achievement_catalog (achievement_id, name) VALUES
+    (0, 'First fitness goal achieved'),
+    (1, 'Never skipped leg day'),
+    (2, 'Can do pushup'),
+    (3, 'Can do pullup'),
+    (4, 'Can touch toes'),
+    (5, 'Achieved weight loss goal'),
+    (6, 'Achieved muscle gain goal')
+ON CONFLICT DO NOTHING;
+
+ALTER TABLE fitness_achievements ADD COLUMN bits BIGINT NOT NULL DEFAULT 0;
+
+UPDATE fitness_achievements SET bits =
+    (CASE WHEN first_fitness_goal_achieved THEN 1 ELSE 0 END)
+    | (CASE WHEN never_skipped_leg_day THEN 2 ELSE 0 END)
+    | (CASE WHEN can_do_pushup THEN 4 ELSE 0 END)
+    | (CASE WHEN can_do_pullup THEN 8 ELSE 0 END)
+    | (CASE WHEN can_touch_toes THEN 16 ELSE 0 END)
+    | (CASE WHEN achieved_weight_loss_goal THEN 32 ELSE 0 END)
+    | (CASE WHEN achieved_muscle_gain_goal THEN 64 ELSE 0 END);
+
+ALTER TABLE fitness_achievements
+    DROP COLUMN first_fitness_goal_achieved,
+    DROP COLUMN never_skipped_leg_day,
+    DROP COLUMN can_do_pushup,
+    DROP COLUMN can_do_pullup,
+    DROP COLUMN can_touch_toes,
+    DROP COLUMN achieved_weight_loss_goal,
+    DROP COLUMN achieved_muscle_gain_goal;
+
+CREATE OR REPLACE FUNCTION achievement_ids(bits BIGINT) RETURNS INT[] AS $$
+    SELECT COALESCE(array_agg(id), '{}') FROM generate_series(0, 62) id WHERE bits & (1::BIGINT << id) <> 0
+$$ LANGUAGE SQL IMMUTABLE;
+
+CREATE INDEX IF NOT EXISTS fitness_achievements_ids_idx ON fitness_achievements USING GIN (achievement_ids(bits));
@@ -0,0 +1,80 @@
+-- Leaderboard Entries (one row per member, ranked stat and cohort, kept in step with health_statistics by triggers
+-- so a leaderboard page is an index range scan instead of a sort over the whole club)
+CREATE TABLE IF NOT EXISTS leaderboard_entries (
+    stat VARCHAR(50) NOT NULL,
+    cohort VARCHAR(50) NOT NULL, -- 'all', 'gender:<gender>' or 'age:<band>'
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    score INT NOT NULL,
+    PRIMARY KEY (stat, cohort, email)
+);
+
+CREATE INDEX IF NOT EXISTS leaderboard_entries_rank_idx ON leaderboard_entries (stat, cohort, score, email);
+CREATE INDEX IF NOT EXISTS leaderboard_entries_email_idx ON leaderboard_entries (email);
+
+CREATE OR REPLACE FUNCTION age_band(age INT) RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN age IS NULL THEN NULL
+        WHEN age < 18 THEN 'under 18'
+        WHEN age < 30 THEN '18-29'
+        WHEN age < 40 THEN '30-39'
+        WHEN age < 50 THEN '40-49'
+        WHEN age < 60 THEN '50-59'
+        ELSE '60+'
+    END
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Rewrites one member's entries from their current stats, gender and age
+CREATE OR REPLACE FUNCTION refresh_leaderboard(member_email VARCHAR) RETURNS VOID AS $$
+    DELETE FROM leaderboard_entries WHERE email = member_email;
+    INSERT INTO leaderboard_entries (stat, cohort, email, score)
+    SELECT s.stat, c.cohort, h.email, s.score
+    FROM health_statistics h
+    JOIN member_accounts m ON m.email = h.email
+    CROSS JOIN LATERAL (VALUES ('fitness_level', h.fitness_level), ('strength', h.strength),
+                               ('flexibility', h.flexibility), ('endurance', h.endurance)) s (stat, score)
+    CROSS JOIN LATERAL (VALUES ('all'), ('gender:' || m.gender), ('age:' || age_band(m.age))) c (cohort)
+    WHERE h.email = member_email
+      AND h.email NOT IN ('guest', 'admin') -- Shared guest and admin rows are not members
+      AND s.score IS NOT NULL AND c.cohort IS NOT NULL;
+$$ LANGUAGE SQL;
+
+CREATE OR REPLACE FUNCTION health_statistics_leaderboard() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM leaderboard_entries WHERE email = OLD.email;
+    ELSE
+        PERFORM refresh_leaderboard(NEW.email);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION member_accounts_leaderboard() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_leaderboard(NEW.email);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS health_statistics_leaderboard ON health_statistics;
+CREATE TRIGGER health_statistics_leaderboard
+    AFTER INSERT OR DELETE ON health_statistics
+    FOR EACH ROW EXECUTE FUNCTION health_statistics_leaderboard();
+
+DROP TRIGGER IF EXISTS health_statistics_leaderboard_update ON health_statistics;
+CREATE TRIGGER health_statistics_leaderboard_update
+    AFTER UPDATE OF fitness_level, strength, flexibility, endurance ON health_statistics
+    FOR EACH ROW
+    WHEN ((OLD.fitness_level, OLD.strength, OLD.flexibility, OLD.endurance)
+          IS DISTINCT FROM (NEW.fitness_level, NEW.strength, NEW.flexibility, NEW.endurance))
+    EXECUTE FUNCTION health_statistics_leaderboard();
+
+DROP TRIGGER IF EXISTS member_accounts_leaderboard ON member_accounts;
+CREATE TRIGGER member_accounts_leaderboard
+    AFTER UPDATE OF gender, age ON member_accounts
+    FOR EACH ROW
+    WHEN ((OLD.gender, OLD.age) IS DISTINCT FROM (NEW.gender, NEW.age))
+    EXECUTE FUNCTION member_accounts_leaderboard();
+
+-- Rank the members who already have stats
+SELECT refresh_leaderboard(email) FROM health_statistics;
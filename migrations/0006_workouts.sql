@@ -0,0 +1,88 @@
+-- Workouts (append-only history of gym sessions, written in batches by the app)
+CREATE TABLE IF NOT EXISTS workouts (
+    workout_id BIGSERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    equipment_id INT REFERENCES equipment(equipment_id) ON DELETE SET NULL,
+    performed_at TIMESTAMP NOT NULL,
+    fitness_level_delta INT NOT NULL DEFAULT 0,
+    strength_delta INT NOT NULL DEFAULT 0,
+    flexibility_delta INT NOT NULL DEFAULT 0,
+    endurance_delta INT NOT NULL DEFAULT 0,
+    stamina_delta INT NOT NULL DEFAULT 0,
+    injured BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS workouts_email_idx ON workouts (email, performed_at);
+CREATE INDEX IF NOT EXISTS workouts_equipment_id_idx ON workouts (equipment_id);
+
+-- Workout aggregates, maintained incrementally from each inserted batch so progress never scans the history
+CREATE TABLE IF NOT EXISTS workout_summaries (
+    email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email) ON DELETE CASCADE,
+    sessions INT NOT NULL DEFAULT 0,
+    injuries INT NOT NULL DEFAULT 0,
+    fitness_level_gain INT NOT NULL DEFAULT 0,
+    strength_gain INT NOT NULL DEFAULT 0,
+    flexibility_gain INT NOT NULL DEFAULT 0,
+    endurance_gain INT NOT NULL DEFAULT 0,
+    first_workout_at TIMESTAMP,
+    last_workout_at TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS workout_weeks (
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    week_start DATE NOT NULL,
+    sessions INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, week_start)
+);
+
+CREATE TABLE IF NOT EXISTS workout_equipment (
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    equipment_id INT NOT NULL REFERENCES equipment(equipment_id) ON DELETE CASCADE,
+    uses INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, equipment_id)
+);
+
+CREATE INDEX IF NOT EXISTS workout_equipment_uses_idx ON workout_equipment (email, uses);
+CREATE INDEX IF NOT EXISTS workout_equipment_equipment_id_idx ON workout_equipment (equipment_id);
+
+-- Folds each inserted batch of workouts into the aggregates, set-based over the batch
+CREATE OR REPLACE FUNCTION summarize_workouts() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO workout_summaries AS s (email, sessions, injuries, fitness_level_gain, strength_gain, flexibility_gain,
+                                        endurance_gain, first_workout_at, last_workout_at)
+    SELECT email, COUNT(*), COUNT(*) FILTER (WHERE injured), SUM(fitness_level_delta), SUM(strength_delta),
+           SUM(flexibility_delta), SUM(endurance_delta), MIN(performed_at), MAX(performed_at)
+    FROM new_workouts
+    GROUP BY email
+    ON CONFLICT (email) DO UPDATE SET
+        sessions = s.sessions + EXCLUDED.sessions,
+        injuries = s.injuries + EXCLUDED.injuries,
+        fitness_level_gain = s.fitness_level_gain + EXCLUDED.fitness_level_gain,
+        strength_gain = s.strength_gain + EXCLUDED.strength_gain,
+        flexibility_gain = s.flexibility_gain + EXCLUDED.flexibility_gain,
+        endurance_gain = s.endurance_gain + EXCLUDED.endurance_gain,
+        first_workout_at = LEAST(s.first_workout_at, EXCLUDED.first_workout_at),
+        last_workout_at = GREATEST(s.last_workout_at, EXCLUDED.last_workout_at);
+
+    INSERT INTO workout_weeks AS w (email, week_start, sessions)
+    SELECT email, date_trunc('week', performed_at)::DATE, COUNT(*)
+    FROM new_workouts
+    GROUP BY 1, 2
+    ON CONFLICT (email, week_start) DO UPDATE SET sessions = w.sessions + EXCLUDED.sessions;
+
+    INSERT INTO workout_equipment AS e (email, equipment_id, uses)
+    SELECT email, equipment_id, COUNT(*)
+    FROM new_workouts
+    WHERE equipment_id IS NOT NULL
+    GROUP BY 1, 2
+    ON CONFLICT (email, equipment_id) DO UPDATE SET uses = e.uses + EXCLUDED.uses;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS workouts_summarize ON workouts;
+CREATE TRIGGER workouts_summarize
+    AFTER INSERT ON workouts
+    REFERENCING NEW TABLE AS new_workouts
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_workouts();
@@ -0,0 +1,11 @@
+-- Equipment Usage (hourly telemetry buckets, flushed from in-memory counters by the app)
+CREATE TABLE IF NOT EXISTS equipment_usage_hourly (
+    equipment_id INT NOT NULL REFERENCES equipment(equipment_id) ON DELETE CASCADE,
+    bucket_start TIMESTAMP NOT NULL, -- Start of the hour
+    uses INT NOT NULL DEFAULT 0,
+    wear INT NOT NULL DEFAULT 0, -- Quality points lost
+    repairs INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (equipment_id, bucket_start)
+);
+
+CREATE INDEX IF NOT EXISTS equipment_usage_hourly_bucket_start_idx ON equipment_usage_hourly (bucket_start);
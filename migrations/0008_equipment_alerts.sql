@@ -0,0 +1,20 @@
+-- Equipment alerts: notifies listening admin sessions whenever an item needing attention (quality below 4) changes,
+-- with a NULL quality once it no longer needs attention
+CREATE OR REPLACE FUNCTION notify_equipment_alert() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF OLD.quality < 4 THEN
+            PERFORM pg_notify('equipment_alerts', json_build_object('equipment_id', OLD.equipment_id, 'quality', NULL)::TEXT);
+        END IF;
+    ELSIF NEW.quality < 4 OR (TG_OP = 'UPDATE' AND OLD.quality < 4) THEN
+        PERFORM pg_notify('equipment_alerts', json_build_object(
+            'equipment_id', NEW.equipment_id, 'quality', CASE WHEN NEW.quality < 4 THEN NEW.quality END)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS equipment_alert ON equipment;
+CREATE TRIGGER equipment_alert
+    AFTER INSERT OR UPDATE OF quality OR DELETE ON equipment
+    FOR EACH ROW EXECUTE FUNCTION notify_equipment_alert();
@@ -0,0 +1,47 @@
+-- Catalog changes: notifies listening sessions when rooms, trainers or equipment are edited so their cached
+-- catalogs can be dropped. Equipment changes name the room affected; wear from members (a quality drop) is not
+-- a catalog change, but a repair is.
+CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'equipment' AND TG_LEVEL = 'ROW' THEN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('catalog_changes', json_build_object('table', 'equipment', 'room_id', OLD.room_id)::TEXT);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM pg_notify('catalog_changes', json_build_object('table', 'equipment', 'room_id', NEW.room_id)::TEXT);
+        END IF;
+    ELSE
+        PERFORM pg_notify('catalog_changes', json_build_object('table', TG_TABLE_NAME)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rooms_catalog_change ON rooms;
+CREATE TRIGGER rooms_catalog_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON rooms
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+
+DROP TRIGGER IF EXISTS trainer_accounts_catalog_change ON trainer_accounts;
+CREATE TRIGGER trainer_accounts_catalog_change
+    AFTER INSERT OR UPDATE OF name OR DELETE OR TRUNCATE ON trainer_accounts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+
+DROP TRIGGER IF EXISTS equipment_catalog_change ON equipment;
+CREATE TRIGGER equipment_catalog_change
+    AFTER INSERT OR DELETE ON equipment
+    FOR EACH ROW EXECUTE FUNCTION notify_catalog_change();
+
+DROP TRIGGER IF EXISTS equipment_catalog_update ON equipment;
+CREATE TRIGGER equipment_catalog_update
+    AFTER UPDATE OF equipment_name, room_id, quality ON equipment
+    FOR EACH ROW
+    WHEN (OLD.equipment_name IS DISTINCT FROM NEW.equipment_name
+          OR OLD.room_id IS DISTINCT FROM NEW.room_id
+          OR NEW.quality > OLD.quality)
+    EXECUTE FUNCTION notify_catalog_change();
+
+DROP TRIGGER IF EXISTS equipment_catalog_truncate ON equipment;
+CREATE TRIGGER equipment_catalog_truncate
+    AFTER TRUNCATE ON equipment
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
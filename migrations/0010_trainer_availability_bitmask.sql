@@ -0,0 +1,35 @@
+-- Trainer availability: replaces the seven *_available BOOLEAN columns with a weekly bitmask of hour slots.
+-- A day marked available becomes the club's opening hours (06:00-22:00).
+-- Trainer availability is a weekly bitmask of hour slots: bit day * 24 + hour (Monday = day 0, leftmost bit first)
+CREATE OR REPLACE FUNCTION availability_mask(days TEXT[], from_hour INT, to_hour INT) RETURNS BIT(168) AS $$
+    SELECT string_agg(CASE WHEN (ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])[s / 24 + 1] = ANY(days)
+                            AND s % 24 >= from_hour AND s % 24 < to_hour THEN '1' ELSE '0' END, '' ORDER BY s)::BIT(168)
+    FROM generate_series(0, 167) s
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Slots set in an availability mask, so "who is free for these slots" can be answered from a GIN index
+CREATE OR REPLACE FUNCTION availability_slots(availability BIT(168)) RETURNS SMALLINT[] AS $$
+    SELECT COALESCE(array_agg(s::SMALLINT ORDER BY s), '{}') FROM generate_series(0, 167) s WHERE get_bit(availability, s) = 1
+$$ LANGUAGE SQL IMMUTABLE;
+
+ALTER TABLE trainer_accounts ADD COLUMN IF NOT EXISTS availability BIT(168) NOT NULL DEFAULT B'0'::BIT(168);
+
+UPDATE trainer_accounts
+SET availability = availability_mask(array_remove(ARRAY[
+        CASE WHEN monday_available THEN 'Mon' END, CASE WHEN tuesday_available THEN 'Tue' END,
+        CASE WHEN wednesday_available THEN 'Wed' END, CASE WHEN thursday_available THEN 'Thu' END,
+        CASE WHEN friday_available THEN 'Fri' END, CASE WHEN saturday_available THEN 'Sat' END,
+        CASE WHEN sunday_available THEN 'Sun' END], NULL), 6, 22);
+
+ALTER TABLE trainer_accounts
+    DROP COLUMN monday_available, DROP COLUMN tuesday_available, DROP COLUMN wednesday_available,
+    DROP COLUMN thursday_available, DROP COLUMN friday_available, DROP COLUMN saturday_available,
+    DROP COLUMN sunday_available;
+
+CREATE INDEX IF NOT EXISTS trainer_accounts_availability_idx ON trainer_accounts USING GIN (availability_slots(availability));
+
+-- Availability changes now invalidate cached trainer rosters too
+DROP TRIGGER IF EXISTS trainer_accounts_catalog_change ON trainer_accounts;
+CREATE TRIGGER trainer_accounts_catalog_change
+    AFTER INSERT OR UPDATE OF name, availability OR DELETE OR TRUNCATE ON trainer_accounts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
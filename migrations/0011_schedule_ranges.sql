@@ -0,0 +1,57 @@
+-- Schedule ranges: stores each booking and class as the week minutes it covers, with exclusion constraints
+-- against room and trainer overlaps. Adding the constraints fails if the schedule already has overlaps;
+-- resolve them first.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE OR REPLACE FUNCTION session_range(day_of_week VARCHAR, start_time TIME, duration INT) RETURNS INT4RANGE AS $$
+    SELECT CASE WHEN day_of_week IS NOT NULL AND start_time IS NOT NULL THEN
+        int4range(m, m + GREATEST(COALESCE(duration, 0), 0))
+    END
+    FROM (SELECT (array_position(ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']::VARCHAR[], day_of_week) - 1) * 1440
+                 + (EXTRACT(EPOCH FROM start_time) / 60)::INT AS m) s
+$$ LANGUAGE SQL IMMUTABLE;
+
+ALTER TABLE bookings
+    ADD COLUMN IF NOT EXISTS week_slot INT4RANGE GENERATED ALWAYS AS (session_range(day_of_week, start_time, duration)) STORED,
+    ADD CONSTRAINT bookings_room_overlap EXCLUDE USING GIST (room_id WITH =, week_slot WITH &&),
+    ADD CONSTRAINT bookings_trainer_overlap EXCLUDE USING GIST (trainer_id WITH =, week_slot WITH &&);
+
+ALTER TABLE class_schedule
+    ADD COLUMN IF NOT EXISTS week_slot INT4RANGE GENERATED ALWAYS AS (session_range(day_of_week, start_time, duration)) STORED,
+    ADD CONSTRAINT class_schedule_room_overlap EXCLUDE USING GIST (room_id WITH =, week_slot WITH &&),
+    ADD CONSTRAINT class_schedule_trainer_overlap EXCLUDE USING GIST (trainer_id WITH =, week_slot WITH &&);
+
+-- Bookings and classes may not share a room or trainer at the same time either; exclusion constraints only
+-- cover one table, so this trigger checks the other one. Schedule edits are rare admin actions, so one
+-- advisory lock serializes them and two concurrent edits cannot both miss each other.
+CREATE OR REPLACE FUNCTION check_schedule_overlap() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.week_slot IS NULL OR isempty(NEW.week_slot) THEN
+        RETURN NULL;
+    END IF;
+    PERFORM pg_advisory_xact_lock(3005, 1);
+    IF TG_TABLE_NAME = 'bookings' THEN
+        PERFORM 1 FROM class_schedule
+        WHERE (room_id = NEW.room_id OR trainer_id = NEW.trainer_id) AND week_slot && NEW.week_slot;
+    ELSE
+        PERFORM 1 FROM bookings
+        WHERE (room_id = NEW.room_id OR trainer_id = NEW.trainer_id) AND week_slot && NEW.week_slot;
+    END IF;
+    IF FOUND THEN
+        RAISE EXCEPTION 'session on % at % overlaps a % in the same room or with the same trainer',
+            NEW.day_of_week, NEW.start_time, CASE WHEN TG_TABLE_NAME = 'bookings' THEN 'class' ELSE 'booking' END
+            USING ERRCODE = 'exclusion_violation';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bookings_schedule_overlap ON bookings;
+CREATE TRIGGER bookings_schedule_overlap
+    AFTER INSERT OR UPDATE OF room_id, trainer_id, day_of_week, start_time, duration ON bookings
+    FOR EACH ROW EXECUTE FUNCTION check_schedule_overlap();
+
+DROP TRIGGER IF EXISTS class_schedule_schedule_overlap ON class_schedule;
+CREATE TRIGGER class_schedule_schedule_overlap
+    AFTER INSERT OR UPDATE OF room_id, trainer_id, day_of_week, start_time, duration ON class_schedule
+    FOR EACH ROW EXECUTE FUNCTION check_schedule_overlap();
@@ -0,0 +1,94 @@
+-- Class enrollment: a capacity per class, one row per seat and a waitlist. Existing classes get the default
+-- capacity of 20 and their seats are created here.
+ALTER TABLE class_schedule ADD COLUMN IF NOT EXISTS capacity INT NOT NULL DEFAULT 20 CHECK (capacity >= 0);
+
+-- Class Seats (one row per seat, so members booking the same class claim different rows in parallel)
+CREATE TABLE IF NOT EXISTS class_seats (
+    class_id INT NOT NULL REFERENCES class_schedule(class_id) ON DELETE CASCADE,
+    seat_no INT NOT NULL,
+    email VARCHAR(255) REFERENCES member_accounts(email) ON DELETE SET NULL, -- NULL while the seat is free
+    enrolled_at TIMESTAMP,
+    PRIMARY KEY (class_id, seat_no)
+);
+
+CREATE INDEX IF NOT EXISTS class_seats_free_idx ON class_seats (class_id, seat_no) WHERE email IS NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS class_seats_email_idx ON class_seats (email, class_id) WHERE email IS NOT NULL;
+
+-- Class Waitlist (served in waitlist_id order)
+CREATE TABLE IF NOT EXISTS class_waitlist (
+    waitlist_id BIGSERIAL PRIMARY KEY,
+    class_id INT NOT NULL REFERENCES class_schedule(class_id) ON DELETE CASCADE,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    joined_at TIMESTAMP NOT NULL DEFAULT now(),
+    UNIQUE (email, class_id)
+);
+
+CREATE INDEX IF NOT EXISTS class_waitlist_class_id_idx ON class_waitlist (class_id, waitlist_id);
+
+-- Moves waitlisted members into a class's free seats, first come first served. Callers hold the class's
+-- waitlist lock, pg_advisory_xact_lock(3006, class_id), which also serializes joining the waitlist with
+-- seats being freed, so nobody is left waiting while a seat stands empty.
+CREATE OR REPLACE FUNCTION promote_waitlist(target_class_id INT) RETURNS SETOF VARCHAR AS $$
+    WITH queue AS (
+        SELECT waitlist_id, email, row_number() OVER (ORDER BY waitlist_id) AS n
+        FROM class_waitlist
+        WHERE class_id = target_class_id
+    ), free AS (
+        SELECT seat_no, row_number() OVER (ORDER BY seat_no) AS n
+        FROM class_seats
+        WHERE class_id = target_class_id AND email IS NULL
+    ), moved AS (
+        DELETE FROM class_waitlist w
+        USING queue q JOIN free f ON f.n = q.n
+        WHERE w.waitlist_id = q.waitlist_id
+        RETURNING q.email, f.seat_no
+    )
+    UPDATE class_seats s
+    SET email = moved.email, enrolled_at = now()
+    FROM moved
+    WHERE s.class_id = target_class_id AND s.seat_no = moved.seat_no
+    RETURNING s.email
+$$ LANGUAGE SQL;
+
+-- New classes get their seats in one statement per insert
+CREATE OR REPLACE FUNCTION create_class_seats() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO class_seats (class_id, seat_no)
+    SELECT c.class_id, g
+    FROM new_classes c, generate_series(1, c.capacity) g;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS class_schedule_create_seats ON class_schedule;
+CREATE TRIGGER class_schedule_create_seats
+    AFTER INSERT ON class_schedule
+    REFERENCING NEW TABLE AS new_classes
+    FOR EACH STATEMENT EXECUTE FUNCTION create_class_seats();
+
+-- A bigger class gets the extra seats and fills them from the waitlist; a smaller one drops its free seats
+-- above the new capacity (taken ones stay until they are cancelled)
+CREATE OR REPLACE FUNCTION resize_class_seats() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(3006, NEW.class_id);
+    INSERT INTO class_seats (class_id, seat_no)
+    SELECT NEW.class_id, g
+    FROM generate_series(1, NEW.capacity) g
+    ON CONFLICT DO NOTHING;
+    DELETE FROM class_seats
+    WHERE class_id = NEW.class_id AND seat_no > NEW.capacity AND email IS NULL;
+    PERFORM promote_waitlist(NEW.class_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS class_schedule_resize_seats ON class_schedule;
+CREATE TRIGGER class_schedule_resize_seats
+    AFTER UPDATE OF capacity ON class_schedule
+    FOR EACH ROW WHEN (NEW.capacity IS DISTINCT FROM OLD.capacity)
+    EXECUTE FUNCTION resize_class_seats();
+
+INSERT INTO class_seats (class_id, seat_no)
+SELECT c.class_id, g
+FROM class_schedule c, generate_series(1, c.capacity) g
+ON CONFLICT DO NOTHING;
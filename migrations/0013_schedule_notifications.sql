@@ -0,0 +1,42 @@
+-- Schedule notifications: announces each booking or class change on `schedule_changes` for the in-memory timetable.
+-- Every added, edited or deleted booking or class is announced on `schedule_changes` so the in-memory
+-- timetable (see Timetable.py) repaints just that session; a TRUNCATE asks for a full reload. The trigger
+-- argument names the table's id column.
+CREATE OR REPLACE FUNCTION notify_schedule_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME)::TEXT);
+    ELSE
+        -- Identical notifications in one transaction are sent once, so an update normally sends one
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME,
+                'id', to_jsonb(OLD) -> TG_ARGV[0])::TEXT);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME,
+                'id', to_jsonb(NEW) -> TG_ARGV[0])::TEXT);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS bookings_schedule_change ON bookings;
+CREATE TRIGGER bookings_schedule_change
+    AFTER INSERT OR UPDATE OR DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION notify_schedule_change('booking_id');
+
+DROP TRIGGER IF EXISTS bookings_schedule_truncate ON bookings;
+CREATE TRIGGER bookings_schedule_truncate
+    AFTER TRUNCATE ON bookings
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_schedule_change();
+
+DROP TRIGGER IF EXISTS class_schedule_schedule_change ON class_schedule;
+CREATE TRIGGER class_schedule_schedule_change
+    AFTER INSERT OR UPDATE OF class_name, trainer_id, room_id, day_of_week, start_time, duration, capacity OR DELETE ON class_schedule
+    FOR EACH ROW EXECUTE FUNCTION notify_schedule_change('class_id');
+
+DROP TRIGGER IF EXISTS class_schedule_schedule_truncate ON class_schedule;
+CREATE TRIGGER class_schedule_schedule_truncate
+    AFTER TRUNCATE ON class_schedule
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_schedule_change();
@@ -0,0 +1,14 @@
+-- Room occupancy: replaces the static rooms.room_availability flag with a capacity (0 for rooms that were
+-- unavailable) and live per-process head counts.
+ALTER TABLE rooms ADD COLUMN IF NOT EXISTS capacity INT NOT NULL DEFAULT 30 CHECK (capacity >= 0);
+UPDATE rooms SET capacity = 0 WHERE room_availability IS NOT TRUE;
+ALTER TABLE rooms DROP COLUMN room_availability;
+
+-- Room Occupancy (each app process upserts its own live head count per room; see RoomOccupancy.py)
+CREATE TABLE IF NOT EXISTS room_occupancy (
+    instance_id TEXT NOT NULL,
+    room_id INT NOT NULL REFERENCES rooms(room_id) ON DELETE CASCADE,
+    occupants INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (instance_id, room_id)
+);
@@ -0,0 +1,43 @@
+-- Member check-in: door badges and a visit log.
+-- Member Badges (the door badge a member checks in with; only a SHA-256 hash of the badge token is stored)
+CREATE TABLE IF NOT EXISTS member_badges (
+    badge_hash CHAR(64) PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    issued_at TIMESTAMP NOT NULL DEFAULT now(),
+    revoked_at TIMESTAMP
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS member_badges_active_idx ON member_badges (email) WHERE revoked_at IS NULL;
+
+-- Visits (one row per check-in at the door, written in batches by the app)
+CREATE TABLE IF NOT EXISTS visits (
+    visit_id BIGSERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    checked_in_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS visits_email_idx ON visits (email, checked_in_at);
+
+-- Badge changes are announced on `badge_changes` so check-in points drop the badge from memory
+CREATE OR REPLACE FUNCTION notify_badge_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('badge_changes', '');
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('badge_changes', OLD.badge_hash);
+    ELSE
+        PERFORM pg_notify('badge_changes', NEW.badge_hash);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS member_badges_change ON member_badges;
+CREATE TRIGGER member_badges_change
+    AFTER INSERT OR UPDATE OR DELETE ON member_badges
+    FOR EACH ROW EXECUTE FUNCTION notify_badge_change();
+
+DROP TRIGGER IF EXISTS member_badges_truncate ON member_badges;
+CREATE TRIGGER member_badges_truncate
+    AFTER TRUNCATE ON member_badges
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_badge_change();
@@ -0,0 +1,10 @@
+-- Day passes: one-day guest passes, validated by signed token and primary key, purged by expiry.
+-- Day Passes (one-day guest passes; the pass token is signed by the app, so only the id and expiry are stored)
+CREATE TABLE IF NOT EXISTS day_passes (
+    pass_id BIGSERIAL PRIMARY KEY,
+    issued_at TIMESTAMP NOT NULL DEFAULT now(),
+    expires_at TIMESTAMP NOT NULL
+);
+
+-- Expired passes are purged oldest first in small batches
+CREATE INDEX IF NOT EXISTS day_passes_expires_idx ON day_passes (expires_at);
@@ -0,0 +1,29 @@
+-- Stamina recovery: timestamps the nightly recovery job measures elapsed time from.
+ALTER TABLE health_statistics
+    ADD COLUMN IF NOT EXISTS stamina_updated_at TIMESTAMP NOT NULL DEFAULT now(), -- Stamina recovers from this moment on (see Recovery.py)
+    ADD COLUMN IF NOT EXISTS injured_at TIMESTAMP; -- When the current injury happened
+
+-- Members injured before this migration start healing now
+UPDATE health_statistics SET injured_at = now() WHERE is_injured AND injured_at IS NULL;
+
+-- Stamps the recovery clocks whenever stamina or the injury flag changes, so the gym screens need no extra
+-- writes. The recovery job sets stamina_updated_at itself, to carry over the part of an hour not yet recovered.
+CREATE OR REPLACE FUNCTION stamp_health_statistics() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.stamina IS DISTINCT FROM OLD.stamina
+                          AND NEW.stamina_updated_at IS NOT DISTINCT FROM OLD.stamina_updated_at THEN
+        NEW.stamina_updated_at := now();
+    END IF;
+    IF NOT COALESCE(NEW.is_injured, FALSE) THEN
+        NEW.injured_at := NULL;
+    ELSIF TG_OP = 'INSERT' OR NOT COALESCE(OLD.is_injured, FALSE) THEN
+        NEW.injured_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS health_statistics_stamp ON health_statistics;
+CREATE TRIGGER health_statistics_stamp
+    BEFORE INSERT OR UPDATE OF stamina, is_injured ON health_statistics
+    FOR EACH ROW EXECUTE FUNCTION stamp_health_statistics();
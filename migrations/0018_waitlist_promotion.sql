@@ -0,0 +1,28 @@
+-- Waitlist promotion locks the free seats it hands out (skipping any a concurrent CLASS_SEAT_CLAIM holds)
+-- and only fills a seat that is still free, so a seat is never given to two members.
+CREATE OR REPLACE FUNCTION promote_waitlist(target_class_id INT) RETURNS SETOF VARCHAR AS $$
+    WITH queue AS (
+        SELECT waitlist_id, email, row_number() OVER (ORDER BY waitlist_id) AS n
+        FROM class_waitlist
+        WHERE class_id = target_class_id
+    ), free AS (
+        SELECT seat_no, row_number() OVER (ORDER BY seat_no) AS n
+        FROM (
+            SELECT seat_no
+            FROM class_seats
+            WHERE class_id = target_class_id AND email IS NULL
+            ORDER BY seat_no
+            FOR UPDATE SKIP LOCKED
+        ) unclaimed
+    ), moved AS (
+        DELETE FROM class_waitlist w
+        USING queue q JOIN free f ON f.n = q.n
+        WHERE w.waitlist_id = q.waitlist_id
+        RETURNING q.email, f.seat_no
+    )
+    UPDATE class_seats s
+    SET email = moved.email, enrolled_at = now()
+    FROM moved
+    WHERE s.class_id = target_class_id AND s.seat_no = moved.seat_no AND s.email IS NULL
+    RETURNING s.email
+$$ LANGUAGE SQL;
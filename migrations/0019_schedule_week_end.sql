@@ -0,0 +1,8 @@
+-- Schedule week end: week_slot ranges do not wrap from Sunday to Monday, so a session running past Sunday
+-- midnight would miss its overlaps with early Monday. Sessions now have to end by minute 10080. Adding the
+-- constraints fails if such a session already exists; shorten or move it first.
+ALTER TABLE bookings DROP CONSTRAINT IF EXISTS bookings_within_week;
+ALTER TABLE bookings ADD CONSTRAINT bookings_within_week CHECK (upper(week_slot) <= 10080);
+
+ALTER TABLE class_schedule DROP CONSTRAINT IF EXISTS class_schedule_within_week;
+ALTER TABLE class_schedule ADD CONSTRAINT class_schedule_within_week CHECK (upper(week_slot) <= 10080);
@@ -0,0 +1,5 @@
+-- Day pass times become absolute moments. The app sold passes with naive local times; they are read in the
+-- session's time zone, so run this with the same TimeZone the app used.
+ALTER TABLE day_passes
+    ALTER COLUMN issued_at TYPE TIMESTAMPTZ,
+    ALTER COLUMN expires_at TYPE TIMESTAMPTZ;
@@ -0,0 +1,94 @@
+-- Leaderboard score counts. The entries are locked while the counts are built, so no change slips in
+-- between counting them and the triggers taking over.
+LOCK TABLE leaderboard_entries IN SHARE ROW EXCLUSIVE MODE;
+
+-- Leaderboard Score Counts (how many entries each leaderboard has per score, kept by statement triggers on
+-- leaderboard_entries, so a member's position adds up at most one row per score instead of counting every
+-- member ranked above them)
+CREATE TABLE IF NOT EXISTS leaderboard_score_counts (
+    stat VARCHAR(50) NOT NULL,
+    cohort VARCHAR(50) NOT NULL,
+    score INT NOT NULL,
+    entries INT NOT NULL,
+    PRIMARY KEY (stat, cohort, score)
+);
+
+-- One member's entries as their current stats, gender and age rank them
+CREATE OR REPLACE FUNCTION member_leaderboard_scores(member_email VARCHAR) RETURNS TABLE (stat TEXT, cohort TEXT, score INT) AS $$
+    SELECT s.stat, c.cohort, s.score
+    FROM health_statistics h
+    JOIN member_accounts m ON m.email = h.email
+    CROSS JOIN LATERAL (VALUES ('fitness_level', h.fitness_level), ('strength', h.strength),
+                               ('flexibility', h.flexibility), ('endurance', h.endurance)) s (stat, score)
+    CROSS JOIN LATERAL (VALUES ('all'), ('gender:' || m.gender), ('age:' || age_band(m.age))) c (cohort)
+    WHERE h.email = member_email
+      AND h.email NOT IN ('guest', 'admin') -- Shared guest and admin rows are not members
+      AND s.score IS NOT NULL AND c.cohort IS NOT NULL
+$$ LANGUAGE SQL STABLE;
+
+-- Brings one member's entries up to date. Entries for cohorts the member left are deleted and changed
+-- scores are updated in place, so a workout only moves the member between two score counts.
+CREATE OR REPLACE FUNCTION refresh_leaderboard(member_email VARCHAR) RETURNS VOID AS $$
+    DELETE FROM leaderboard_entries e
+    WHERE e.email = member_email
+      AND NOT EXISTS (SELECT 1 FROM member_leaderboard_scores(member_email) s WHERE s.stat = e.stat AND s.cohort = e.cohort);
+    INSERT INTO leaderboard_entries AS e (stat, cohort, email, score)
+    SELECT s.stat, s.cohort, member_email, s.score
+    FROM member_leaderboard_scores(member_email) s
+    ON CONFLICT (stat, cohort, email) DO UPDATE SET score = EXCLUDED.score
+    WHERE e.score <> EXCLUDED.score;
+$$ LANGUAGE SQL;
+
+-- Adds the changes to the score counts, locking the count rows in key order so that concurrent workouts
+-- queue on a shared count instead of deadlocking
+CREATE OR REPLACE FUNCTION add_leaderboard_counts(stats VARCHAR[], cohorts VARCHAR[], scores INT[], changes INT[]) RETURNS VOID AS $$
+    INSERT INTO leaderboard_score_counts AS c (stat, cohort, score, entries)
+    SELECT d.stat, d.cohort, d.score, SUM(d.change)
+    FROM unnest(stats, cohorts, scores, changes) d (stat, cohort, score, change)
+    GROUP BY d.stat, d.cohort, d.score
+    HAVING SUM(d.change) <> 0
+    ORDER BY d.stat, d.cohort, d.score
+    ON CONFLICT (stat, cohort, score) DO UPDATE SET entries = c.entries + EXCLUDED.entries;
+$$ LANGUAGE SQL;
+
+CREATE OR REPLACE FUNCTION leaderboard_entries_count() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(1))
+        FROM new_entries;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(-1))
+        FROM old_entries;
+    ELSE
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(change))
+        FROM (SELECT stat, cohort, score, 1 AS change FROM new_entries
+              UNION ALL
+              SELECT stat, cohort, score, -1 FROM old_entries) d;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS leaderboard_entries_count_insert ON leaderboard_entries;
+CREATE TRIGGER leaderboard_entries_count_insert
+    AFTER INSERT ON leaderboard_entries
+    REFERENCING NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+DROP TRIGGER IF EXISTS leaderboard_entries_count_update ON leaderboard_entries;
+CREATE TRIGGER leaderboard_entries_count_update
+    AFTER UPDATE ON leaderboard_entries
+    REFERENCING OLD TABLE AS old_entries NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+DROP TRIGGER IF EXISTS leaderboard_entries_count_delete ON leaderboard_entries;
+CREATE TRIGGER leaderboard_entries_count_delete
+    AFTER DELETE ON leaderboard_entries
+    REFERENCING OLD TABLE AS old_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+DELETE FROM leaderboard_score_counts;
+INSERT INTO leaderboard_score_counts (stat, cohort, score, entries)
+SELECT stat, cohort, score, COUNT(*)
+FROM leaderboard_entries
+GROUP BY stat, cohort, score;
@@ -14,22 +14,22 @@ VALUES
     ('emily.white@example.com', 'Emily White', 'passwordDEF', 'Female', 32);
 
 -- sample trainers_accounts (no password)
-INSERT INTO trainer_accounts (trainer_id, name, password, monday_available, tuesday_available, wednesday_available, thursday_available, friday_available, saturday_available, sunday_available)
+INSERT INTO trainer_accounts (trainer_id, name, password, availability)
 VALUES
-    (1, 'John Doe', '', true, false, true, false, true, false, true),
-    (2, 'Jane Smith', '', false, true, false, true, false, true, false),
-    (3, 'Michael Johnson', '', true, false, true, false, true, false, true),
-    (4, 'Emily Brown', '', false, true, false, true, false, true, false),
-    (5, 'David Lee', '', true, true, true, true, true, true, true);
+    (1, 'John Doe', '', availability_mask('{Mon,Wed,Fri,Sun}', 6, 22)),
+    (2, 'Jane Smith', '', availability_mask('{Tue,Thu,Sat}', 6, 22)),
+    (3, 'Michael Johnson', '', availability_mask('{Mon,Wed,Fri,Sun}', 6, 22)),
+    (4, 'Emily Brown', '', availability_mask('{Tue,Thu,Sat}', 6, 22)),
+    (5, 'David Lee', '', availability_mask('{Mon,Tue,Wed,Thu,Fri,Sat,Sun}', 6, 22));
 
 
 -- Sample Rooms
-INSERT INTO rooms (room_id, room_name, room_availability) VALUES
-(1, 'Yoga Room', true),
-(2, 'Personal Training Room', true),
-(3, 'Spin Room', true),
-(4, 'Dance Room', true),
-(5, 'Strength Training', true);
+INSERT INTO rooms (room_id, room_name, capacity) VALUES
+(1, 'Yoga Room', 25),
+(2, 'Personal Training Room', 6),
+(3, 'Spin Room', 30),
+(4, 'Dance Room', 25),
+(5, 'Strength Training', 40);
 
 -- Sample Room Bookings
 INSERT INTO bookings (booking_id, trainer_id, room_id, duration, day_of_week, start_time)
@@ -73,14 +73,16 @@ VALUES
 
 INSERT INTO class_schedule (class_name, trainer_id, room_id, day_of_week, start_time, duration)
 VALUES
-    ('Yoga Class', 1, 1, 'Mon', '09:00:00', 60),
-    ('Spin Class', 2, 3, 'Tue', '14:00:00', 45),
+    ('Yoga Class', 1, 1, 'Mon', '11:00:00', 60),
+    ('Spin Class', 2, 3, 'Tue', '16:00:00', 45),
     ('Zumba Class', 3, 4, 'Wed', '18:30:00', 60),
     ('Pilates Class', 4, 1, 'Thu', '10:00:00', 60),
     ('HIIT Class', 5, 5, 'Fri', '16:00:00', 45);
 
 
 -- Insert Sample Data into Payment Table
+SELECT create_payment_partition('2024-04-01');
+
 INSERT INTO payments (email, amount, payment_date, payment_type, status)
 VALUES
     ('jane.doe@example.com', 50.00, '2024-04-01', 'Annual Membership', 'Refunded'),
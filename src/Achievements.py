@@ -0,0 +1,93 @@
+"""
+The Achievements class manages fitness achievements. Each member's earned achievements are stored as a
+single bitmask in `fitness_achievements.bits`, and `achievement_catalog` maps each bit position to an
+achievement name, so a new achievement is a catalog row rather than a new column. Members without a
+row simply have no achievements yet.
+
+Awarding sets a bit with one upsert, and awarding a whole cohort (every member whose health statistic
+meets a threshold) is a single INSERT ... SELECT. "Who has X" queries use the GIN index on
+achievement_ids(bits).
+
+Key Functionalities:
+- catalog(): Lists every achievement in the catalog.
+- add(name): Adds an achievement to the catalog using the next free bit.
+- for_member(email): Lists every achievement with whether the member has earned it.
+- award(email, achievement_id): Grants one achievement to one member.
+- award_by_stat(achievement_id, stat, threshold): Grants an achievement to every member whose stat is at least the threshold.
+- holders(achievement_id): Lists the members who have earned an achievement.
+"""
+
+import psycopg2
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+
+
+class Achievements:
+    # Health statistics a cohort can be selected by (also guards the column name interpolated into the query)
+    STATS = ('fitness_level', 'strength', 'flexibility', 'endurance', 'stamina')
+
+    @staticmethod
+    def catalog():
+        """ Returns (achievement_id, name) rows for every achievement, in bit order. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ACHIEVEMENT_CATALOG)
+                return cursor.fetchall()
+        return []
+
+    @staticmethod
+    def add(name):
+        """ Adds an achievement to the catalog and returns its id, or None if it could not be added. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(Queries.ACHIEVEMENT_CATALOG_ADD, (name,))
+                    achievement_id = cursor.fetchone()['achievement_id']
+                    conn.commit()
+                    return achievement_id
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    print(f"Failed to add achievement (names must be unique, and the catalog holds at most 63): {e}")
+        return None
+
+    @staticmethod
+    def for_member(email):
+        """ Returns (achievement_id, name, earned) rows for every achievement in the catalog. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ACHIEVEMENTS_BY_EMAIL, (email,))
+                return cursor.fetchall()
+        return []
+
+    @staticmethod
+    def award(email, achievement_id):
+        """ Grants one achievement to one member. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ACHIEVEMENT_GRANT, (email, achievement_id))
+                conn.commit()
+                return True
+        return False
+
+    @staticmethod
+    def award_by_stat(achievement_id, stat, threshold):
+        """ Grants an achievement to every member whose stat is at least threshold and returns how many newly earned it. """
+        if stat not in Achievements.STATS:
+            raise ValueError(f"Unknown health statistic: {stat}")
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ACHIEVEMENT_GRANT_BY_STAT.format(stat=stat), (achievement_id, threshold))
+                awarded = cursor.rowcount
+                conn.commit()
+                return awarded
+        return 0
+
+    @staticmethod
+    def holders(achievement_id):
+        """ Returns (email, name) rows for every member who has earned the achievement. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ACHIEVEMENT_HOLDERS, (achievement_id,))
+                return cursor.fetchall()
+        return []
@@ -7,7 +7,7 @@ payment processing, and the management of trainers and members.
 Key Functionalities:
 - add_admin_password(): Adds a hashed password for the admin into the database.
 - log_in(): Authenticates an admin using a password to provide access to the administrative dashboard.
-- run_dashboard(): Provides an interactive dashboard for managing the entire fitness club operations including rooms, equipment, classes, payments, trainers, and members.
+- run_dashboard(): Provides an interactive dashboard for managing the entire fitness club operations including rooms, equipment, classes, payments, trainers, members, utilization reports and the weekly timetable.
 - manage_room_bookings(), monitor_equipment_maintenance(), manage_class_schedule(), process_payments(), manage_trainers(), and manage_members(): Each function allows the admin to perform specific management tasks, updating the database as necessary and providing a user-friendly interface for each administrative function.
 - admin_exit(): Safely exits the admin session and closes the application.
 """
@@ -19,10 +19,25 @@ import time
 import datetime
 import sys
 
+from CatalogCache import CatalogCache
 from ClearScreen import clear_screen
 from DatabaseManager import DBManager
+from Enrollment import Enrollment
+from EquipmentTelemetry import EquipmentTelemetry
+from QueryRegistry import Queries
+from Reports import Reports
+from Schedule import Schedule
+from Timetable import Timetable
+from Billing import Billing
+from PaymentArchive import PaymentArchive
+from MaintenanceForecast import MaintenanceForecast
+from EquipmentAlerts import EquipmentAlerts
+from TrainerRoster import TrainerRoster
 
 class Admin:
+    PAYMENT_WINDOW_MONTHS = 3  # Payment listings show the current month and the two before it by default
+    payment_window = None  # (start, end) of the payment dates currently listed
+
     @staticmethod
     def add_admin_password():
         password = getpass.getpass("Please enter the admin password: ")
@@ -33,7 +48,7 @@ class Admin:
             with conn.cursor() as cursor:
                 try:
                     cursor.execute(
-                        "INSERT INTO admin (password) VALUES (%s)",
+                        Queries.ADMIN_INSERT_PASSWORD,
                         (hashed_password.decode('utf-8'),)
                     )
                     conn.commit()
@@ -58,7 +73,7 @@ class Admin:
             with conn.cursor() as cursor:
                 try:
                     # Execute the query to retrieve the admin password
-                    cursor.execute("SELECT password FROM member_accounts WHERE email = 'admin'")
+                    cursor.execute(Queries.ADMIN_PASSWORD)
                     record = cursor.fetchone()
 
                     # Check if an admin record exists
@@ -83,7 +98,8 @@ class Admin:
         
     @staticmethod
     def run_dashboard():
-        
+        EquipmentAlerts.start()  # Keeps the worn-equipment set current for the rest of the admin session
+
         options = {
             "1": Admin.manage_room_bookings,
             "2": Admin.monitor_equipment_maintenance,
@@ -91,22 +107,29 @@ class Admin:
             "4": Admin.process_payments,
             "5": Admin.manage_trainers,
             "6": Admin.manage_members,
-            "7": lambda: print("Returning to main menu..."),
-            "8": Admin.admin_exit
+            "7": Reports.menu,
+            "8": Timetable.menu,
+            "9": lambda: print("Returning to main menu..."),
+            "10": Admin.admin_exit
         }
 
         while True:
             clear_screen()
             print("=========================================================")
             print("Admin Dashboard")
+            worn = len(EquipmentAlerts.needs_attention())
+            if worn:
+                print(f"Alert: {worn} equipment item(s) need attention.")
             print("1. Manage Room Bookings")
             print("2. Monitor Equipment Maintenance")
             print("3. Manage Class Schedule")
             print("4. Process Payments")
             print("5. Manage Trainers")
             print("6: Manage Members")
-            print("7. Go back to Main Menu")
-            print("8. Exit")
+            print("7. Utilization Reports")
+            print("8. Weekly Timetable")
+            print("9. Go back to Main Menu")
+            print("10. Exit")
             
             choice = input("Enter choice: ")
             action = options.get(choice)
@@ -115,7 +138,7 @@ class Admin:
                 result = action()
                 if result:  # Print any messages returned by actions
                     print(result)
-                if choice == "7":
+                if choice == "9":
                     break  # Break out of the loop if returning to main menu or logging out
             else:
                 print("Invalid choice. Please choose again.")
@@ -124,58 +147,58 @@ class Admin:
     def manage_room_bookings():
         
         while True:  # Wrap the content in a while loop to return to the menu after each action
-            with DBManager.connection() as conn:
-                with conn.cursor() as cursor:
-                    try:
-                        # Retrieve bookings for all rooms
-                        cursor.execute("""
-                            SELECT b.booking_id, b.room_id, r.room_name, b.duration, b.day_of_week, b.start_time 
-                            FROM bookings b
-                            JOIN rooms r ON b.room_id = r.room_id
-                            ORDER BY b.booking_id
-                        """)
-                        bookings = cursor.fetchall()
-                        clear_screen()
-                        print("=========================================================")
-                        print("Current Room Bookings:")
-                        print("| {:^12} | {:<25} | {:^5} | {:^10} | {:^10} |".format(
-                            "Booking ID", "Room Name", "Day", "Start Time", "Duration"
-                        ))
+            try:
+                # Bookings come from the in-memory timetable, which re-reads only what changed since the last loop
+                bookings = Timetable.bookings()
+                clear_screen()
+                print("=========================================================")
+                print("Current Room Bookings:")
+                print("| {:^12} | {:<25} | {:^5} | {:^10} | {:^10} |".format(
+                    "Booking ID", "Room Name", "Day", "Start Time", "Duration"
+                ))
 
-                        for booking in bookings:
-                            print("| {:^12} | {:<25} | {:^5} | {:^10} | {:^10} |".format(
-                                booking['booking_id'],
-                                booking['room_name'],
-                                booking['day_of_week'],
-                                booking['start_time'].strftime('%H:%M:%S'),
-                                str(booking['duration']),
-                            ))
-
-                        print("--------------------------------------------------------")
-                        print("1. Edit Booking")
-                        print("2. Add Booking")
-                        print("3. Delete Booking")
-                        print("4. Go Back to Admin Dashboard")
-                        print("5. Exit")
-                        choice = input("Choose an action: ")
-
-                        if choice == "1":
-                            booking_id = input("Enter Booking ID to update: ")
-                            Admin.edit_booking(booking_id)
-                        elif choice == "2":
-                            Admin.add_room_booking()
-                        elif choice == "3":
-                            booking_id = input("Enter Booking ID to delete: ")
-                            Admin.delete_booking(booking_id)
-                        elif choice == "4":
-                            break  # Break the loop to go back to the previous menu
-                        elif choice == "5":
-                            Admin.admin_exit
-                        else:
-                            print("Invalid choice. Please choose again.")
+                for booking in bookings:
+                    print("| {:^12} | {:<25} | {:^5} | {:^10} | {:^10} |".format(
+                        booking['booking_id'],
+                        booking['room_name'],
+                        booking['day_of_week'],
+                        booking['start_time'].strftime('%H:%M:%S'),
+                        str(booking['duration']),
+                    ))
 
-                    except psycopg2.Error as e:
-                        print("An error occurred while managing room bookings:", e)
+                in_use = Timetable.in_use()
+                if in_use:
+                    rooms = CatalogCache.rooms()
+                    print("In use now:")
+                    for session in in_use:
+                        print(f"- {rooms.get(session['room_id'], '?')}: {session['class_name'] or 'Booking'} "
+                              f"({session['start_time'].strftime('%H:%M')}, {session['duration']} min)")
+
+                print("--------------------------------------------------------")
+                print("1. Edit Booking")
+                print("2. Add Booking")
+                print("3. Delete Booking")
+                print("4. Go Back to Admin Dashboard")
+                print("5. Exit")
+                choice = input("Choose an action: ")
+
+                if choice == "1":
+                    booking_id = input("Enter Booking ID to update: ")
+                    Admin.edit_booking(booking_id)
+                elif choice == "2":
+                    Admin.add_room_booking()
+                elif choice == "3":
+                    booking_id = input("Enter Booking ID to delete: ")
+                    Admin.delete_booking(booking_id)
+                elif choice == "4":
+                    break  # Break the loop to go back to the previous menu
+                elif choice == "5":
+                    Admin.admin_exit
+                else:
+                    print("Invalid choice. Please choose again.")
+
+            except psycopg2.Error as e:
+                print("An error occurred while managing room bookings:", e)
 
 
     @staticmethod
@@ -184,20 +207,11 @@ class Admin:
         print("=========================================================")
         print("Add New Room Booking:")
 
-        # Display available rooms and trainers
-        with DBManager.connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT room_id, room_name FROM rooms")
-                rooms = cursor.fetchall()
-                print("Available Rooms:")
-                for room in rooms:
-                    print(f"{room['room_id']}: {room['room_name']}")
-
-                cursor.execute("SELECT trainer_id, name FROM trainer_accounts")
-                trainers = cursor.fetchall()
-                print("\nAvailable Trainers:")
-                for trainer in trainers:
-                    print(f"{trainer['trainer_id']}: {trainer['name']}")
+        # Display available rooms; trainers are offered once the time is known
+        rooms = CatalogCache.rooms()
+        print("Available Rooms:")
+        for room_id, room_name in rooms.items():
+            print(f"{room_id}: {room_name}")
 
         valid_days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
@@ -209,24 +223,29 @@ class Admin:
             return
 
         room_id = Admin.get_valid_room_id(rooms, "Enter Room ID: ")
-        trainer_id = Admin.get_valid_trainer_id(trainers, "Enter Trainer ID: ")
         duration = Admin.get_valid_integer("Enter Duration (in minutes): ")
         day_of_week = Admin.get_valid_day_of_week(valid_days, "Enter Day of the Week (e.g., Mon): ")
         start_time = Admin.get_valid_time("Enter Start Time (HH:MM): ")
+        trainer_id = Admin.choose_free_trainer(day_of_week, start_time, duration)
+        if trainer_id is None:
+            return
+        if Admin.report_conflicts(room_id, trainer_id, day_of_week, start_time, duration):
+            return
 
         # Insert the new booking into the database
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        INSERT INTO bookings (booking_id, room_id, trainer_id, duration, day_of_week, start_time)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (booking_id, room_id, trainer_id, duration, day_of_week, start_time))
+                    cursor.execute(Queries.BOOKING_INSERT, (booking_id, room_id, trainer_id, duration, day_of_week, start_time))
                     conn.commit()
+                    Timetable.changed('bookings', booking_id)
                     print("Booking successfully added.")
                 except psycopg2.Error as e:
                     conn.rollback()
-                    print("Failed to add booking. Error:", e)
+                    if Schedule.is_overlap(e):
+                        print("Failed to add booking: the room or trainer was booked for that time in the meantime.")
+                    else:
+                        print("Failed to add booking. Error:", e)
 
     @staticmethod
     def get_unique_booking_id():
@@ -238,7 +257,7 @@ class Admin:
                 booking_id = int(booking_id)
                 with DBManager.connection() as conn:
                     with conn.cursor() as cursor:
-                        cursor.execute("SELECT booking_id FROM bookings WHERE booking_id = %s", (booking_id,))
+                        cursor.execute(Queries.BOOKING_EXISTS, (booking_id,))
                         if cursor.fetchone():
                             print("This Booking ID already exists. Please try a different ID.")
                         else:
@@ -250,10 +269,36 @@ class Admin:
     def get_valid_room_id(rooms, prompt):
         while True:
             room_id = input(prompt)
-            if room_id.isdigit() and any(room['room_id'] == int(room_id) for room in rooms):
+            if room_id.isdigit() and int(room_id) in rooms:
                 return int(room_id)
             print("Invalid Room ID. Please enter a valid numeric ID from the available rooms list.")
 
+    @staticmethod
+    def choose_free_trainer(day_of_week, start_time, duration):
+        """ Lists the trainers whose availability covers the session and returns the chosen id, or None if nobody is free. """
+        trainers = TrainerRoster.free(day_of_week, start_time, duration)
+        if not trainers:
+            print(f"No trainer is available on {day_of_week} at {start_time.strftime('%H:%M')} for {duration} minutes.")
+            input("Press Enter to continue...")
+            return None
+        print("\nAvailable Trainers:")
+        for trainer in trainers:
+            print(f"{trainer['trainer_id']}: {trainer['name']}")
+        return Admin.get_valid_trainer_id(trainers, "Enter Trainer ID: ")
+
+    @staticmethod
+    def report_conflicts(room_id, trainer_id, day_of_week, start_time, duration):
+        """ Prints the sessions the new one would clash with and returns True if there are any (or it runs past Sunday). """
+        if not Schedule.within_week(day_of_week, start_time, duration):
+            print("Sessions must end by Sunday midnight.")
+            input("Press Enter to continue...")
+            return True
+        conflicts = Schedule.conflicts(room_id, trainer_id, day_of_week, start_time, duration)
+        if conflicts:
+            Schedule.print_conflicts(conflicts)
+            input("Press Enter to continue...")
+        return bool(conflicts)
+
     @staticmethod
     def get_valid_trainer_id(trainers, prompt):
         while True:
@@ -294,12 +339,7 @@ class Admin:
             with conn.cursor() as cursor:
                 try:
                     # Retrieve the selected booking
-                    cursor.execute("""
-                        SELECT b.booking_id, r.room_name, b.day_of_week, b.start_time, b.duration, b.room_id
-                        FROM bookings b
-                        JOIN rooms r ON b.room_id = r.room_id
-                        WHERE b.booking_id = %s
-                    """, (booking_id,))
+                    cursor.execute(Queries.BOOKING_BY_ID, (booking_id,))
                     booking = cursor.fetchone()
 
                     if not booking:
@@ -315,11 +355,9 @@ class Admin:
                     print(f"Current Duration: {booking['duration']}")
 
                     # Get room choices
-                    cursor.execute("SELECT room_id, room_name FROM rooms")
-                    rooms = cursor.fetchall()
                     print("Available Rooms:")
-                    for room in rooms:
-                        print(f"{room['room_id']}: {room['room_name']}")
+                    for room_id, room_name in CatalogCache.rooms().items():
+                        print(f"{room_id}: {room_name}")
 
                     # Get updates from user
                     print("--------------------------------------------------------")
@@ -329,26 +367,29 @@ class Admin:
                     new_duration = input("New Duration (e.g., 1:25:00), press enter to keep current: ") or str(booking['duration'])
 
                     # Update booking
-                    cursor.execute("""
-                        UPDATE bookings
-                        SET room_id = %s, day_of_week = %s, start_time = %s, duration = %s
-                        WHERE booking_id = %s
-                    """, (new_room_id, new_day, new_time, new_duration, booking_id))
+                    cursor.execute(Queries.BOOKING_UPDATE, (new_room_id, new_day, new_time, new_duration, booking_id))
 
                     conn.commit()
+                    Timetable.changed('bookings', booking['booking_id'])
                     print("Booking updated successfully.")
                 
                 except psycopg2.Error as e:
                     conn.rollback()
-                    print(f"An error occurred while managing room bookings: {e}")
+                    if Schedule.is_overlap(e):
+                        print("Booking not updated: the room or trainer already has a session at that time.")
+                    elif Schedule.is_past_week_end(e):
+                        print("Booking not updated: sessions must end by Sunday midnight.")
+                    else:
+                        print(f"An error occurred while managing room bookings: {e}")
     
     @staticmethod
     def delete_booking(booking_id):
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("DELETE FROM bookings WHERE booking_id = %s", (booking_id,))
+                    cursor.execute(Queries.BOOKING_DELETE, (booking_id,))
                     conn.commit()
+                    Timetable.changed('bookings', booking_id)
                     print(f"Booking {booking_id} has been deleted.")
 
                 except psycopg2.Error as e:
@@ -360,6 +401,12 @@ class Admin:
         clear_screen()
         print("=========================================================")
         print("Equipment Maintenance Monitoring:")
+        # Items needing attention come from the alert set kept current by notifications, not a table scan
+        Admin.highlight_problematic_equipment(EquipmentAlerts.details())
+
+    @staticmethod
+    def list_all_equipment():
+        clear_screen()
         print("| {:<20} | {:<25} | {:^8} |".format(
             "Equipment Name", "Room Name", "Quality"
         ))
@@ -367,12 +414,7 @@ class Admin:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        SELECT e.equipment_name, r.room_name, e.quality
-                        FROM equipment e
-                        JOIN rooms r ON e.room_id = r.room_id
-                        ORDER BY e.quality DESC
-                    """)
+                    cursor.execute(Queries.EQUIPMENT_WITH_ROOMS)
                     equipments = cursor.fetchall()
 
                     for equipment in equipments:
@@ -381,18 +423,14 @@ class Admin:
                             equipment['room_name'],
                             equipment['quality'],
                         ))
-
-                    # List equipment needing immediate attention
-                    Admin.highlight_problematic_equipment(equipments)
-                    
                 except psycopg2.Error as e:
                     print("An error occurred while monitoring equipment maintenance:", e)
+        input("Press Enter to go back to the menu...")
 
     @staticmethod
-    def highlight_problematic_equipment(equipments):
+    def highlight_problematic_equipment(problematic):
         
-        print("\nChecking for equipment needing immediate attention...")
-        problematic = [equip for equip in equipments if equip['quality'] < 4 ]
+        print("\nEquipment needing immediate attention:")
         if problematic:
             print("| {:<20} | {:<25} | {:^8} |".format(
                 "Equipment Name", "Room Name", "Quality",
@@ -405,26 +443,38 @@ class Admin:
                     
                 ))
             print("\n1. Send Equipment for Maintenance")
-            print("2. Go Back to Menu")
+            print("2. Maintenance Forecast and Schedule")
+            print("3. View All Equipment")
+            print("4. Go Back to Menu")
             choice = input("Enter your choice: ")
             if choice == "1":
                 Admin.fix_equipment()
+            elif choice == "2":
+                MaintenanceForecast.menu()
+            elif choice == "3":
+                Admin.list_all_equipment()
         else:
             print("\nAll equipment is in good condition.")
-            input("Press Enter to go back to the menu...")
+            print("\n1. Maintenance Forecast and Schedule")
+            print("2. View All Equipment")
+            print("3. Go Back to Menu")
+            choice = input("Enter your choice: ")
+            if choice == "1":
+                MaintenanceForecast.menu()
+            elif choice == "2":
+                Admin.list_all_equipment()
 
     @staticmethod
     def fix_equipment():
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        UPDATE equipment
-                        SET quality = 10
-                        WHERE quality < 4
-                    """)
-                    updated_rows = cursor.rowcount
+                    cursor.execute(Queries.EQUIPMENT_FIX_WORN)
+                    fixed = [row['equipment_id'] for row in cursor.fetchall()]
+                    updated_rows = len(fixed)
                     conn.commit()
+                    EquipmentTelemetry.record_repairs(fixed)
+                    EquipmentAlerts.forget(fixed)  # Don't wait for the notifications before redisplaying
                     print(f"All necessary equipment has been fixed. Total items updated: {updated_rows}.")
                 except psycopg2.Error as e:
                     conn.rollback()
@@ -441,34 +491,28 @@ class Admin:
             print("=========================================================")
             print("Class Schedule Management")
 
-            # Display current classes
-            with DBManager.connection() as conn:
-                with conn.cursor() as cursor:
-                    try:
-                        cursor.execute("""
-                            SELECT class_id, class_name, trainer_id, room_id, day_of_week, start_time, duration
-                            FROM class_schedule
-                            ORDER BY class_id
-                        """)
-                        classes = cursor.fetchall()
-                        if classes:
-                            print("Current Classes:")
-                            print("| {:^10} | {:<15} | {:^15} | {:^7} | {:^15} | {:^10} | {:^10} |".format(
-                                "Class ID", "Class Name", "Trainer ID", "Room ID", "Day of Week", "Start Time", "Duration"))
-                            for class_ in classes:
-                                print("| {:^10} | {:<15} | {:^15} | {:^7} | {:^15} | {:^10} | {:^10} |".format(
-                                    class_['class_id'],
-                                    class_['class_name'],
-                                    class_['trainer_id'],
-                                    class_['room_id'],
-                                    class_['day_of_week'],
-                                    class_['start_time'].strftime('%H:%M'),
-                                    class_['duration']))
-                            print("--------------------------------------------------------")
-                        else:
-                            print("No classes found.")
-                    except psycopg2.Error as e:
-                        print("An error occurred while fetching class schedule:", e)
+            # Display current classes from the in-memory timetable
+            try:
+                classes = Timetable.classes()
+                if classes:
+                    print("Current Classes:")
+                    print("| {:^10} | {:<15} | {:^15} | {:^7} | {:^15} | {:^10} | {:^10} | {:^8} |".format(
+                        "Class ID", "Class Name", "Trainer ID", "Room ID", "Day of Week", "Start Time", "Duration", "Capacity"))
+                    for class_ in classes:
+                        print("| {:^10} | {:<15} | {:^15} | {:^7} | {:^15} | {:^10} | {:^10} | {:^8} |".format(
+                            class_['class_id'],
+                            class_['class_name'],
+                            class_['trainer_id'],
+                            class_['room_id'],
+                            class_['day_of_week'],
+                            class_['start_time'].strftime('%H:%M'),
+                            class_['duration'],
+                            class_['capacity']))
+                    print("--------------------------------------------------------")
+                else:
+                    print("No classes found.")
+            except psycopg2.Error as e:
+                print("An error occurred while fetching class schedule:", e)
         
             print("1. Add New Class")
             print("2. Edit Existing Class")
@@ -494,42 +538,40 @@ class Admin:
         print("=========================================================")
         print("Add New Class Schedule:")
 
-        # Display available trainers and rooms
-        with DBManager.connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.execute("SELECT room_id, room_name FROM rooms")
-                rooms = cursor.fetchall()
-                print("Available Rooms:")
-                for room in rooms:
-                    print(f"{room['room_id']}: {room['room_name']}")
-
-                cursor.execute("SELECT trainer_id, name FROM trainer_accounts")
-                trainers = cursor.fetchall()
-                print("\nAvailable Trainers:")
-                for trainer in trainers:
-                    print(f"{trainer['trainer_id']}: {trainer['name']}")
+        # Display available rooms; trainers are offered once the time is known
+        rooms = CatalogCache.rooms()
+        print("Available Rooms:")
+        for room_id, room_name in rooms.items():
+            print(f"{room_id}: {room_name}")
 
         class_name = input("Enter Class Name: ")
-        trainer_id = Admin.get_valid_trainer_id(trainers, "Enter Trainer ID: ")
         room_id = Admin.get_valid_room_id(rooms, "Enter Room ID: ")
         day_of_week = Admin.get_valid_day_of_week(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], "Enter Day of the Week (e.g., Mon): ")
         start_time = Admin.get_valid_time("Enter Start Time (HH:MM): ")
         duration = Admin.get_valid_integer("Enter Duration (in minutes): ")
+        capacity = Admin.get_valid_integer("Enter Capacity (seats): ")
+        trainer_id = Admin.choose_free_trainer(day_of_week, start_time, duration)
+        if trainer_id is None:
+            return
+        if Admin.report_conflicts(room_id, trainer_id, day_of_week, start_time, duration):
+            return
 
         # Insert the new class into the database
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        INSERT INTO class_schedule (class_name, trainer_id, room_id, day_of_week, start_time, duration)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (class_name, trainer_id, room_id, day_of_week, start_time, duration))
+                    cursor.execute(Queries.CLASS_INSERT, (class_name, trainer_id, room_id, day_of_week, start_time, duration, capacity))
+                    class_id = cursor.fetchone()['class_id']
                     conn.commit()
+                    Timetable.changed('class_schedule', class_id)
                     print("Class added successfully. Redirecting...")
                     time.sleep(1)
                 except psycopg2.Error as e:
                     conn.rollback()
-                    print("Failed to add class. Error:", e)
+                    if Schedule.is_overlap(e):
+                        print("Failed to add class: the room or trainer was booked for that time in the meantime.")
+                    else:
+                        print("Failed to add class. Error:", e)
 
                     
     @staticmethod
@@ -539,11 +581,7 @@ class Admin:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        SELECT class_name, trainer_id, room_id, day_of_week, start_time, duration
-                        FROM class_schedule
-                        WHERE class_id = %s
-                    """, (class_id,))
+                    cursor.execute(Queries.CLASS_BY_ID, (class_id,))
                     class_info = cursor.fetchone()
 
                     if not class_info:
@@ -577,18 +615,23 @@ class Admin:
                         except ValueError:
                             pass
 
-                    cursor.execute("""
-                        UPDATE class_schedule
-                        SET class_name = %s, trainer_id = %s, room_id = %s, day_of_week = %s,
-                            start_time = %s, duration = %s 
-                        WHERE class_id = %s
-                    """, (new_class_name, new_trainer_id, new_room_id, new_day, new_start_time, new_duration, class_id))
+                    # A bigger class fills its new seats from the waitlist (see resize_class_seats in tables.sql)
+                    new_capacity = input(f"New Capacity [{class_info['capacity']}]: ").strip()
+                    new_capacity = int(new_capacity) if new_capacity.isdigit() else class_info['capacity']
+
+                    cursor.execute(Queries.CLASS_UPDATE, (new_class_name, new_trainer_id, new_room_id, new_day, new_start_time, new_duration, new_capacity, class_id))
                     conn.commit()
+                    Timetable.changed('class_schedule', class_id)
                     print("Class updated successfully. Redirecting...")
                     time.sleep(1)
                 except psycopg2.Error as e:
                     conn.rollback()
-                    print("An error occurred while updating the class:", e)
+                    if Schedule.is_overlap(e):
+                        print("Class not updated: the room or trainer already has a session at that time.")
+                    elif Schedule.is_past_week_end(e):
+                        print("Class not updated: sessions must end by Sunday midnight.")
+                    else:
+                        print("An error occurred while updating the class:", e)
                     time.sleep(1)
 
 
@@ -599,8 +642,9 @@ class Admin:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("DELETE FROM class_schedule WHERE class_id = %s", (class_id,))
+                    cursor.execute(Queries.CLASS_DELETE, (class_id,))
                     conn.commit()
+                    Timetable.changed('class_schedule', class_id)
                     print(f"Class {class_id} has been deleted.")
                 except psycopg2.Error as e:
                     conn.rollback()
@@ -616,7 +660,10 @@ class Admin:
         while True:
             print("1. Mark Payment as Completed")
             print("2. Process a Refund")
-            print("3. Go Back")
+            print("3. Run Monthly Billing")
+            print("4. View Payments for a Month")
+            print("5. Archive Old Payments")
+            print("6. Go Back")
 
             choice = input("Enter choice: ")
 
@@ -625,24 +672,45 @@ class Admin:
             elif choice == "2":
                 Admin.process_refund()
             elif choice == "3":
+                Billing.run_billing_menu()
+                Admin.view_all_payments()
+            elif choice == "4":
+                Admin.view_payments_for_month()
+            elif choice == "5":
+                PaymentArchive.archive_menu()
+                Admin.view_all_payments()
+            elif choice == "6":
                 break
             else:
                 print("Invalid choice. Please choose again.")
 
     @staticmethod
-    def view_all_payments():
+    def view_payments_for_month():
+        month = input("Enter month to view (YYYY-MM): ").strip()
+        try:
+            start = datetime.datetime.strptime(month, '%Y-%m').date()
+        except ValueError:
+            print("Invalid month. Please use YYYY-MM format.")
+            return
+        Admin.view_all_payments(start, PaymentArchive.months_ago(-1, start))
+
+    @staticmethod
+    def view_all_payments(start=None, end=None):
         clear_screen()
+        # Keep listing the same date window unless a new one is requested
+        if start is None:
+            start, end = Admin.payment_window or (PaymentArchive.months_ago(Admin.PAYMENT_WINDOW_MONTHS - 1), None)
+        end = end or PaymentArchive.months_ago(-1)
+        Admin.payment_window = (start, end)
+
         # This function now only prints the payments without the surrounding menu text
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        SELECT payment_id, email, amount, payment_date, payment_type, status
-                        FROM payments
-                        ORDER BY payment_id
-                    """)
+                    # Bounding payment_date lets the planner prune every partition outside the window
+                    cursor.execute(Queries.PAYMENTS_IN_WINDOW, (start, end))
                     payments = cursor.fetchall()
-                    print("Current Payments:")
+                    print(f"Payments from {start.strftime('%Y-%m-%d')} to {(end - datetime.timedelta(days=1)).strftime('%Y-%m-%d')}:")
                     print("| {:^10} | {:<30} | {:^8} | {:^10} | {:<20} | {:^10} |".format(
                         "ID", "Email", "Amount", "Date", "Type", "Status"
                     ))
@@ -665,13 +733,12 @@ class Admin:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        UPDATE payments
-                        SET status = 'Completed'
-                        WHERE payment_id = %s
-                    """, (payment_id,))
+                    cursor.execute(Queries.PAYMENT_SET_STATUS, ('Completed', payment_id, *Admin.payment_window))
                     conn.commit()
-                    print(f"Payment {payment_id} marked as completed.")
+                    if cursor.rowcount:
+                        print(f"Payment {payment_id} marked as completed.")
+                    else:
+                        print(f"Payment {payment_id} is not in the listed date range.")
                 except psycopg2.Error as e:
                     conn.rollback()
                     print(f"An error occurred while marking the payment as completed: {e}")
@@ -684,13 +751,12 @@ class Admin:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("""
-                        UPDATE payments
-                        SET status = 'Refunded'
-                        WHERE payment_id = %s
-                    """, (payment_id,))
+                    cursor.execute(Queries.PAYMENT_SET_STATUS, ('Refunded', payment_id, *Admin.payment_window))
                     conn.commit()
-                    print(f"Refund processed for Payment {payment_id}.")
+                    if cursor.rowcount:
+                        print(f"Refund processed for Payment {payment_id}.")
+                    else:
+                        print(f"Payment {payment_id} is not in the listed date range.")
                 except psycopg2.Error as e:
                     conn.rollback()
                     print(f"An error occurred during the refund process: {e}")
@@ -700,34 +766,14 @@ class Admin:
                
     @staticmethod
     def view_all_trainers():
-
-        with DBManager.connection() as conn:
-            with conn.cursor() as cursor:
-                try:
-                    cursor.execute("""
-                        SELECT trainer_id, name, monday_available, tuesday_available, wednesday_available,
-                               thursday_available, friday_available
-                        FROM trainer_accounts
-                        ORDER BY trainer_id
-                    """)
-                    trainers = cursor.fetchall()
-                    if trainers:
-                        print("| {:^10} | {:<20} | {:<5} | {:<5} | {:<5} | {:<5} | {:<5} |".format(
-                            "ID", "Name", "Mon", "Tue", "Wed", "Thu", "Fri"))
-                        for trainer in trainers:
-                            print("| {:^10} | {:<20} | {:<5} | {:<5} | {:<5} | {:<5} | {:<5} |".format(
-                                trainer['trainer_id'],
-                                trainer['name'],
-                                "Yes" if trainer['monday_available'] else "No",
-                                "Yes" if trainer['tuesday_available'] else "No",
-                                "Yes" if trainer['wednesday_available'] else "No",
-                                "Yes" if trainer['thursday_available'] else "No",
-                                "Yes" if trainer['friday_available'] else "No"
-                            ))
-                    else:
-                        print("No trainers found.")
-                except psycopg2.Error as e:
-                    print("An error occurred while retrieving trainers:", e)
+        trainers = TrainerRoster.roster()
+        if not trainers:
+            print("No trainers found.")
+            return
+        row_format = "| {:^6} | {:<20} |" + " {:<11} |" * len(TrainerRoster.DAYS)
+        print(row_format.format("ID", "Name", *TrainerRoster.DAYS))
+        for trainer_id, name, availability in trainers:
+            print(row_format.format(trainer_id, name, *(TrainerRoster.describe(availability, day) for day in TrainerRoster.DAYS)))
 
     @staticmethod
     def manage_trainers():
@@ -740,7 +786,8 @@ class Admin:
             
             print("\n1. Add New Trainer")
             print("2. Delete Trainer")
-            print("3. Go Back")
+            print("3. Find Cover for a Trainer")
+            print("4. Go Back")
 
             choice = input("Enter your choice: ")
 
@@ -749,6 +796,8 @@ class Admin:
             elif choice == "2":
                 Admin.delete_trainer()
             elif choice == "3":
+                Admin.find_cover()
+            elif choice == "4":
                 break  # Exit the loop to go back to the previous menu
             else:
                 print("Invalid choice. Please try again.")
@@ -772,13 +821,14 @@ class Admin:
                 try:
                     # Insert new trainer into the trainers table
                     cursor.execute(
-                        "INSERT INTO trainer_accounts (name, password) VALUES (%s, %s) RETURNING trainer_id",
+                        Queries.TRAINER_INSERT,
                         (name, hashed_password.decode('utf-8'))
                     )
 
                     # Commit changes and retrieve the unique trainer_id
                     trainer_id = cursor.fetchone()['trainer_id']
                     conn.commit()
+                    CatalogCache.invalidate('trainer_accounts')  # Ahead of the notification confirming it
 
                     print(f"Trainer account created successfully! Your unique Trainer ID is {trainer_id}.")
                     print("Face system back to Administrator.")
@@ -793,14 +843,39 @@ class Admin:
                         print(f"An error occurred while trying to create your trainer account: {e}")
 
 
+    @staticmethod
+    def find_cover():
+        """ Lists every session of a trainer who cannot work, with the trainers who are available and not already booked then. """
+        trainer_id = input("Enter the ID of the trainer who needs cover: ").strip()
+        if not trainer_id.isdigit():
+            print("Invalid Trainer ID.")
+            input("Press Enter to continue...")
+            return
+
+        sessions = []
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.TRAINER_SESSIONS, {'trainer_id': int(trainer_id), 'days': TrainerRoster.DAYS})
+                sessions = cursor.fetchall()
+        if not sessions:
+            print("This trainer has no bookings or classes to cover.")
+        for session in sessions:
+            cover = TrainerRoster.free_and_unbooked(session['day_of_week'], session['start_time'], session['duration'],
+                                                    exclude=[int(trainer_id)])
+            print(f"{session['day_of_week']} {session['start_time'].strftime('%H:%M')} ({session['duration']} min) "
+                  f"{session['session_name']} in {session['room_name']}: "
+                  f"{', '.join(trainer['name'] for trainer in cover) or 'no trainer available'}")
+        input("Press Enter to continue...")
+
     @staticmethod
     def delete_trainer():
         trainer_id = input("Enter Trainer ID to delete: ")
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
-                    cursor.execute("DELETE FROM trainer_accounts WHERE trainer_id = %s", (trainer_id,))
+                    cursor.execute(Queries.TRAINER_DELETE, (trainer_id,))
                     conn.commit()
+                    CatalogCache.invalidate('trainer_accounts')
                     print(f"Trainer {trainer_id} has been successfully deleted.")
                 except psycopg2.Error as e:
                     conn.rollback()
@@ -816,7 +891,7 @@ class Admin:
             with DBManager.connection() as conn:
                 with conn.cursor() as cursor:
                     try:
-                        cursor.execute("SELECT email, name FROM member_accounts ORDER BY name")
+                        cursor.execute(Queries.MEMBERS_BY_NAME)
                         members = cursor.fetchall()
                         clear_screen()
                         print("List of All Members:")
@@ -859,13 +934,14 @@ class Admin:
             with conn.cursor() as cursor:
                 try:
                     # Start by deleting from dependent tables
-                    cursor.execute("DELETE FROM fitness_goals WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM exercise_routines WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM member_health_metrics WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM payments WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM fitness_achievements WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM health_statistics WHERE email = %s", (email,))
-                    cursor.execute("DELETE FROM member_accounts WHERE email = %s", (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_GOALS, (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_ROUTINES, (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_HEALTH_METRICS, (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_PAYMENTS, (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_ACHIEVEMENTS, (email,))
+                    cursor.execute(Queries.DELETE_MEMBER_HEALTH_STATS, (email,))
+                    Enrollment.release_all(cursor, email)
+                    cursor.execute(Queries.DELETE_MEMBER_ACCOUNT, (email,))
                     conn.commit()
                     print(f"Member with email {email} has been successfully deleted.")
                     time.sleep(1)
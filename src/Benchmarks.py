@@ -0,0 +1,367 @@
+"""
+The Benchmarks class measures how the app's hot paths behave under concurrent load against a real database.
+Each benchmark creates the rows it needs, drives them from many threads with one connection each, reports
+throughput and latency percentiles, checks that no update was lost and removes its rows again.
+
+Run it from the src directory: `python Benchmarks.py equipment --users 50 --uses 20 [--accumulate]` or
+`python Benchmarks.py enrollment --members 300 --capacity 20 --cancels 10` or
+`python Benchmarks.py checkin --members 500 --doors 4 --taps 5000`.
+
+Key Functionalities:
+- equipment_contention(users, uses, accumulate): Has every user claim the same machine over and over, then
+  checks the wear each claim saw against the machine's final quality.
+- enrollment_rush(members, capacity, cancels): Has every member enroll in one class at the same instant, then
+  cancels some seats at once and checks that the class is never overbooked and the waitlist is served in order.
+- check_in_burst(members, doors, taps): Has several doors check badges in at once, some of them invalid, and
+  checks each member's first tap was recorded as exactly one visit.
+- percentile(samples, fraction): Nearest-rank percentile of a sorted list.
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+import psycopg2
+
+from DatabaseManager import DBManager
+from CheckIn import CheckIn
+from Enrollment import Enrollment
+from EquipmentUsage import EquipmentUsage
+
+
+class Benchmarks:
+    START_QUALITY = 10
+
+    @staticmethod
+    def percentile(samples, fraction):
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else 0.0
+
+    @staticmethod
+    def _create_machine():
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO equipment (equipment_name, room_id, quality)
+                    SELECT 'Benchmark Machine', MIN(room_id), %s FROM rooms
+                    RETURNING equipment_id
+                """, (Benchmarks.START_QUALITY,))
+                equipment_id = cursor.fetchone()['equipment_id']
+                conn.commit()
+                return equipment_id
+        return None
+
+    @staticmethod
+    def _remove_machine(equipment_id):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT quality FROM equipment WHERE equipment_id = %s", (equipment_id,))
+                final = cursor.fetchone()['quality']
+                cursor.execute("DELETE FROM equipment WHERE equipment_id = %s", (equipment_id,))
+                conn.commit()
+                return final
+        return None
+
+    @staticmethod
+    def _user(equipment_id, uses, claims, latencies, errors):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                for _ in range(uses):
+                    started = time.perf_counter()
+                    try:
+                        claim = EquipmentUsage.use(cursor, equipment_id)
+                    except psycopg2.Error as e:
+                        conn.rollback()
+                        errors.append(str(e))
+                        continue
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if claim:
+                        claims.append((claim['quality'], claim['wear']))
+
+    @staticmethod
+    def equipment_contention(users, uses, accumulate=False):
+        """ Runs the benchmark and returns its report, or None if the database could not be reached. """
+        EquipmentUsage.ACCUMULATE = accumulate
+        equipment_id = Benchmarks._create_machine()
+        if equipment_id is None:
+            return None
+
+        claims, latencies, errors = [], [], []
+        threads = [threading.Thread(target=Benchmarks._user, args=(equipment_id, uses, claims, latencies, errors))
+                   for _ in range(users)]
+        started = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            EquipmentUsage.flush()
+        finally:
+            elapsed = time.perf_counter() - started
+            final = Benchmarks._remove_machine(equipment_id)
+
+        # Every claim must have started from the quality the previous one left, so the claims seen, in order,
+        # are exactly the qualities a single member using the machine this many times would have seen.
+        # Accumulated wear only promises the final quality; claims racing a flush may see a stale quality.
+        expected, quality = [], Benchmarks.START_QUALITY
+        for _ in claims:
+            expected.append(quality)
+            quality = max(EquipmentUsage.MIN_QUALITY, quality - EquipmentUsage.WEAR_PER_USE)
+        latencies.sort()
+        return {
+            'claims': len(claims),
+            'errors': len(errors),
+            'seconds': elapsed,
+            'per_second': len(claims) / elapsed if elapsed else 0.0,
+            'p50_ms': Benchmarks.percentile(latencies, 0.50),
+            'p95_ms': Benchmarks.percentile(latencies, 0.95),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            'final_quality': final,
+            'expected_quality': quality,
+            'lost_updates': final != quality or (
+                not accumulate and sum(wear for _, wear in claims) != Benchmarks.START_QUALITY - final),
+            'consistent_claims': sorted(q for q, _ in claims) == sorted(expected),
+        }
+
+    @staticmethod
+    def _create_class(members, capacity):
+        """ Creates the members and an unscheduled class (so it clashes with nothing); returns (class_id, emails). """
+        emails = [f"bench.member.{n}@example.com" for n in range(1, members + 1)]
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO member_accounts (email, name, password)
+                    SELECT email, 'Benchmark Member', '' FROM unnest(%s::VARCHAR[]) email
+                """, (emails,))
+                cursor.execute("""
+                    INSERT INTO class_schedule (class_name, trainer_id, room_id, capacity)
+                    SELECT 'Benchmark Class', (SELECT MIN(trainer_id) FROM trainer_accounts), MIN(room_id), %s FROM rooms
+                    RETURNING class_id
+                """, (capacity,))
+                class_id = cursor.fetchone()['class_id']
+                conn.commit()
+                return class_id, emails
+        return None, emails
+
+    @staticmethod
+    def _class_state(class_id):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT (SELECT COUNT(email) FROM class_seats WHERE class_id = %(class_id)s) AS taken,
+                           (SELECT COUNT(DISTINCT email) FROM class_seats WHERE class_id = %(class_id)s) AS members,
+                           (SELECT COUNT(*) FROM class_waitlist WHERE class_id = %(class_id)s) AS waiting
+                """, {'class_id': class_id})
+                return cursor.fetchone()
+        return None
+
+    @staticmethod
+    def _remove_class(class_id, emails):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                if class_id is not None:
+                    cursor.execute("DELETE FROM class_schedule WHERE class_id = %s", (class_id,))
+                cursor.execute("DELETE FROM member_accounts WHERE email = ANY(%s)", (emails,))
+                conn.commit()
+
+    @staticmethod
+    def _member(action, class_id, email, gate, results, latencies, errors):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                gate.wait()  # Everyone books the moment the class opens
+                started = time.perf_counter()
+                try:
+                    result = action(cursor, class_id, email)
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    errors.append(str(e))
+                    return
+                latencies.append((time.perf_counter() - started) * 1000)
+                results.append((email, result))
+
+    @staticmethod
+    def _rush(action, class_id, emails):
+        """ Runs action for every email at once, one thread and connection each; returns (results, latencies, errors, seconds). """
+        results, latencies, errors = [], [], []
+        gate = threading.Barrier(len(emails))
+        threads = [threading.Thread(target=Benchmarks._member, args=(action, class_id, email, gate, results, latencies, errors))
+                   for email in emails]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, sorted(latencies), errors, time.perf_counter() - started
+
+    @staticmethod
+    def enrollment_rush(members, capacity, cancels):
+        """ Runs the benchmark and returns its report, or None if the database could not be reached. """
+        class_id, emails = Benchmarks._create_class(members, capacity)
+        if class_id is None:
+            return None
+        try:
+            results, latencies, errors, elapsed = Benchmarks._rush(Enrollment.enroll, class_id, emails)
+            after_rush = Benchmarks._class_state(class_id)
+
+            enrolled = [email for email, result in results if result['status'] == 'enrolled']
+            waitlisted = sorted(result['position'] for _, result in results if result['status'] == 'waitlisted')
+            busy = sum(1 for _, result in results if result['status'] == 'busy')
+
+            cancelled = enrolled[:cancels]
+            cancel_results, _, cancel_errors, _ = (Benchmarks._rush(Enrollment.cancel, class_id, cancelled)
+                                                   if cancelled else ([], [], [], 0.0))
+            promoted = [result['promoted'] for _, result in cancel_results if result.get('promoted')]
+            after_cancel = Benchmarks._class_state(class_id)
+        finally:
+            Benchmarks._remove_class(class_id, emails)
+
+        return {
+            'enrolled': len(enrolled),
+            'waitlisted': len(waitlisted),
+            'busy': busy,
+            'errors': len(errors) + len(cancel_errors),
+            'seconds': elapsed,
+            'per_second': len(results) / elapsed if elapsed else 0.0,
+            'p50_ms': Benchmarks.percentile(latencies, 0.50),
+            'p95_ms': Benchmarks.percentile(latencies, 0.95),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            'promoted': len(promoted),
+            # Every seat is filled while anyone waits, nobody holds two seats and no class goes over capacity
+            'overbooked': after_rush['taken'] > capacity or after_rush['taken'] != after_rush['members']
+                          or after_cancel['taken'] > capacity,
+            'seats_idle': (after_rush['taken'] < capacity and after_rush['waiting'] > 0)
+                          or (after_cancel['taken'] < capacity and after_cancel['waiting'] > 0),
+            'waitlist_in_order': waitlisted == list(range(1, len(waitlisted) + 1))
+                                 and len(promoted) == min(len(cancelled), len(waitlisted)),
+        }
+
+    @staticmethod
+    def _create_badges(members):
+        """ Creates members with a badge each; returns {token: email}. """
+        tokens = {f"bench-badge-{n}-{random.getrandbits(64):x}": f"bench.member.{n}@example.com" for n in range(1, members + 1)}
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    INSERT INTO member_accounts (email, name, password)
+                    SELECT email, 'Benchmark Member', '' FROM unnest(%s::VARCHAR[]) email
+                """, (list(tokens.values()),))
+                cursor.execute("""
+                    INSERT INTO member_badges (badge_hash, email)
+                    SELECT * FROM unnest(%s::CHAR(64)[], %s::VARCHAR[])
+                """, ([CheckIn.hash_token(token) for token in tokens], list(tokens.values())))
+                conn.commit()
+                return tokens
+        return None
+
+    @staticmethod
+    def _visits(emails):
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT email, COUNT(*) AS visits FROM visits WHERE email = ANY(%s) GROUP BY email", (emails,))
+                return {row['email']: row['visits'] for row in cursor.fetchall()}
+        return {}
+
+    @staticmethod
+    def _door(taps, latencies, results):
+        for token in taps:
+            started = time.perf_counter()
+            result = CheckIn.check_in(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            results.append(result['status'])
+
+    @staticmethod
+    def check_in_burst(members, doors, taps):
+        """ Runs the benchmark and returns its report, or None if the database could not be reached. """
+        tokens = Benchmarks._create_badges(members)
+        if tokens is None:
+            return None
+        emails = list(tokens.values())
+        try:
+            CheckIn.reload()  # A door loads the badges once, before the first member arrives
+            # One tap in twenty is an invalid badge; the rest are members arriving, some tapping twice
+            stream = [random.choice(list(tokens)) if random.random() >= 0.05 else f"bogus-{random.getrandbits(64):x}"
+                      for _ in range(taps)]
+            tapped = {tokens[token] for token in stream if token in tokens}
+            latencies, results = [], []
+            threads = [threading.Thread(target=Benchmarks._door, args=(stream[door::doors], latencies, results))
+                       for door in range(doors)]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+            CheckIn.visits.flush()
+            visits = Benchmarks._visits(emails)
+        finally:
+            Benchmarks._remove_class(None, emails)  # Deleting the members removes their badges and visits
+
+        latencies.sort()
+        return {
+            'taps': len(results),
+            'welcome': results.count('welcome'),
+            'repeat': results.count('repeat'),
+            'denied': results.count('denied'),
+            'seconds': elapsed,
+            'per_second': len(results) / elapsed if elapsed else 0.0,
+            'p50_ms': Benchmarks.percentile(latencies, 0.50),
+            'p99_ms': Benchmarks.percentile(latencies, 0.99),
+            'max_ms': latencies[-1] if latencies else 0.0,
+            # Every member who tapped has exactly one visit (repeat taps fall within REPEAT_SECONDS)
+            'visits_correct': set(visits) == tapped and all(count == 1 for count in visits.values())
+                              and results.count('welcome') == len(tapped),
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the app's hot paths under concurrent load.")
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    equipment = subparsers.add_parser('equipment', help="Many members claiming the same machine at once")
+    equipment.add_argument('--users', type=int, default=50, help="Concurrent members, one connection each")
+    equipment.add_argument('--uses', type=int, default=20, help="Uses per member")
+    equipment.add_argument('--accumulate', action='store_true', help="Accumulate wear in memory (FITNESS_ACCUMULATE_WEAR)")
+    enrollment = subparsers.add_parser('enrollment', help="Many members booking the same class the moment it opens")
+    enrollment.add_argument('--members', type=int, default=300, help="Members booking at once, one connection each")
+    enrollment.add_argument('--capacity', type=int, default=20, help="Seats in the class")
+    enrollment.add_argument('--cancels', type=int, default=10, help="Enrolled members who then cancel at once")
+    checkin = subparsers.add_parser('checkin', help="Doors checking in a burst of member badges")
+    checkin.add_argument('--members', type=int, default=500, help="Members with a badge")
+    checkin.add_argument('--doors', type=int, default=4, help="Turnstiles checking badges at once")
+    checkin.add_argument('--taps', type=int, default=5000, help="Badge taps across all doors")
+    args = parser.parse_args()
+
+    if args.benchmark == 'checkin':
+        report = Benchmarks.check_in_burst(args.members, args.doors, args.taps)
+        if report is None:
+            sys.exit(2)
+        print(f"{report['taps']} taps at {args.doors} doors in {report['seconds']:.2f} s ({report['per_second']:.0f}/s): "
+              f"{report['welcome']} visits, {report['repeat']} repeat taps, {report['denied']} denied")
+        print(f"latency p50 {report['p50_ms']:.3f} ms  p99 {report['p99_ms']:.3f} ms  max {report['max_ms']:.3f} ms")
+        print(f"visits recorded correctly: {'yes' if report['visits_correct'] else 'NO'}")
+        sys.exit(0 if report['visits_correct'] else 1)
+
+    if args.benchmark == 'enrollment':
+        report = Benchmarks.enrollment_rush(args.members, args.capacity, args.cancels)
+        if report is None:
+            sys.exit(2)
+        print(f"{args.members} members booked {args.capacity} seats in {report['seconds']:.2f} s "
+              f"({report['per_second']:.0f}/s): {report['enrolled']} enrolled, {report['waitlisted']} waitlisted, "
+              f"{report['busy']} busy, {report['errors']} errors")
+        print(f"latency p50 {report['p50_ms']:.2f} ms  p95 {report['p95_ms']:.2f} ms  max {report['max_ms']:.2f} ms")
+        print(f"{report['promoted']} promoted from the waitlist, overbooked: {'YES' if report['overbooked'] else 'no'}, "
+              f"idle seats: {'YES' if report['seats_idle'] else 'no'}, "
+              f"waitlist in order: {'yes' if report['waitlist_in_order'] else 'NO'}")
+        sys.exit(1 if report['overbooked'] or report['seats_idle'] or not report['waitlist_in_order']
+                 or report['errors'] else 0)
+
+    report = Benchmarks.equipment_contention(args.users, args.uses, args.accumulate)
+    if report is None:
+        sys.exit(2)
+    print(f"{report['claims']} claims by {args.users} users in {report['seconds']:.2f} s "
+          f"({report['per_second']:.0f}/s), {report['errors']} errors")
+    print(f"latency p50 {report['p50_ms']:.2f} ms  p95 {report['p95_ms']:.2f} ms  max {report['max_ms']:.2f} ms")
+    print(f"final quality {report['final_quality']} (expected {report['expected_quality']}), "
+          f"lost updates: {'YES' if report['lost_updates'] else 'no'}, "
+          f"claims consistent: {'yes' if report['consistent_claims'] else 'NO'}")
+    sys.exit(1 if report['lost_updates'] or report['errors'] else 0)
@@ -0,0 +1,112 @@
+"""
+The Billing class generates the recurring monthly membership charges for every active member of the
+club. A billing run is split into hash partitions of the member list, each processed by its own worker
+process, and each worker walks its partition in keyset-paginated batches that are written with a single
+multi-row INSERT per batch.
+
+Every charge carries the billing period it belongs to and is dated on the first day of that period, and
+a unique index on (email, billing_period, payment_date) makes the run idempotent: an interrupted or
+repeated run simply skips members that were already billed for that period, so a failed run can be
+restarted at any time.
+
+Key Functionalities:
+- run_billing(period, workers, batch_size): Bills every active member for the period and returns the number of new charges.
+- bill_partition(args): Worker entry point that bills one hash partition of the members in batches.
+- period_start(value): Normalizes a date or 'YYYY-MM' string to the first day of its billing month.
+- run_billing_menu(): Interactive prompt used by the admin payment screen.
+"""
+
+import datetime
+import time
+from multiprocessing import Pool
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from PaymentArchive import PaymentArchive
+
+
+class Billing:
+    MONTHLY_FEE = 50.00
+    PAYMENT_TYPE = 'Monthly Membership'
+    INITIAL_STATUS = 'Pending'
+    BATCH_SIZE = 5000
+    WORKERS = 4
+    NON_MEMBER_EMAILS = ('guest', 'admin')
+
+    @staticmethod
+    def period_start(value=None):
+        """ Returns the first day of the billing month for a date, a 'YYYY-MM' string or today. """
+        if value is None:
+            value = datetime.date.today()
+        elif isinstance(value, str):
+            value = datetime.datetime.strptime(value, '%Y-%m').date()
+        return value.replace(day=1)
+
+    @staticmethod
+    def bill_partition(args):
+        """ Bills every active member in one hash partition, one batch and one commit at a time. """
+        period, partition, partitions, batch_size = args
+        created = 0
+        last_email = ''
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                while True:
+                    # Keyset pagination keeps every batch an index range scan on the member_accounts primary key
+                    cursor.execute(Queries.BILLING_MEMBER_BATCH, (last_email, Billing.NON_MEMBER_EMAILS, partitions, partition, batch_size))
+                    emails = [row['email'] for row in cursor.fetchall()]
+                    if not emails:
+                        break
+
+                    charges = [(email, Billing.MONTHLY_FEE, period, Billing.PAYMENT_TYPE, Billing.INITIAL_STATUS, period) for email in emails]
+                    execute_values(cursor, Queries.BILLING_INSERT_CHARGES, charges, page_size=batch_size)
+                    created += cursor.rowcount
+                    conn.commit()  # Each batch is durable on its own, so a crashed run resumes where it stopped
+                    last_email = emails[-1]
+        return created
+
+    @staticmethod
+    def run_billing(period=None, workers=None, batch_size=None):
+        """ Bills all active members for the period across worker processes and returns the number of new charges. """
+        period = Billing.period_start(period)
+        workers = workers or Billing.WORKERS
+        batch_size = batch_size or Billing.BATCH_SIZE
+        jobs = [(period, partition, workers, batch_size) for partition in range(workers)]
+
+        # Charges are dated on their billing period, so they all land in that month's partition
+        PaymentArchive.ensure_partition(period)
+
+        if workers == 1:
+            return Billing.bill_partition(jobs[0])
+        with Pool(processes=workers) as pool:
+            return sum(pool.map(Billing.bill_partition, jobs))
+
+    @staticmethod
+    def run_billing_menu():
+        period_input = input("Enter billing period (YYYY-MM), or press Enter for the current month: ").strip()
+        try:
+            period = Billing.period_start(period_input or None)
+        except ValueError:
+            print("Invalid period. Please use YYYY-MM format.")
+            time.sleep(1)
+            return
+
+        print(f"Running monthly billing for {period.strftime('%Y-%m')}...")
+        started = time.perf_counter()
+        try:
+            created = Billing.run_billing(period)
+        except psycopg2.Error as e:
+            print(f"An error occurred during the billing run: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        print(f"Billing run complete: {created} new charges created in {elapsed:.1f}s.")
+        print("Members already billed for this period were skipped.")
+        input("Press Enter to continue...")
+
+
+if __name__ == "__main__":
+    # Allows the billing run to be scheduled from cron, e.g. `python Billing.py 2024-05`
+    import sys
+    print(f"Created {Billing.run_billing(sys.argv[1] if len(sys.argv) > 1 else None)} charges.")
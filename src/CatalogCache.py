@@ -0,0 +1,112 @@
+"""
+The CatalogCache class keeps the club's catalogs (rooms, the equipment in each room and the trainer roster)
+in memory for the whole process. These tables change rarely but are read on nearly every interaction, so
+each list is loaded once and served from memory until it changes. A trigger on the catalog tables sends a
+NOTIFY on the `catalog_changes` channel naming the table (and room) that changed, and the handler drops just
+the affected entries. Entries also expire after TTL_SECONDS, and the least recently used ones are evicted
+once more than MAX_ENTRIES are held, which bounds both staleness and memory if a notification is missed.
+
+Equipment quality drops with every use without notifying, so the quality shown in a cached equipment list
+is only indicative; callers that act on quality must read it from the database at that point.
+
+Key Functionalities:
+- start(): Subscribes the process to catalog change notifications.
+- rooms(): All rooms as {room_id: room_name}.
+- room_capacities(): Every room's capacity as {room_id: capacity} (0 when the room is closed).
+- equipment_in_room(room_id): The usable equipment in a room.
+- trainer_availability(): The trainer roster with each trainer's availability bitmask (see TrainerRoster).
+- invalidate(table, room_id): Drops the entries built from a table, e.g. right after this process edits it.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from DatabaseManager import DBManager
+from Notifications import Notifications
+from QueryRegistry import Queries
+
+
+class CatalogCache:
+    CHANNEL = 'catalog_changes'
+    TTL_SECONDS = 300  # Longest an entry is served without being reloaded
+    MAX_ENTRIES = 64  # Least recently used entries beyond this are evicted
+
+    _entries = OrderedDict()  # key -> (loaded_at, rows); most recently used last
+    _lock = threading.Lock()
+    _generation = 0  # Bumped by every invalidation, so a load racing one is not cached
+    _started = False
+
+    @staticmethod
+    def start():
+        if not CatalogCache._started:
+            CatalogCache._started = True
+            Notifications.subscribe(CatalogCache.CHANNEL, CatalogCache.handle, CatalogCache.clear)
+
+    @staticmethod
+    def handle(payload):
+        change = json.loads(payload)
+        CatalogCache.invalidate(change['table'], change.get('room_id'))
+
+    @staticmethod
+    def invalidate(table, room_id=None):
+        """ Drops the entries loaded from table; room_id narrows an equipment change to that room's entry. """
+        with CatalogCache._lock:
+            CatalogCache._generation += 1
+            for key in list(CatalogCache._entries):
+                if key[0] == table and (room_id is None or table != 'equipment' or key[1] == room_id):
+                    del CatalogCache._entries[key]
+
+    @staticmethod
+    def clear():
+        """ Drops every entry; runs whenever listening (re)starts, as changes may have been missed. """
+        with CatalogCache._lock:
+            CatalogCache._generation += 1
+            CatalogCache._entries.clear()
+
+    @staticmethod
+    def _get(key, query, params=()):
+        """ Returns the cached rows for key, loading them with query if missing or expired. """
+        CatalogCache.start()
+        now = time.monotonic()
+        with CatalogCache._lock:
+            entry = CatalogCache._entries.get(key)
+            if entry and now - entry[0] < CatalogCache.TTL_SECONDS:
+                CatalogCache._entries.move_to_end(key)
+                return entry[1]
+            generation = CatalogCache._generation
+
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, params)
+                rows = cursor.fetchall()
+                with CatalogCache._lock:
+                    if generation != CatalogCache._generation:
+                        return rows  # Invalidated while loading; serve these rows once but do not cache them
+                    CatalogCache._entries[key] = (now, rows)
+                    CatalogCache._entries.move_to_end(key)
+                    while len(CatalogCache._entries) > CatalogCache.MAX_ENTRIES:
+                        CatalogCache._entries.popitem(last=False)
+                return rows
+        return []
+
+    @staticmethod
+    def rooms():
+        rows = CatalogCache._get(('rooms',), Queries.ROOMS_ALL)
+        return {row['room_id']: row['room_name'] for row in rows}
+
+    @staticmethod
+    def room_capacities():
+        rows = CatalogCache._get(('rooms', 'capacity'), Queries.ROOMS_CAPACITY)
+        return {row['room_id']: row['capacity'] for row in rows}
+
+    @staticmethod
+    def equipment_in_room(room_id):
+        """ Returns (equipment_id, equipment_name, quality) rows; quality is as of when the room was loaded. """
+        return CatalogCache._get(('equipment', room_id), Queries.EQUIPMENT_IN_ROOM, (room_id,))
+
+    @staticmethod
+    def trainer_availability():
+        """ Returns (trainer_id, name, availability) rows for every trainer. """
+        return CatalogCache._get(('trainer_accounts',), Queries.TRAINER_ROSTER)
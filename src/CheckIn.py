@@ -0,0 +1,170 @@
+"""
+The CheckIn class is the door turnstile's path into the gym. A member taps a badge and is let in without the
+password check and the stats setup of a full log in. The badge's token is hashed with SHA-256 (tokens are
+random, so no slow password hash is needed) and the hash is looked up in an in-memory map of every active
+badge, loaded once per process. Each visit is appended to a WriteBehind buffer and written to `visits` in
+batches, so a check-in does no database round trip and a burst of members arriving for a class is
+served from memory.
+
+Issuing or revoking a badge sends a NOTIFY on `badge_changes`. The listener thread then re-reads that one
+badge by primary key and updates the map, so the door itself never waits on the database, not even for an
+invalid badge. The whole map is reloaded whenever the listener (re)connects, as changes may have been missed.
+
+Run it from the src directory as a turnstile, reading one badge per line: `python CheckIn.py`.
+
+Key Functionalities:
+- check_in(token): Validates a badge and records the visit; returns whether the member may enter.
+- issue_badge(email): Creates a new badge for a member, revoking their old one, and returns its token.
+- hash_token(token): The SHA-256 hex digest stored for a badge.
+- show_badge(email): The member's badge screen, with their recent visits.
+"""
+
+import collections
+import datetime
+import hashlib
+import secrets
+import sys
+import threading
+import time
+
+import psycopg2
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from Notifications import Notifications
+from QueryRegistry import Queries
+from WriteBehind import WriteBehind
+
+
+class CheckIn:
+    CHANNEL = 'badge_changes'
+    FLUSH_EVENTS = 200  # Visits buffered before they are written
+    FLUSH_MS = 1000  # Longest a visit waits in memory before it is written
+    REPEAT_SECONDS = 60  # A second tap within this long is not a new visit
+
+    visits = WriteBehind(Queries.VISIT_INSERT, FLUSH_EVENTS, FLUSH_MS)
+
+    _badges = {}  # badge hash -> {'email', 'name'}
+    _last_seen = collections.OrderedDict()  # email -> monotonic time of their last recorded visit, oldest first
+    _loaded = False
+    _lock = threading.Lock()
+    _started = False
+
+    @staticmethod
+    def start():
+        if not CheckIn._started:
+            CheckIn._started = True
+            Notifications.subscribe(CheckIn.CHANNEL, CheckIn.handle, CheckIn.reload)
+
+    @staticmethod
+    def handle(payload):
+        """ Re-reads the badge that changed (runs on the listener thread). """
+        if not payload:  # The table was truncated
+            CheckIn.reload()
+            return
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.BADGE_MEMBER, (payload,))
+                row = cursor.fetchone()
+                with CheckIn._lock:
+                    if row:
+                        CheckIn._badges[payload] = {'email': row['email'], 'name': row['name']}
+                    else:
+                        CheckIn._badges.pop(payload, None)  # Revoked, or its member was deleted
+
+    @staticmethod
+    def reload():
+        """ Loads every active badge; runs when listening (re)starts, as changes may have been missed. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.BADGES_ACTIVE)
+                badges = {row['badge_hash']: {'email': row['email'], 'name': row['name']} for row in cursor.fetchall()}
+                with CheckIn._lock:
+                    CheckIn._badges = badges
+                    CheckIn._loaded = True
+
+    @staticmethod
+    def hash_token(token):
+        return hashlib.sha256(token.strip().encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def check_in(token):
+        """
+        Returns {'status': 'welcome', 'name', 'email'}, {'status': 'repeat', ...} for a second tap within
+        REPEAT_SECONDS (the door still opens, but no visit is recorded) or {'status': 'denied'}.
+        """
+        CheckIn.start()
+        if not CheckIn._loaded:
+            CheckIn.reload()
+        badge_hash = CheckIn.hash_token(token)
+        now = time.monotonic()
+        with CheckIn._lock:
+            member = CheckIn._badges.get(badge_hash)
+            if member is None:
+                return {'status': 'denied'}
+            repeat = now - CheckIn._last_seen.get(member['email'], -CheckIn.REPEAT_SECONDS) < CheckIn.REPEAT_SECONDS
+            if not repeat:
+                CheckIn._last_seen[member['email']] = now
+                CheckIn._last_seen.move_to_end(member['email'])
+                # Members seen longer than REPEAT_SECONDS ago can only make a new visit, so they are forgotten
+                while now - next(iter(CheckIn._last_seen.values())) >= CheckIn.REPEAT_SECONDS:
+                    CheckIn._last_seen.popitem(last=False)
+        if not repeat:
+            CheckIn.visits.add((member['email'], datetime.datetime.now()))
+        return {'status': 'repeat' if repeat else 'welcome', **member}
+
+    @staticmethod
+    def issue_badge(email):
+        """ Revokes the member's current badge and returns the token of a new one, or None if it could not be saved. """
+        token = secrets.token_urlsafe(16)
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.BADGE_REVOKE, (email,))
+                cursor.execute(Queries.BADGE_INSERT, (CheckIn.hash_token(token), email))
+                conn.commit()
+                return token
+        return None
+
+    @staticmethod
+    def show_badge(email):
+        clear_screen()
+        print("====================================================")
+        print("My Check-in Badge")
+        CheckIn.visits.flush()  # Include visits still buffered in memory
+        month_start = datetime.date.today().replace(day=1)
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(Queries.MEMBER_VISITS_SINCE, (email, month_start))
+                    visits = cursor.fetchone()
+                    print(f"Visits this month: {visits['visits']}")
+                    if visits['last_visit']:
+                        print(f"Last check-in: {visits['last_visit'].strftime('%Y-%m-%d %H:%M')}")
+                except psycopg2.Error as e:
+                    print("An error occurred while fetching your visits:", e)
+
+        print("\nA new badge replaces your current one, which stops working immediately.")
+        if input("Issue a new badge? (y/n): ").strip().lower() == 'y':
+            token = CheckIn.issue_badge(email)
+            if token:
+                print(f"Your badge ID is: {token}")
+                print("Keep it safe; it is shown only once.")
+            else:
+                print("Failed to issue a badge. Please try again later.")
+        input("Press Enter to go back...")
+
+
+if __name__ == "__main__":
+    print("Turnstile ready. Scan a badge (Ctrl+D to stop).")
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        started = time.perf_counter()
+        result = CheckIn.check_in(line)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if result['status'] == 'denied':
+            print(f"DENIED  ({elapsed_ms:.3f} ms)")
+        else:
+            print(f"OPEN    {result['name'] or result['email']}{' (again)' if result['status'] == 'repeat' else ''} "
+                  f"({elapsed_ms:.3f} ms)")
+    CheckIn.visits.close()
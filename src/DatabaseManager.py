@@ -4,26 +4,49 @@ within the fitness club management system. It provides a static method to establ
 manager, ensuring that resources are properly managed and connections are safely closed.
 
 Key Functionalities:
+- open(): Opens a connection that stays open until the caller closes it, for long-lived listeners.
 - connection(): A context manager that creates and yields a PostgreSQL connection. It ensures the connection is closed after use, and handles any exceptions during the connection lifecycle. This method improves reliability and ease of database operations throughout the system.
+- Query log: when the FITNESS_QUERY_LOG environment variable names a file, every SELECT, UPDATE and DELETE the app runs is appended to it (as JSON lines) so IndexAdvisor can replay the workload through EXPLAIN.
 """
 
+import json
+import os
+
 import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 
+class LoggingCursor(RealDictCursor):
+    """ RealDictCursor that records the statements the app runs into the query log. """
+    LOGGED_STATEMENTS = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+
+    def execute(self, query, vars=None):
+        if query.lstrip().upper().startswith(LoggingCursor.LOGGED_STATEMENTS):
+            entry = {'query': ' '.join(query.split()), 'sql': self.mogrify(query, vars).decode('utf-8')}
+            with open(DBManager.QUERY_LOG, 'a', encoding='utf-8') as log_file:
+                log_file.write(json.dumps(entry) + '\n')
+        return super().execute(query, vars)
+
 class DBManager:
+    QUERY_LOG = os.environ.get('FITNESS_QUERY_LOG')
+
+    @staticmethod
+    def open():
+        """ Opens a connection the caller must close; used by long-lived listeners. """
+        return psycopg2.connect(
+            dbname='COMP3005_ProjectV2',
+            user='postgres',
+            password='postgres',
+            host='localhost',
+            cursor_factory=LoggingCursor if DBManager.QUERY_LOG else RealDictCursor  # Allows fetching rows as dictionaries
+        )
+
     @staticmethod
     @contextmanager
     def connection():
         conn = None
         try:
-            conn = psycopg2.connect(
-                dbname='COMP3005_ProjectV2',
-                user='postgres',
-                password='postgres',
-                host='localhost',
-                cursor_factory=RealDictCursor  # Allows fetching rows as dictionaries
-            )
+            conn = DBManager.open()
             yield conn
         except psycopg2.Error as e:
             print(f"Database connection failed: {e}")
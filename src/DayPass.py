@@ -0,0 +1,176 @@
+"""
+The DayPass class sells and checks the one-day guest passes. A pass is a row in `day_passes` holding only
+its id and expiry. The guest gets a token of the form `<pass_id>.<expires>.<signature>`, where the signature
+is an HMAC-SHA256 of the id and expiry under the club's secret, the FITNESS_PASS_SECRET environment
+variable, which is required: without it no pass is sold or accepted, and the app warns at startup. Expiry
+times are absolute (UTC in the app, TIMESTAMPTZ in the table), so the app's clock and the server's now()
+agree whatever their time zones. The door checks the signature and the expiry in memory, so a forged, mistyped or expired
+token is turned away without a database round trip. A token that passes is looked up by primary key to
+confirm the pass still exists.
+
+Expired passes are deleted by a purge job rather than kept forever. It walks the expires_at index
+oldest first and deletes PURGE_BATCH rows per transaction, so it never holds many locks or bloats one
+big transaction. Selling a pass starts the job on a background thread in the app, and it can also be
+run on its own from the src directory (e.g. from cron): `python DayPass.py`.
+
+Key Functionalities:
+- issue(): Sells a pass and returns (token, expires_at).
+- validate(token): Checks a token at the door; returns whether the guest may enter.
+- purge(): Deletes every expired pass in batches and returns how many were removed.
+- start_purger(): Runs purge() every PURGE_SECONDS on a daemon thread.
+- warn_if_unconfigured(): Prints a warning at startup when FITNESS_PASS_SECRET is not set.
+- menu(): The guest's day pass screen: buy a pass or enter an existing one, then go to the gym.
+"""
+
+import datetime
+import hashlib
+import hmac
+import os
+import sys
+import threading
+import time
+
+import psycopg2
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+
+
+class DayPass:
+    PASS_HOURS = 24  # How long a pass is valid from the moment it is sold
+    PURGE_BATCH = 1000  # Expired passes deleted per transaction
+    PURGE_SECONDS = 3600  # How often the background job purges
+    SIGNATURE_CHARS = 32  # Hex digits of the HMAC kept in a token (128 bits)
+
+    SECRET = os.environ.get('FITNESS_PASS_SECRET', '').encode('utf-8')  # Required; shared by every process at the door
+    UNCONFIGURED = "Day passes are unavailable: the FITNESS_PASS_SECRET environment variable is not set."
+
+    _purger = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def sign(pass_id, expires):
+        message = f"{pass_id}.{expires}".encode('utf-8')
+        return hmac.new(DayPass.SECRET, message, hashlib.sha256).hexdigest()[:DayPass.SIGNATURE_CHARS]
+
+    @staticmethod
+    def token(pass_id, expires_at):
+        expires = int(expires_at.timestamp())
+        return f"{pass_id}.{expires}.{DayPass.sign(pass_id, expires)}"
+
+    @staticmethod
+    def parse(token):
+        """ Returns (pass_id, expires_at) for a correctly signed token, or None. """
+        parts = token.strip().split('.')
+        if len(parts) != 3 or not parts[0].isdigit() or not parts[1].isdigit():
+            return None
+        pass_id, expires = int(parts[0]), int(parts[1])
+        if not hmac.compare_digest(parts[2], DayPass.sign(pass_id, expires)):
+            return None
+        return pass_id, datetime.datetime.fromtimestamp(expires, tz=datetime.timezone.utc)
+
+    @staticmethod
+    def issue():
+        """ Sells a pass; returns (token, expires_at), or None if it could not be saved or no secret is set. """
+        if not DayPass.SECRET:
+            return None
+        DayPass.start_purger()
+        expires_at = (datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=DayPass.PASS_HOURS)).replace(microsecond=0)
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.DAY_PASS_INSERT, (expires_at,))
+                pass_id = cursor.fetchone()['pass_id']
+                conn.commit()
+                return DayPass.token(pass_id, expires_at), expires_at
+        return None
+
+    @staticmethod
+    def validate(token):
+        """
+        Returns {'status': 'valid', 'pass_id', 'expires_at'}, {'status': 'expired'} or {'status': 'invalid'}
+        for a forged or unknown token. Only a correctly signed, unexpired token reaches the database.
+        """
+        parsed = DayPass.parse(token) if DayPass.SECRET else None
+        if parsed is None:
+            return {'status': 'invalid'}
+        pass_id, expires_at = parsed
+        if expires_at <= datetime.datetime.now(datetime.timezone.utc):
+            return {'status': 'expired'}
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.DAY_PASS_VALID, (pass_id,))
+                if cursor.fetchone():
+                    return {'status': 'valid', 'pass_id': pass_id, 'expires_at': expires_at}
+        return {'status': 'invalid'}  # Purged, or the database could not confirm it
+
+    @staticmethod
+    def purge():
+        """ Deletes expired passes PURGE_BATCH at a time, committing each batch. """
+        removed = 0
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                while True:
+                    cursor.execute(Queries.DAY_PASS_PURGE, (DayPass.PURGE_BATCH,))
+                    conn.commit()
+                    removed += cursor.rowcount
+                    if cursor.rowcount < DayPass.PURGE_BATCH:
+                        break
+        return removed
+
+    @staticmethod
+    def _purge_forever():
+        while True:
+            try:
+                DayPass.purge()
+            except (psycopg2.Error, RuntimeError) as e:  # RuntimeError: DBManager could not connect
+                print(f"Purging expired day passes failed: {e}")
+            time.sleep(DayPass.PURGE_SECONDS)
+
+    @staticmethod
+    def start_purger():
+        with DayPass._lock:
+            if DayPass._purger is None:
+                DayPass._purger = threading.Thread(target=DayPass._purge_forever, name='day-pass-purge', daemon=True)
+                DayPass._purger.start()
+
+    @staticmethod
+    def warn_if_unconfigured():
+        if not DayPass.SECRET:
+            print(f"WARNING: {DayPass.UNCONFIGURED}", file=sys.stderr)
+
+    @staticmethod
+    def menu():
+        """ Returns True once the guest holds a valid pass and may enter the gym. """
+        clear_screen()
+        print("====================================================")
+        print("1-Day Pass")
+        if not DayPass.SECRET:
+            print(DayPass.UNCONFIGURED)
+            input("Press Enter to go back...")
+            return False
+        token = input("Enter your pass (leave blank to buy one): ").strip()
+        if not token:
+            issued = DayPass.issue()
+            if not issued:
+                print("Failed to issue a pass. Please try again later.")
+                input("Press Enter to go back...")
+                return False
+            token, expires_at = issued
+            print(f"Your pass is: {token}")
+            print(f"It is valid until {expires_at.astimezone().strftime('%Y-%m-%d %H:%M')}. Keep it to come back today.")
+
+        result = DayPass.validate(token)
+        if result['status'] == 'valid':
+            input("Pass accepted. Press Enter to go to the gym...")
+            return True
+        if result['status'] == 'expired':
+            print("This pass has expired. Please buy a new one.")
+        else:
+            print("This pass is not valid.")
+        input("Press Enter to go back...")
+        return False
+
+
+if __name__ == "__main__":
+    print(f"Purged {DayPass.purge()} expired day passes.")
@@ -0,0 +1,180 @@
+"""
+The Enrollment class lets members enroll in scheduled classes, which have a capacity and a waitlist. Each
+class has one `class_seats` row per seat. Enrolling takes the lowest free seat with FOR UPDATE SKIP LOCKED,
+so when hundreds of members book a popular class the moment it opens, each claim locks a different seat
+and none of them waits in line behind a single counter row. A class's waitlist is guarded by a
+per-class advisory lock. Joining the waitlist and freeing a seat therefore never interleave, and a
+cancelled seat goes straight to the first member waiting for it.
+
+Key Functionalities:
+- enroll(cursor, class_id, email): Claims a seat, or joins the waitlist if the class is full.
+- cancel(cursor, class_id, email): Gives up a seat (promoting the first waitlisted member) or a waitlist place.
+- release_all(cursor, email): Frees every seat a member holds, promoting from each waitlist, without committing.
+- menu(email): The member's class screen: the timetable with seats left, enrolling and cancelling.
+"""
+
+import time
+
+import psycopg2
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+
+
+class Enrollment:
+    CLAIM_ATTEMPTS = 50  # Rounds of claiming before giving up while other members' claims are still in flight
+    RETRY_DELAY = 0.002  # Seconds, multiplied by the attempt number
+
+    @staticmethod
+    def enroll(cursor, class_id, email):
+        """
+        Enrolls the member and commits. Returns {'status': 'enrolled', 'seat_no'}, {'status': 'waitlisted',
+        'position'}, {'status': 'already', 'current'} or {'status': 'busy'} if every free seat stayed locked by
+        other claims.
+        """
+        cursor.execute(Queries.CLASS_ENROLLMENT_STATUS, {'email': email, 'class_id': class_id})
+        current = cursor.fetchone()
+        if current:
+            return {'status': 'already', 'current': current['status']}
+
+        params = {'email': email, 'class_id': class_id}
+        for attempt in range(1, Enrollment.CLAIM_ATTEMPTS + 1):
+            cursor.execute(Queries.CLASS_SEAT_CLAIM, params)
+            seat = cursor.fetchone()
+            if seat:
+                cursor.connection.commit()
+                return {'status': 'enrolled', 'seat_no': seat['seat_no']}
+
+            # No unlocked free seat: either the class is full, or the seats left are being claimed right now
+            cursor.execute(Queries.CLASS_WAITLIST_LOCK, (class_id,))
+            cursor.execute(Queries.CLASS_SEATS_FREE, (class_id,))
+            if cursor.fetchone()['free'] == 0:
+                cursor.execute(Queries.CLASS_WAITLIST_JOIN, params)
+                position = cursor.fetchone()['position']
+                cursor.connection.commit()
+                return {'status': 'waitlisted', 'position': position}
+            cursor.connection.rollback()  # Release the lock; those claims may still roll back and free their seats
+            time.sleep(Enrollment.RETRY_DELAY * attempt)
+        return {'status': 'busy'}
+
+    @staticmethod
+    def cancel(cursor, class_id, email):
+        """
+        Cancels the member's seat or waitlist place and commits. Returns {'status': 'cancelled', 'promoted':
+        email or None}, {'status': 'left_waitlist'} or {'status': 'not_enrolled'}.
+        """
+        released = Enrollment._release(cursor, class_id, email)
+        if not released:
+            cursor.execute(Queries.CLASS_WAITLIST_LEAVE, {'email': email, 'class_id': class_id})
+            left = cursor.fetchone()
+            cursor.connection.commit()
+            return {'status': 'left_waitlist' if left else 'not_enrolled'}
+        cursor.connection.commit()
+        return {'status': 'cancelled', 'promoted': released['promoted']}
+
+    @staticmethod
+    def release_all(cursor, email):
+        """
+        Frees the member's seats the way cancel() does, before the member is deleted; otherwise the foreign
+        key would empty them without the waitlist lock and the next claim would jump the waitlist. Classes are
+        locked in class_id order. The caller commits.
+        """
+        cursor.execute(Queries.CLASS_MEMBER_SEATS, (email,))
+        for row in cursor.fetchall():
+            Enrollment._release(cursor, row['class_id'], email)
+
+    @staticmethod
+    def _release(cursor, class_id, email):
+        """ Frees the member's seat under the waitlist lock; returns {'promoted': email or None}, or None if they hold no seat. """
+        cursor.execute(Queries.CLASS_WAITLIST_LOCK, (class_id,))
+        cursor.execute(Queries.CLASS_SEAT_RELEASE, {'email': email, 'class_id': class_id})
+        seat = cursor.fetchone()
+        if not seat:
+            return None
+        promoted = None
+        if seat['kept']:
+            cursor.execute(Queries.CLASS_WAITLIST_PROMOTE, (class_id,))
+            row = cursor.fetchone()
+            promoted = row['email'] if row else None
+        else:
+            cursor.execute(Queries.CLASS_SEAT_DROP, (class_id, seat['seat_no']))  # Above a reduced capacity
+        return {'promoted': promoted}
+
+    @staticmethod
+    def menu(email):
+        while True:
+            clear_screen()
+            print("====================================================")
+            print("Classes")
+            with DBManager.connection() as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        cursor.execute(Queries.CLASSES_WITH_SEATS)
+                        classes = cursor.fetchall()
+                        cursor.execute(Queries.MEMBER_CLASSES, {'email': email})
+                        mine = {row['class_id']: row for row in cursor.fetchall()}
+                    except psycopg2.Error as e:
+                        print("An error occurred while fetching classes:", e)
+                        input("Press Enter to go back...")
+                        return
+
+                    print("| {:^5} | {:<20} | {:<15} | {:^5} | {:^5} | {:^10} | {:<16} |".format(
+                        "ID", "Class", "Room", "Day", "Time", "Seats Left", "You"))
+                    for class_ in classes:
+                        status = mine.get(class_['class_id'])
+                        you = ''
+                        if status:
+                            you = status['status'] + (f" (#{status['position']})" if status['position'] else '')
+                        seats = str(class_['seats_left']) if class_['seats_left'] else f"Full +{class_['waitlisted']}"
+                        print("| {:^5} | {:<20} | {:<15} | {:^5} | {:^5} | {:^10} | {:<16} |".format(
+                            class_['class_id'],
+                            class_['class_name'][:20],
+                            class_['room_name'][:15],
+                            class_['day_of_week'] or '-',
+                            class_['start_time'].strftime('%H:%M') if class_['start_time'] else '-',
+                            seats,
+                            you))
+
+                    print("----------------------------------------------------")
+                    print("1. Enroll in a Class")
+                    print("2. Cancel an Enrollment")
+                    print("3. Go Back")
+                    choice = input("Enter choice: ").strip()
+                    if choice == "3":
+                        return
+                    if choice not in ("1", "2"):
+                        print("Invalid choice. Please choose again.")
+                        time.sleep(1)
+                        continue
+
+                    class_id = input("Enter Class ID: ").strip()
+                    if not class_id.isdigit() or not any(class_['class_id'] == int(class_id) for class_ in classes):
+                        print("No class found with that ID.")
+                        time.sleep(1)
+                        continue
+
+                    try:
+                        if choice == "1":
+                            result = Enrollment.enroll(cursor, int(class_id), email)
+                            if result['status'] == 'enrolled':
+                                print(f"You're in! Seat {result['seat_no']} is yours.")
+                            elif result['status'] == 'waitlisted':
+                                print(f"The class is full. You're #{result['position']} on the waitlist and will "
+                                      "get a seat automatically if one frees up.")
+                            elif result['status'] == 'already':
+                                print(f"You're already {result['current'].lower()} for this class.")
+                            else:
+                                print("The class is very busy right now. Please try again in a moment.")
+                        else:
+                            result = Enrollment.cancel(cursor, int(class_id), email)
+                            if result['status'] == 'cancelled':
+                                print("Your enrollment has been cancelled.")
+                            elif result['status'] == 'left_waitlist':
+                                print("You've left the waitlist.")
+                            else:
+                                print("You're not enrolled in this class.")
+                    except psycopg2.Error as e:
+                        conn.rollback()
+                        print("An error occurred while updating your enrollment:", e)
+                    input("Press Enter to continue...")
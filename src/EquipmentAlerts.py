@@ -0,0 +1,79 @@
+"""
+The EquipmentAlerts class keeps the admin session's set of equipment needing attention (quality below
+ATTENTION_QUALITY) up to date from pushed notifications. A trigger on `equipment.quality` sends a NOTIFY
+on the `equipment_alerts` channel whenever such an item changes, and the handler updates the in-memory
+set, so the admin screens never have to poll or scan the equipment table to find worn items. The set is
+loaded once when listening starts and reloaded after the listener reconnects.
+
+Key Functionalities:
+- start(): Subscribes the admin session to equipment alerts.
+- forget(equipment_ids): Drops items the session has just repaired.
+- needs_attention(): Returns {equipment_id: quality} for every item needing attention.
+- details(): Returns the name, room and quality of every item needing attention.
+"""
+
+import json
+import threading
+
+from DatabaseManager import DBManager
+from Notifications import Notifications
+from QueryRegistry import Queries
+
+
+class EquipmentAlerts:
+    CHANNEL = 'equipment_alerts'
+    ATTENTION_QUALITY = 4  # Must match the threshold in the notify_equipment_alert() trigger
+
+    _items = {}  # equipment_id -> quality
+    _lock = threading.Lock()
+    _started = False
+
+    @staticmethod
+    def start():
+        if not EquipmentAlerts._started:
+            EquipmentAlerts._started = True
+            Notifications.subscribe(EquipmentAlerts.CHANNEL, EquipmentAlerts.handle, EquipmentAlerts.resync)
+
+    @staticmethod
+    def handle(payload):
+        """ Applies one alert: a quality means the item needs attention, a null quality means it no longer does. """
+        alert = json.loads(payload)
+        with EquipmentAlerts._lock:
+            if alert['quality'] is None:
+                EquipmentAlerts._items.pop(alert['equipment_id'], None)
+            else:
+                EquipmentAlerts._items[alert['equipment_id']] = alert['quality']
+
+    @staticmethod
+    def resync():
+        """ Reloads the whole set; runs when listening starts, so no alert is missed in between. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.EQUIPMENT_NEEDING_ATTENTION, (EquipmentAlerts.ATTENTION_QUALITY,))
+                items = {row['equipment_id']: row['quality'] for row in cursor.fetchall()}
+                with EquipmentAlerts._lock:
+                    EquipmentAlerts._items = items
+
+    @staticmethod
+    def forget(equipment_ids):
+        """ Drops items this session has just repaired, ahead of the notifications confirming it. """
+        with EquipmentAlerts._lock:
+            for equipment_id in equipment_ids:
+                EquipmentAlerts._items.pop(equipment_id, None)
+
+    @staticmethod
+    def needs_attention():
+        with EquipmentAlerts._lock:
+            return dict(EquipmentAlerts._items)
+
+    @staticmethod
+    def details():
+        """ Returns (equipment_id, equipment_name, room_name, quality) rows for the items needing attention. """
+        ids = list(EquipmentAlerts.needs_attention())
+        if not ids:
+            return []
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.EQUIPMENT_BY_IDS, (ids,))
+                return cursor.fetchall()
+        return []
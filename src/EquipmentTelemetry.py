@@ -0,0 +1,60 @@
+"""
+The EquipmentTelemetry class records how often each piece of equipment is used, how much wear it takes
+and when it is repaired, in hourly buckets (`equipment_usage_hourly`). Events are counted in memory and
+flushed as one upsert per equipment and hour by a WriteBehindCounters, so recording a workout adds no
+database write to the gym floor.
+
+Key Functionalities:
+- record_use(equipment_id, wear): Counts one use of an item and the quality it lost.
+- record_repairs(equipment_ids): Counts a repair for each item.
+- heatmap(room_id, start, end): Uses per weekday and hour for the equipment in a room.
+- totals(start, end): Uses, wear and repairs per item over a period, most used first.
+"""
+
+import datetime
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from WriteBehind import WriteBehindCounters
+
+
+class EquipmentTelemetry:
+    FLUSH_EVENTS = 200  # Events counted before the counters are written
+    FLUSH_MS = 5000  # Longest an event waits in memory before it is written
+
+    counters = WriteBehindCounters(Queries.EQUIPMENT_USAGE_UPSERT, 2, FLUSH_EVENTS, FLUSH_MS)
+
+    @staticmethod
+    def bucket(moment=None):
+        """ Returns the start of the hour containing moment (now by default). """
+        return (moment or datetime.datetime.now()).replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def record_use(equipment_id, wear):
+        EquipmentTelemetry.counters.add((equipment_id, EquipmentTelemetry.bucket(), 1, wear, 0))
+
+    @staticmethod
+    def record_repairs(equipment_ids):
+        bucket = EquipmentTelemetry.bucket()
+        for equipment_id in equipment_ids:
+            EquipmentTelemetry.counters.add((equipment_id, bucket, 0, 0, 1))
+
+    @staticmethod
+    def heatmap(room_id, start, end):
+        """ Returns {(isodow, hour): uses} for the equipment in the room between start and end. """
+        EquipmentTelemetry.counters.flush()  # Include the uses still counted in memory
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.EQUIPMENT_USAGE_HEATMAP, (room_id, start, end))
+                return {(row['day_number'], row['hour']): row['uses'] for row in cursor.fetchall()}
+        return {}
+
+    @staticmethod
+    def totals(start, end):
+        """ Returns usage, wear and repair totals per item between start and end, most used first. """
+        EquipmentTelemetry.counters.flush()
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.EQUIPMENT_USAGE_TOTALS, (start, end))
+                return cursor.fetchall()
+        return []
@@ -0,0 +1,62 @@
+"""
+The EquipmentUsage class claims a piece of equipment for one use and wears it in a single statement, which
+returns the quality the item had just before that use. The injury check and the workout both act on that
+value, so members using the same machine at the same time each see the quality left by the member before
+them, and no wear is lost. The row lock is held only for that statement, not for the whole workout.
+
+A very popular machine can turn its row into a lock hot spot. Setting the FITNESS_ACCUMULATE_WEAR environment
+variable then switches to accumulating wear in memory: wear is summed per machine by a WriteBehindCounters
+and written as one UPDATE per machine every FLUSH_MS. A claim sees the stored quality less this process's
+unwritten wear. Other processes' wear only shows up once they flush, so in this mode quality is approximate
+between flushes.
+
+Key Functionalities:
+- use(cursor, equipment_id): Claims and wears an item; returns its quality before the use and the wear taken.
+- flush(): Writes any accumulated wear.
+"""
+
+import os
+import threading
+
+from QueryRegistry import Queries
+from WorkoutRules import WorkoutRules
+from WriteBehind import WriteBehindCounters
+
+
+class EquipmentUsage:
+    WEAR_PER_USE = WorkoutRules.WEAR_PER_USE  # Quality lost per use
+    MIN_QUALITY = WorkoutRules.MIN_QUALITY  # Wear stops here (see the CHECK on equipment.quality)
+    FLUSH_EVENTS = 100  # Uses accumulated before the wear is written
+    FLUSH_MS = 2000  # Longest accumulated wear waits before it is written
+    ACCUMULATE = bool(os.environ.get('FITNESS_ACCUMULATE_WEAR'))
+
+    wear = WriteBehindCounters(Queries.EQUIPMENT_WEAR_BATCH, 1, FLUSH_EVENTS, FLUSH_MS)
+    _lock = threading.Lock()  # Makes reading and adding a machine's accumulated wear one step
+
+    @staticmethod
+    def use(cursor, equipment_id):
+        """ Returns {'quality': quality before the use, 'wear': quality lost}, or None if the item no longer exists. """
+        if EquipmentUsage.ACCUMULATE:
+            return EquipmentUsage._use_accumulated(cursor, equipment_id)
+        cursor.execute(Queries.EQUIPMENT_USE, (EquipmentUsage.WEAR_PER_USE, equipment_id))
+        claim = cursor.fetchone()
+        cursor.connection.commit()  # Release the row lock before the workout starts
+        return claim
+
+    @staticmethod
+    def _use_accumulated(cursor, equipment_id):
+        cursor.execute(Queries.EQUIPMENT_QUALITY, (equipment_id,))  # A plain read, so no row lock is taken
+        stored = cursor.fetchone()
+        if not stored:
+            return None
+        with EquipmentUsage._lock:
+            pending = EquipmentUsage.wear.pending((equipment_id,))
+            quality = max(EquipmentUsage.MIN_QUALITY, stored['quality'] - (pending[0] if pending else 0))
+            worn = quality - max(EquipmentUsage.MIN_QUALITY, quality - EquipmentUsage.WEAR_PER_USE)
+            if worn:
+                EquipmentUsage.wear.add((equipment_id, worn))
+        return {'quality': quality, 'wear': worn}
+
+    @staticmethod
+    def flush():
+        return EquipmentUsage.wear.flush()
@@ -4,89 +4,82 @@ activities within the system. It handles a range of functionalities from initial
 statistics to managing gym navigation and updating fitness metrics for members.
 
 Key Functionalities:
-- initialize_guest_stats(): Initializes or updates fitness statistics for guest users, allowing them to use a consistent
-  set of fitness data during their gym session.
+- initialize_guest_stats(session): Sets up fitness statistics for a guest's one-day pass in an in-memory GuestSession, so
+  day-pass visits never write to health_statistics.
 - print_stats(stats): Outputs the current fitness statistics in a formatted table, improving readability by capitalizing
   and adjusting the presentation of stat names.
-- get_or_initialize_stats(email): Retrieves existing fitness statistics for a given email or initializes them if they
+- get_or_initialize_stats(email, session): Retrieves existing fitness statistics for a given email or initializes them if they
   do not exist, ensuring users have current data for their gym activities.
 - setup_stats(cursor, email): Provides a framework for setting up initial fitness statistics for new gym members.
-- go_to_gym(email): Manages the process of a user visiting the gym, including fetching user details and navigating through
-  available gym facilities.
-- navigate_gym(cursor, email): Allows users to select different rooms in the gym and choose equipment to use, enhancing
-  the interactivity of their gym experience.
-- animation(): Displays a simple text-based animation to simulate a workout, adding a visual element to the user interaction.
-- change_stats(cursor, email, equip_id, quality): Updates the fitness statistics based on the equipment used and the
-  outcome of the gym session.
-- reset_stamina(cursor, email): Resets a user's stamina based on their fitness level after certain activities to simulate
+- go_to_gym(email, session): Manages the process of a user visiting the gym, including fetching user details and navigating through
+  available gym facilities. Returns the stats store used for the visit.
+- navigate_gym(cursor, stats, session): Allows users to select different rooms in the gym and choose equipment to use, enhancing
+  the interactivity of their gym experience. Rooms show their live occupancy, and full or closed rooms cannot be entered.
+- animation(session): Displays a simple text-based animation to simulate a workout, adding a visual element to the user interaction.
+- change_stats(store, equip_id, quality, session): Updates the fitness statistics based on the equipment used and the
+  outcome of the gym session, and records the session in the member's workout history.
+- reset_stamina(store): Resets a user's stamina based on their fitness level after certain activities to simulate
   fatigue and recovery.
-- handle_injury(cursor, email): Manages the consequences of a gym injury by adjusting user stats and providing feedback.
+- handle_injury(store, equip_id, session): Manages the consequences of a gym injury by adjusting user stats and providing feedback.
 - print_updated_stats(updated_stats): Outputs updated fitness statistics after changes such as workouts or injuries.
-- print_mood(): Randomly selects and prints a mood-related message post-workout, reflecting the potential feelings of
+- print_mood(session): Randomly selects and prints a mood-related message post-workout, reflecting the potential feelings of
   the user after a gym session.
+
+The workout functions take a stats store (StatsStore.MemberStats or StatsStore.GuestSession) rather than an email,
+so the same logic updates a member's database row or a guest's in-memory session. The rules themselves (wear,
+injuries, stat changes) live in WorkoutRules, which Simulator also plays over a simulated club. Every answer
+and random draw of a visit comes from its GymSession, so visits can be seeded, recorded and replayed.
 """
 
-import random
-import time
 import sys
 
+from CatalogCache import CatalogCache
 from ClearScreen import clear_screen
 from DatabaseManager import DBManager
+from EquipmentUsage import EquipmentUsage
+from EquipmentTelemetry import EquipmentTelemetry
+from GymSession import GymSession
+from RoomOccupancy import RoomOccupancy
+from QueryRegistry import Queries
+from StatsStore import GuestSession, MemberStats
+from WorkoutRules import WorkoutRules
 
 class Fitness:
-    
+    MAX_QUALITY = WorkoutRules.MAX_QUALITY  # Quality of new or repaired equipment
+    WEAR_PER_USE = WorkoutRules.WEAR_PER_USE  # Quality lost per use
+    DANGER_QUALITY = WorkoutRules.DANGER_QUALITY  # Equipment below this quality can injure members
+
     @staticmethod
-    def initialize_guest_stats():
-        """ Initialize or update stats for a guest user using the same row in the database and print them. """
-        email = "guest"
-        with DBManager.connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
-            existing_stats = cursor.fetchone()
-
-            print("Welcome, Guest! Let's set up your fitness stats.")
-            print("What is your fitness level?\n1. Beginner\n2. Intermediate\n3. Advanced")
-            while True:
-                try:
-                    fitness_level = int(input("Enter choice (1-3): "))
-                    if fitness_level in [1, 2, 3]:
-                        break
-                    else:
-                        print("Please enter a valid choice (1, 2, or 3).")
-                except ValueError:
-                    print("Invalid input; please enter a number (1, 2, or 3).")
-
-            range_start, range_end = {1: (1, 3), 2: (4, 7), 3: (8, 10)}.get(fitness_level, (1, 3))
-            stats = {
-                'fitness_level': fitness_level,
-                'strength': random.randint(range_start, range_end),
-                'flexibility': random.randint(range_start, range_end),
-                'endurance': random.randint(range_start, range_end),
-                'stamina': random.randint(range_start, range_end),
-                'has_water': random.choice([True, False]),
-                'has_protein': random.choice([True, False, False, False]),
-                'is_injured': False
-            }
-
-            if not existing_stats:
-                cursor.execute("""
-                    INSERT INTO health_statistics 
-                    (email, fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (email, *stats.values()))
-            else:
-                cursor.execute("""
-                    UPDATE health_statistics
-                    SET fitness_level = %s, strength = %s, flexibility = %s, endurance = %s, stamina = %s,
-                        has_water = %s, has_protein = %s, is_injured = %s
-                    WHERE email = %s
-                """, (*stats.values(), email))
-            conn.commit()
-
-            # Fetch and print the updated stats
-            cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
-            updated_stats = cursor.fetchone()
-            Fitness.print_stats(updated_stats)
+    def initialize_guest_stats(session=None):
+        """ Sets up stats for a guest's one-day pass in an in-memory session, prints them and returns the session. """
+        session = session or GymSession("guest")
+        print("Welcome, Guest! Let's set up your fitness stats.")
+        print("What is your fitness level?\n1. Beginner\n2. Intermediate\n3. Advanced")
+        while True:
+            try:
+                fitness_level = int(session.input("Enter choice (1-3): "))
+                if fitness_level in [1, 2, 3]:
+                    break
+                else:
+                    print("Please enter a valid choice (1, 2, or 3).")
+            except ValueError:
+                print("Invalid input; please enter a number (1, 2, or 3).")
+
+        range_start, range_end = {1: (1, 3), 2: (4, 7), 3: (8, 10)}.get(fitness_level, (1, 3))
+        stats = {
+            'fitness_level': fitness_level,
+            'strength': session.rng.randint(range_start, range_end),
+            'flexibility': session.rng.randint(range_start, range_end),
+            'endurance': session.rng.randint(range_start, range_end),
+            'stamina': session.rng.randint(range_start, range_end),
+            'has_water': session.rng.choice([True, False]),
+            'has_protein': session.rng.choice([True, False, False, False]),
+            'is_injured': False
+        }
+
+        session = GuestSession(stats)
+        Fitness.print_stats(session.all())
+        return session
     
     @staticmethod
     def print_stats(stats):
@@ -103,21 +96,20 @@ class Fitness:
 
             
     @staticmethod
-    def get_or_initialize_stats(email):
+    def get_or_initialize_stats(email, session=None):
         """ Fetches or initializes stats for the given email. """
         is_guest = email.lower() == "guest"
+        if is_guest:
+            return Fitness.initialize_guest_stats(session)
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            if is_guest:
-                Fitness.initialize_guest_stats()  
+            cursor.execute(Queries.HEALTH_STATS_BY_EMAIL, (email,))
+            stats = cursor.fetchone()
+            if stats:
+                Fitness.print_stats(stats)
             else:
-                cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
-                stats = cursor.fetchone()
-                if stats:
-                    Fitness.print_stats(stats)
-                else:
-                    Fitness.setup_stats(cursor, email)
-                    conn.commit()
+                Fitness.setup_stats(cursor, email)
+                conn.commit()
 
 
     @staticmethod
@@ -126,30 +118,44 @@ class Fitness:
         print("You are a new member. Let's set up your fitness stats.")
 
     @staticmethod
-    def go_to_gym(email):
+    def go_to_gym(email, session=None):
+        """
+        Visits the gym and returns the stats store used; a guest's is a new in-memory GuestSession. The visit's
+        answers and random draws come from session (a new GymSession by default), which is saved when the visit ends.
+        """
+        session = session or GymSession(email)
+        try:
+            return Fitness._visit(email, session)
+        finally:
+            session.save()
+
+    @staticmethod
+    def _visit(email, session):
         clear_screen()
         with DBManager.connection() as conn:
             cursor = conn.cursor()
             is_guest = email.lower() == "guest"
             if is_guest:
-                Fitness.initialize_guest_stats()  # Handle guest separately
+                stats = Fitness.initialize_guest_stats(session)  # Guest stats stay in memory
             else:
-                cursor.execute("SELECT name FROM member_accounts WHERE email = %s", (email,))
+                cursor.execute(Queries.MEMBER_NAME, (email,))
                 name = cursor.fetchone()
                 if not name:
                     print("No member found with this email. Please register or check your email.")
                     return
                 print(f"Welcome back to Pain to Progress Health and Fitness Club, {name['name']}!")
                 Fitness.get_or_initialize_stats(email)  # Get stats for registered members
+                stats = MemberStats(cursor, email)
 
-            Fitness.navigate_gym(cursor, email)
+            Fitness.navigate_gym(cursor, stats, session)
+            return stats
             
             
-    def navigate_gym(cursor, email):
+    def navigate_gym(cursor, stats, session):
         """ Allows the user to navigate different rooms in the gym and choose equipment, with an option to leave the gym. """
-        # Fetch available rooms that are not occupied
-        cursor.execute("SELECT room_id, room_name FROM rooms WHERE room_availability = TRUE")
-        rooms = {room['room_id']: room['room_name'] for room in cursor.fetchall()}
+        # Rooms and their equipment come from the process-wide catalog cache; a room with no capacity is closed
+        capacities = CatalogCache.room_capacities()
+        rooms = {room_id: room_name for room_id, room_name in CatalogCache.rooms().items() if capacities.get(room_id)}
         
         if not rooms:
             print("Currently, no rooms are available. Please try again later.")
@@ -158,11 +164,12 @@ class Fitness:
         while True:
             print("----------------------------------------------------")
             print("Where would you like to go?")
+            occupancy = RoomOccupancy.current()
             for room_id, room_name in rooms.items():
-                print(f"{room_id}. {room_name}")
+                print(f"{room_id}. {room_name} ({occupancy.get(room_id, 0)}/{capacities[room_id]} people)")
             print("0. Leave the gym")
 
-            choice = input("\nEnter the number of the room you'd like to visit or '0' to leave the gym: ")
+            choice = session.input("\nEnter the number of the room you'd like to visit or '0' to leave the gym: ")
             try:
                 chosen_room_id = int(choice)
                 if chosen_room_id == 0:
@@ -173,44 +180,54 @@ class Fitness:
                     print("Invalid room number. Please choose a valid number.")
                     continue
 
-                # Fetch equipment in the selected room
-                cursor.execute("""
-                    SELECT equipment_id, equipment_name, quality
-                    FROM equipment
-                    WHERE room_id = %s AND quality > 0
-                    ORDER BY equipment_id
-                """, (chosen_room_id,))
-                equipment = cursor.fetchall()
+                equipment = CatalogCache.equipment_in_room(chosen_room_id)
 
                 if not equipment:
                     print(f"No equipment available in {rooms[chosen_room_id]}. Choose another room.")
                     continue
 
+                if not RoomOccupancy.enter(chosen_room_id):
+                    print(f"The {rooms[chosen_room_id]} is full right now. Choose another room.")
+                    continue
+            except ValueError:
+                print("Please enter a valid number.")
+                continue
+
+            try:  # The member is counted in the room until they leave it, however the visit ends
                 print(f"\nIn the {rooms[chosen_room_id]}, you can use the following equipment:")
                 equipment_list = {index + 1: (equip['equipment_id'], equip['quality'], equip['equipment_name']) for index, equip in enumerate(equipment)}
                 for index, (equip_id, equip_quality, equip_name) in equipment_list.items():
                     print(f"{index}. {equip_name} (Quality: {equip_quality})")
 
-                equip_choice = int(input("\nEnter the number of the equipment you'd like to use: "))
+                equip_choice = int(session.input("\nEnter the number of the equipment you'd like to use: "))
                 if equip_choice in equipment_list:
-                    chosen_equip_id, equip_quality, chosen_equipment_name = equipment_list[equip_choice]
+                    chosen_equip_id, _, chosen_equipment_name = equipment_list[equip_choice]
+                    # The cached quality may be stale; claiming the item returns the quality this use starts from
+                    claim = EquipmentUsage.use(cursor, chosen_equip_id)
+                    if not claim:
+                        CatalogCache.invalidate('equipment', chosen_room_id)
+                        print("That equipment is no longer available. Please choose again.")
+                        continue
+                    equip_quality = claim['quality']
+                    EquipmentTelemetry.record_use(chosen_equip_id, claim['wear'])  # Counted in memory, written in batches
                     print(f"\nYou are now using the {chosen_equipment_name}. Enjoy your workout!")
 
-                    Fitness.animation()
+                    Fitness.animation(session)
                     
-                    if equip_quality < 3:
-                        if random.randint(1, 10) > 1:  # 90% chance of injury
-                            print("You have been injured due to the poor quality of the equipment!")
-                            Fitness.handle_injury(cursor, email)
-                            return                    
+                    if WorkoutRules.injures(equip_quality, session.rng):
+                        print("You have been injured due to the poor quality of the equipment!")
+                        Fitness.handle_injury(stats, chosen_equip_id, session)
+                        return
                     
-                    Fitness.change_stats(cursor, email, chosen_equip_id, equip_quality)
+                    Fitness.change_stats(stats, chosen_equip_id, equip_quality, session)
                 else:
                     print("Invalid equipment number. Please choose a valid number.")
             except ValueError:
                 print("Please enter a valid number.")
+            finally:
+                RoomOccupancy.leave(chosen_room_id)
 
-    def animation():
+    def animation(session):
         figure = 'ᕕ( ᐛ )ᕗ'
         trail = ' ε='
         total_duration = 2  # Total time for the animation
@@ -224,45 +241,36 @@ class Fitness:
             # Concatenate the trail string in front of the figure
             print(trail + figure)
             trail += ' ε='  # Extend the trail
-            time.sleep(frame_duration)  # Delay for the frame
+            session.pause(frame_duration)  # Delay for the frame (skipped when replaying)
      
      
     @staticmethod
-    def change_stats(cursor, email, equip_id, quality):
-        # Decrease equipment quality and handle user stats
-        cursor.execute("UPDATE equipment SET quality = GREATEST(1, quality - 2) WHERE equipment_id = %s;", (equip_id,))
-        cursor.connection.commit()
-
-        # Fetch and update user stats
-        cursor.execute("SELECT fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured FROM health_statistics WHERE email = %s", (email,))
-        stats = cursor.fetchone()
+    def change_stats(store, equip_id, quality, session):
+        # The equipment was already claimed and worn by navigate_gym; fetch and update user stats
+        stats = store.load()
 
         if stats:
-            # Decide randomly whether to improve a stat
-            improve = random.choice([True, False])  # 50% chance to improve or not improve
-            if improve:
-                # Randomly increase one stat, decrease stamina
-                improved_stat = random.choice(['fitness_level', 'strength', 'flexibility', 'endurance'])
-                if stats[improved_stat] < 10:
-                    new_value = stats[improved_stat] + 1
-                    cursor.execute(f"UPDATE health_statistics SET {improved_stat} = %s WHERE email = %s", (new_value, email))
-                    print(f"Your {improved_stat} has improved to {new_value}.")
-                else:
-                    print("Your stats are already at their maximum values. No improvements this session.")
+            # The session may improve one stat, and always costs stamina
+            improved_stat, deltas = WorkoutRules.workout(stats, session.rng)
+            if improved_stat in deltas:
+                new_value = stats[improved_stat] + deltas[improved_stat]
+                store.set(improved_stat, new_value)
+                print(f"Your {improved_stat} has improved to {new_value}.")
+            elif improved_stat:
+                print("Your stats are already at their maximum values. No improvements this session.")
             else:
                 print("No improvements in your stats this session.")
 
-            # Always decrease stamina
-            new_stamina = max(0, stats['stamina'] - 2)
-            cursor.execute("UPDATE health_statistics SET stamina = %s WHERE email = %s", (new_stamina, email))
-            cursor.connection.commit()
-            Fitness.print_mood()
+            new_stamina = stats['stamina'] + deltas['stamina']
+            store.set('stamina', new_stamina)
+            store.commit()
+            store.record(equip_id, deltas)
+            Fitness.print_mood(session)
             print("----------------------------------------------------")
             print(f"Stamina is now {new_stamina}.")
 
             # Re-fetch and show all stats to reflect changes
-            cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
-            updated_stats = cursor.fetchone()
+            updated_stats = store.all()
             print("Updated stats after your workout:")
             print("| {:<15} | {:^7} |".format("Metric", "Value"))
             for key, value in updated_stats.items():
@@ -272,59 +280,47 @@ class Fitness:
             if new_stamina == 0:
                 print("Your stamina has dropped to zero, you can't go on.")
                 print("Please rest and recover before returning to the gym.")
-                input("Press Enter to leave the gym...")
+                session.input("Press Enter to leave the gym...")
                 sys.exit(0)
 
         else:
             print("No stats found. Unable to update.")
 
-    def reset_stamina(cursor, email):
+    def reset_stamina(store):
         """Resets the member's stamina based on their fitness level."""
         # Fetch the current fitness level of the member
-        cursor.execute("SELECT fitness_level FROM health_statistics WHERE email = %s", (email,))
-        result = cursor.fetchone()
+        result = store.load()
         if result:
             fitness_level = result['fitness_level']
 
             # Determine new stamina based on fitness level
-            if fitness_level == 1:  # Beginner
-                new_stamina = 5
-            elif fitness_level == 2:  # Intermediate
-                new_stamina = 7
-            elif fitness_level == 3:  # Advanced
-                new_stamina = 10
-            else:
-                new_stamina = 5  # Default case if fitness level is undefined
+            new_stamina = WorkoutRules.rested_stamina(fitness_level)
 
-            # Update the stamina in the database
-            cursor.execute("UPDATE health_statistics SET stamina = %s WHERE email = %s", (new_stamina, email))
-            cursor.connection.commit()
+            # Update the stamina in the store
+            store.set('stamina', new_stamina)
+            store.commit()
             # print(f"Stamina reset to {new_stamina} based on fitness level {fitness_level}.")
         else:
             print("Failed to fetch fitness level; stamina not reset.")
 
 
     @staticmethod
-    def handle_injury(cursor, email):
+    def handle_injury(store, equip_id, session):
         ...
         # Reduce all stats due to injury
-        cursor.execute("""
-            UPDATE health_statistics 
-            SET is_injured = TRUE, fitness_level = GREATEST(1, fitness_level - 1), strength = GREATEST(1, strength - 1),
-            flexibility = GREATEST(1, flexibility - 1), endurance = GREATEST(1, endurance - 1), stamina = 0
-            WHERE email = %s
-        """, (email,))
-        cursor.connection.commit()
+        deltas = store.injure()
+        store.commit()
+        if deltas:
+            store.record(equip_id, deltas, injured=True)
 
         # Fetch updated stats after injury
-        cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
-        updated_stats = cursor.fetchone()
+        updated_stats = store.all()
 
         print("Due to an injury, all your stats have been reduced and stamina set to 0.")
         Fitness.print_updated_stats(updated_stats)
-        Fitness.reset_stamina(cursor, email)  # Reset stamina based on fitness level after handling injury
+        Fitness.reset_stamina(store)  # Reset stamina based on fitness level after handling injury
         print("Please rest and recover before returning to the gym.")
-        input("Press Enter to leave the gym...")
+        session.input("Press Enter to leave the gym...")
         sys.exit(0)
         
     @staticmethod
@@ -338,7 +334,7 @@ class Fitness:
             print("No stats found after update.")
 
 
-    def print_mood():
+    def print_mood(session):
         positive_sentences = [
             "Congratulations on completing your workout! You feel invigorated and ready for your next challenge.",
             "Well done! You emerge from your workout feeling stronger and more resilient.",
@@ -366,7 +362,7 @@ class Fitness:
         ]
 
         all_sentences = positive_sentences + negative_sentences
-        print(random.choice(all_sentences))
+        print(session.rng.choice(all_sentences))
 
 
         
\ No newline at end of file
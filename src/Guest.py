@@ -9,9 +9,11 @@ Methods:
 - menu(): Displays the main menu specific to guests, providing them with various options including 
   about us, create account, one-day pass, return to main menu, and exit.
 - about_us(): Displays information about the fitness club, emphasizing its mission and values.
-- create_account(): Guides the user through the process of creating a new account with validation
+- create_account(session): Guides the user through the process of creating a new account with validation
   and appropriate feedback based on the input and database interaction outcomes.
-- go_to_gym(): Grants a one-day pass to the gym, simulated by calling a method in the Fitness class.
+- go_to_gym(): Sells or checks a one-day pass (see DayPass) and, once it is valid, lets the guest into the gym through
+  the Fitness class. The guest's stats live in an in-memory GuestSession held by one menu() call, so they belong to
+  that visitor only; if the guest then creates an account they can keep them as their member stats.
 - get_health_metrics(): Collects health metrics from the user, useful for potential extensions where
   health data might influence guest recommendations or services.
 - get_valid_integer(prompt): Utility method to ensure the input collected is a valid integer.
@@ -26,13 +28,15 @@ import time
 
 from ClearScreen import clear_screen
 from DatabaseManager import DBManager
+from QueryRegistry import Queries
 from Member import Member
 from Fitness import Fitness
+from DayPass import DayPass
 
 class Guest:
-
     @staticmethod
     def menu():
+        session = None  # GuestSession from this visitor's one-day pass; dropped when they leave the guest menu
         while True:
             clear_screen()
             print("====================================================")
@@ -48,9 +52,10 @@ class Guest:
             if choice == "1":
                 Guest.about_us()
             elif choice == "2":
-                Guest.create_account()
+                if Guest.create_account(session):
+                    session = None
             elif choice == "3":
-                Fitness.go_to_gym("guest")
+                session = Guest.go_to_gym() or session
             elif choice == "4":
                 return  # Return to main menu
             elif choice == "5":
@@ -74,7 +79,8 @@ class Guest:
         input("\nPress Enter to continue...")
 
     @staticmethod
-    def create_account():
+    def create_account(session=None):
+        """ Creates a member account, offering to keep the stats of session; returns True once the account exists. """
         clear_screen()
         print("====================================================")
         print("Creating New Account")
@@ -86,19 +92,24 @@ class Guest:
         name = input("Full Name: ")
 
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        # Asked before the transaction opens, so the member row is not held locked while the guest answers
+        keep_stats = bool(session) and input("Keep the fitness stats from your day pass? (y/n): ").strip().lower() == 'y'
 
         # Insert the new member and their health metrics into the database
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 try:
                     cursor.execute(
-                        "INSERT INTO member_accounts (email, password, name) VALUES (%s, %s, %s)",
+                        Queries.MEMBER_INSERT,
                         (email, hashed_password, name)
                     )
+                    if keep_stats:
+                        session.save(cursor, email)
                     conn.commit()
                     print("Account created successfully! Please log in with your new account as a Member.")
                     time.sleep(1)
                     Member.log_in()
+                    return True
                 except psycopg2.Error as e:
                     conn.rollback()
                     if e.pgcode == '23505':  # Unique violation
@@ -110,7 +121,14 @@ class Guest:
                         time.sleep(1)
                 finally:
                     cursor.close()
+        return False
 
+    @staticmethod
+    def go_to_gym():
+        """ Lets the guest in on a valid one-day pass; returns the visit's GuestSession (kept in memory only), or None. """
+        if DayPass.menu():
+            return Fitness.go_to_gym("guest")
+        return None
 
     @staticmethod
     def get_health_metrics():
@@ -0,0 +1,152 @@
+"""
+The GymSession class supplies everything a gym visit does not decide for itself: the answers the user types
+and the random draws behind guest stats, stat improvements, injuries and moods. Fitness asks the session
+for these instead of calling input() and the random module, so a visit can be repeated exactly.
+
+Each session has its own random.Random. It is seeded from the FITNESS_SEED environment variable when that
+is set, so benchmark and load-test runs repeat, and from a fresh random seed otherwise. When
+FITNESS_SESSION_LOG names a directory, every visit is recorded there as one JSON file holding the email,
+the seed, each answer typed and each random draw.
+
+Replaying a recording runs the same visit again, usually against a local database. The recorded answers
+and draws are fed back in order, so the visit takes the same path through the code and runs the same
+queries. Replays skip the workout animation's pauses, so their timings show only the app's own work. A
+replay that asks for an answer or a draw the recording does not have has diverged from it (for example
+because the local data differs), and it stops with ReplayDiverged.
+
+Replay a visit from the src directory with `python GymSession.py <recording.json>`, or profile it with
+`python -m cProfile -s cumtime GymSession.py <recording.json>`.
+
+Key Functionalities:
+- GymSession(email, seed): A live session, recorded when FITNESS_SESSION_LOG is set.
+- GymSession.replay(path): A session that plays a recording back.
+- rng: The session's random number generator.
+- input(prompt): Reads an answer, or plays the recorded one back.
+- pause(seconds): Sleeps, except when replaying.
+- save(): Writes the recording and returns its path (None if the session is not recorded).
+"""
+
+import datetime
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import time
+
+
+class ReplayDiverged(Exception):
+    """ The replayed visit asked for an answer or a draw that is not next in the recording. """
+
+
+class RecordingRandom(random.Random):
+    """ A seeded Random that appends every draw it makes to draws. """
+
+    def __init__(self, seed, draws):
+        self.draws = draws
+        super().__init__(seed)
+
+    def random(self):
+        value = super().random()
+        self.draws.append(['random', value])
+        return value
+
+    def getrandbits(self, k):  # Behind randint, choice and the other integer draws
+        value = super().getrandbits(k)
+        self.draws.append(['bits', k, value])
+        return value
+
+
+class ReplayedRandom(random.Random):
+    """ Hands out recorded draws in order instead of making new ones. """
+
+    def __init__(self, draws):
+        self.draws = iter(draws)
+        super().__init__(0)
+
+    def _next(self, *kind):
+        draw = next(self.draws, None)
+        if draw is None or list(draw[:-1]) != list(kind):
+            raise ReplayDiverged(f"Replay diverged: the visit drew {list(kind)} but the recording has {draw}")
+        return draw[-1]
+
+    def random(self):
+        return self._next('random')
+
+    def getrandbits(self, k):
+        return self._next('bits', k)
+
+
+class GymSession:
+    LOG_DIR = os.environ.get('FITNESS_SESSION_LOG')
+    SEED = os.environ.get('FITNESS_SEED')
+
+    def __init__(self, email, seed=None, recording=None):
+        self.email = email
+        self.started_at = datetime.datetime.now()
+        self.replaying = recording is not None
+        self.recorded = bool(GymSession.LOG_DIR) and not self.replaying
+        self.inputs = []
+        self.draws = []
+        if self.replaying:
+            self.seed = recording['seed']
+            self.rng = ReplayedRandom(recording['draws'])
+            self._answers = iter(recording['inputs'])
+            return
+        if seed is None:
+            seed = int(GymSession.SEED) if GymSession.SEED else secrets.randbits(64)
+        self.seed = seed
+        self.rng = RecordingRandom(seed, self.draws) if self.recorded else random.Random(seed)
+
+    @staticmethod
+    def replay(path):
+        with open(path, encoding='utf-8') as recording_file:
+            recording = json.load(recording_file)
+        return GymSession(recording['email'], recording=recording)
+
+    def input(self, prompt=''):
+        if self.replaying:
+            answer = next(self._answers, None)
+            if answer is None:
+                raise ReplayDiverged(f"Replay diverged: the visit asked '{prompt.strip()}' after the last recorded answer")
+            print(f"{prompt}{answer}")
+            return answer
+        answer = input(prompt)
+        if self.recorded:
+            self.inputs.append(answer)
+        return answer
+
+    def pause(self, seconds):
+        if not self.replaying:
+            time.sleep(seconds)
+
+    def save(self):
+        if not self.recorded:
+            return None
+        name = re.sub(r'[^A-Za-z0-9.@-]', '_', self.email)
+        path = os.path.join(GymSession.LOG_DIR, f"{self.started_at:%Y%m%d-%H%M%S}-{name}-{self.seed:x}.json")
+        with open(path, 'w', encoding='utf-8') as recording_file:
+            json.dump({'email': self.email, 'seed': self.seed, 'started_at': self.started_at.isoformat(),
+                       'inputs': self.inputs, 'draws': self.draws}, recording_file)
+        return path
+
+
+if __name__ == "__main__":
+    from Fitness import Fitness  # Fitness imports this module, so it is only needed here
+
+    if len(sys.argv) != 2:
+        print("Usage: python GymSession.py <recording.json>")
+        sys.exit(2)
+    session = GymSession.replay(sys.argv[1])
+    status = 0
+    started = time.perf_counter()
+    try:
+        Fitness.go_to_gym(session.email, session)
+    except ReplayDiverged as e:
+        print(e)
+        status = 1
+    except SystemExit:
+        pass  # The recorded visit ended with the member sent home (no stamina left, or injured)
+    print(f"Replayed the visit of {session.email} in {time.perf_counter() - started:.3f} s.")
+    sys.exit(status)
@@ -0,0 +1,197 @@
+"""
+The IndexAdvisor class replays the app's query log (recorded by DBManager when FITNESS_QUERY_LOG is set)
+through EXPLAIN and proposes indexes for the sequential scans it finds. For every table scanned with a
+filter, the columns compared in the filter become a candidate index (equality columns first, then one
+range column) unless an existing index already leads with the same column or the table is too small
+for an index to matter.
+
+With --apply, each proposed index is created and the affected queries are explained again, and the
+before/after plan comparison is written to a JSON report so the improvement can be reviewed and kept
+alongside the migration that adds the index.
+
+Key Functionalities:
+- load_log(path): Groups the logged statements by query text, keeping a call count and one sample statement each.
+- explain(cursor, sql): Returns the JSON plan of a statement without running it.
+- propose(log, min_rows): Returns the candidate indexes and the queries that would use them.
+- apply(proposals, report_path): Creates the proposed indexes and writes the before/after plan comparison.
+"""
+
+import argparse
+import json
+import re
+from collections import OrderedDict
+
+import psycopg2
+
+from DatabaseManager import DBManager
+
+# Matches `column op` pairs in plan filters such as ((room_id = 3) AND ((email)::text = 'x'::text))
+FILTER_COLUMN = re.compile(r"\(*(?:\w+\.)?(\w+)\)*(?:::[\w ]+)?\s*(=|<=|>=|<|>)\s")
+
+
+class IndexAdvisor:
+    MIN_ROWS = 1000  # Tables smaller than this are cheaper to scan than to index
+
+    @staticmethod
+    def load_log(path):
+        """ Returns {query: {'calls': n, 'sql': sample statement}} from a query log file. """
+        log = OrderedDict()
+        with open(path, encoding='utf-8') as log_file:
+            for line in log_file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                logged = log.setdefault(entry['query'], {'calls': 0, 'sql': entry['sql']})
+                logged['calls'] += 1
+        return log
+
+    @staticmethod
+    def explain(cursor, sql):
+        """ Returns the top plan node of the statement without executing it. """
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql)
+        return cursor.fetchone()['QUERY PLAN'][0]['Plan']
+
+    @staticmethod
+    def walk(plan):
+        """ Yields every node of a plan tree. """
+        yield plan
+        for child in plan.get('Plans', []):
+            yield from IndexAdvisor.walk(child)
+
+    @staticmethod
+    def scanned_nodes(plan):
+        """ Returns a short summary of how each relation in the plan is scanned. """
+        return [f"{node['Node Type']} on {node['Relation Name']}" for node in IndexAdvisor.walk(plan) if 'Relation Name' in node]
+
+    @staticmethod
+    def parent_table(cursor, relation):
+        """ Maps a partition to the partitioned table it belongs to. """
+        cursor.execute("SELECT inhparent::regclass::text AS parent FROM pg_inherits WHERE inhrelid = %s::regclass", (relation,))
+        record = cursor.fetchone()
+        return record['parent'] if record else relation
+
+    @staticmethod
+    def table_rows(cursor, table):
+        """ Estimated rows in a table, summing partitions for partitioned tables. """
+        cursor.execute("""
+            SELECT COALESCE(SUM(GREATEST(c.reltuples, 0)), 0) AS row_count
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
+               OR c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass)
+        """, (table, table))
+        return cursor.fetchone()['row_count']
+
+    @staticmethod
+    def table_columns(cursor, table):
+        cursor.execute("SELECT column_name FROM information_schema.columns WHERE table_name = %s", (table,))
+        return {row['column_name'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def leading_index_columns(cursor, table):
+        """ Returns the first column of every index on the table. """
+        cursor.execute("""
+            SELECT a.attname
+            FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = %s::regclass
+        """, (table,))
+        return {row['attname'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def index_columns(filter_text, columns):
+        """ Orders the filtered columns for a btree index: equality columns first, then one range column. """
+        equality, ranged = [], []
+        for column, operator in FILTER_COLUMN.findall(filter_text):
+            if column not in columns:
+                continue
+            target = equality if operator == '=' else ranged
+            if column not in equality and column not in ranged:
+                target.append(column)
+        return equality + ranged[:1]
+
+    @staticmethod
+    def propose(log, min_rows=None):
+        """ Returns {index_sql: {'table', 'columns', 'queries'}} for the sequential scans found in the log. """
+        min_rows = IndexAdvisor.MIN_ROWS if min_rows is None else min_rows
+        proposals = OrderedDict()
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                for query, logged in log.items():
+                    try:
+                        plan = IndexAdvisor.explain(cursor, logged['sql'])
+                    except psycopg2.Error as e:
+                        conn.rollback()
+                        print(f"Skipping query that could not be explained ({e.pgerror or e}): {query}")
+                        continue
+
+                    for node in IndexAdvisor.walk(plan):
+                        if node['Node Type'] != 'Seq Scan' or 'Filter' not in node:
+                            continue
+                        table = IndexAdvisor.parent_table(cursor, node['Relation Name'])
+                        if IndexAdvisor.table_rows(cursor, table) < min_rows:
+                            continue
+                        columns = IndexAdvisor.index_columns(node['Filter'], IndexAdvisor.table_columns(cursor, table))
+                        if not columns or columns[0] in IndexAdvisor.leading_index_columns(cursor, table):
+                            continue
+
+                        index_sql = "CREATE INDEX IF NOT EXISTS {}_{}_idx ON {} ({})".format(
+                            table, '_'.join(columns), table, ', '.join(columns))
+                        proposal = proposals.setdefault(index_sql, {'table': table, 'columns': columns, 'queries': []})
+                        proposal['queries'].append({'query': query, 'calls': logged['calls'], 'sql': logged['sql']})
+                conn.rollback()
+        return proposals
+
+    @staticmethod
+    def apply(proposals, report_path):
+        """ Creates each proposed index and writes the before/after plans of the affected queries. """
+        report = []
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                for index_sql, proposal in proposals.items():
+                    before = [IndexAdvisor.explain(cursor, query['sql']) for query in proposal['queries']]
+                    try:
+                        cursor.execute(index_sql)
+                        cursor.execute(f"ANALYZE {proposal['table']}")
+                        conn.commit()
+                    except psycopg2.Error as e:
+                        conn.rollback()
+                        print(f"Failed to create index ({e}): {index_sql}")
+                        continue
+                    after = [IndexAdvisor.explain(cursor, query['sql']) for query in proposal['queries']]
+
+                    report.append({
+                        'index': index_sql,
+                        'queries': [{
+                            'query': query['query'],
+                            'calls': query['calls'],
+                            'before_cost': before_plan['Total Cost'],
+                            'after_cost': after_plan['Total Cost'],
+                            'before_scans': IndexAdvisor.scanned_nodes(before_plan),
+                            'after_scans': IndexAdvisor.scanned_nodes(after_plan),
+                        } for query, before_plan, after_plan in zip(proposal['queries'], before, after)]
+                    })
+                    print(f"Created: {index_sql}")
+                conn.rollback()
+
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=2)
+        return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Propose (and optionally create) indexes from the app's query log.")
+    parser.add_argument('query_log', help="File written by the app when FITNESS_QUERY_LOG is set")
+    parser.add_argument('--apply', action='store_true', help="Create the proposed indexes")
+    parser.add_argument('--min-rows', type=int, default=IndexAdvisor.MIN_ROWS, help="Ignore tables smaller than this")
+    parser.add_argument('--report', default='index_advisor_report.json', help="Where to write the before/after plan comparison")
+    args = parser.parse_args()
+
+    proposals = IndexAdvisor.propose(IndexAdvisor.load_log(args.query_log), args.min_rows)
+    if not proposals:
+        print("No missing indexes found.")
+    for index_sql, proposal in proposals.items():
+        calls = sum(query['calls'] for query in proposal['queries'])
+        print(f"{index_sql};  -- used by {len(proposal['queries'])} queries, {calls} calls")
+    if args.apply and proposals:
+        IndexAdvisor.apply(proposals, args.report)
+        print(f"Plan comparison written to {args.report}.")
@@ -0,0 +1,112 @@
+"""
+The Leaderboard class shows members how they rank against the club on each health statistic, either
+globally or within their gender or age band cohort. Rankings are served from `leaderboard_entries`,
+which triggers on `health_statistics` and `member_accounts` keep up to date whenever a stat, gender or
+age changes (workouts, injuries and profile edits alike). Pages are read with keyset pagination over
+the (stat, cohort, score, email) index, so showing a page costs the page size, not the club size. Members
+with the same score share a rank. A member's own rank comes from `leaderboard_score_counts`, the number of
+entries per score kept by triggers on `leaderboard_entries`, so it costs one row per score above theirs
+however far down the board they are.
+
+Key Functionalities:
+- page(stat, cohort, after): Returns the next page of entries after the given (score, email) position.
+- position(email, stat, cohort): Returns a member's score, rank and how many others share it.
+- cohorts(email): Returns the cohorts a member is ranked in.
+- menu(email): Interactive leaderboard screen for members.
+"""
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+
+
+class Leaderboard:
+    STATS = ('fitness_level', 'strength', 'flexibility', 'endurance')
+    PAGE_SIZE = 10
+    START = (11, '')  # Ranks just above the best possible score (10), so the first page starts at the top
+
+    @staticmethod
+    def page(stat, cohort, after=None):
+        """ Returns (email, name, score) rows for the next page after the (score, email) position after. """
+        after = after or Leaderboard.START
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.LEADERBOARD_PAGE, (stat, cohort, *after, Leaderboard.PAGE_SIZE))
+                return cursor.fetchall()
+        return []
+
+    @staticmethod
+    def position(email, stat, cohort):
+        """ Returns {'score', 'position', 'tied'} for the member, or None if they are not ranked in this leaderboard. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.LEADERBOARD_POSITION, (stat, cohort, email))
+                return cursor.fetchone()
+        return None
+
+    @staticmethod
+    def cohorts(email):
+        """ Returns the cohorts the member is ranked in, 'all' first. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.LEADERBOARD_COHORTS, (email,))
+                cohorts = [row['cohort'] for row in cursor.fetchall()]
+                return sorted(cohorts, key=lambda cohort: cohort != 'all')
+        return []
+
+    @staticmethod
+    def describe(cohort):
+        if cohort == 'all':
+            return "All Members"
+        kind, value = cohort.split(':', 1)
+        return f"{kind.capitalize()}: {value}"
+
+    @staticmethod
+    def menu(email):
+        clear_screen()
+        print("====================================================")
+        print("Leaderboards")
+        for idx, stat in enumerate(Leaderboard.STATS, start=1):
+            print(f"{idx}. {stat.replace('_', ' ').capitalize()}")
+        choice = input("Select a stat (enter the number): ").strip()
+        if not (choice.isdigit() and 1 <= int(choice) <= len(Leaderboard.STATS)):
+            print("Invalid selection.")
+            input("Press Enter to go back...")
+            return
+        stat = Leaderboard.STATS[int(choice) - 1]
+
+        cohorts = Leaderboard.cohorts(email) or ['all']
+        cohort = cohorts[0]
+        if len(cohorts) > 1:
+            for idx, candidate in enumerate(cohorts, start=1):
+                print(f"{idx}. {Leaderboard.describe(candidate)}")
+            choice = input("Select a leaderboard (enter the number): ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(cohorts):
+                cohort = cohorts[int(choice) - 1]
+
+        rank, shown, previous, after = 0, 0, None, None
+        while True:
+            clear_screen()
+            print("====================================================")
+            print(f"{stat.replace('_', ' ').capitalize()} Leaderboard ({Leaderboard.describe(cohort)})")
+            mine = Leaderboard.position(email, stat, cohort)
+            if mine:
+                tied = f", tied with {mine['tied']} others" if mine['tied'] else ""
+                print(f"You are #{mine['position']} with a score of {mine['score']}{tied}.")
+
+            entries = Leaderboard.page(stat, cohort, after)
+            if not entries:
+                print("No more members on this leaderboard.")
+            print("| {:>5} | {:<30} | {:^7} |".format("Rank", "Member", "Score"))
+            for entry in entries:
+                rank += 1
+                if entry['score'] != previous:  # Equal scores share the rank of the first of them
+                    shown, previous = rank, entry['score']
+                print("| {:>5} | {:<30} | {:^7} |".format(shown, entry['name'] or entry['email'], entry['score']))
+
+            if len(entries) < Leaderboard.PAGE_SIZE:
+                input("Press Enter to go back...")
+                return
+            if input("Press Enter for the next page, or 'q' to go back: ").strip().lower() == 'q':
+                return
+            after = (entries[-1]['score'], entries[-1]['email'])
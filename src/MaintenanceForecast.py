@@ -0,0 +1,118 @@
+"""
+The MaintenanceForecast class predicts when each piece of equipment will drop below the quality at which
+it starts injuring members, so it can be repaired beforehand. Each item's usage rate (uses per day) and
+wear per use come from the hourly telemetry recorded by EquipmentTelemetry, falling back to the nominal
+wear per use for items without history. The forecast is computed for the whole fleet in one set-based
+query, and due items are batched into one maintenance visit per room, scheduled just before the first
+item in that room becomes dangerous.
+
+Key Functionalities:
+- forecast(): Items that become dangerous within the planning horizon, with their due dates.
+- schedule(): One maintenance visit per room, covering every item due in that room within the horizon.
+- repair(room_id, equipment_ids): Restores the listed items in a room to full quality.
+- menu(): Forecast and schedule screen used by the admin equipment monitor.
+"""
+
+import datetime
+
+import psycopg2
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from EquipmentAlerts import EquipmentAlerts
+from EquipmentTelemetry import EquipmentTelemetry
+from EquipmentUsage import EquipmentUsage
+from Fitness import Fitness
+from QueryRegistry import Queries
+
+
+class MaintenanceForecast:
+    HISTORY_DAYS = 28  # Usage history the rates are measured over
+    HORIZON_DAYS = 14  # How far ahead items are scheduled
+    LEAD_DAYS = 1  # Visit a room this many days before its first item becomes dangerous
+
+    @staticmethod
+    def params(today=None):
+        today = today or datetime.date.today()
+        return {
+            'since': today - datetime.timedelta(days=MaintenanceForecast.HISTORY_DAYS),
+            'history_days': MaintenanceForecast.HISTORY_DAYS,
+            'wear_per_use': Fitness.WEAR_PER_USE,
+            'danger': Fitness.DANGER_QUALITY,
+            'today': today,
+            'horizon_days': MaintenanceForecast.HORIZON_DAYS,
+            'lead_days': MaintenanceForecast.LEAD_DAYS,
+        }
+
+    @staticmethod
+    def _fetch(query, today=None):
+        EquipmentTelemetry.counters.flush()  # Include the uses still counted in memory
+        EquipmentUsage.flush()  # and any wear accumulated for hot machines
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(query, MaintenanceForecast.params(today))
+                return cursor.fetchall()
+        return []
+
+    @staticmethod
+    def forecast(today=None):
+        """ Returns the items that become dangerous within the horizon, soonest first. """
+        return MaintenanceForecast._fetch(Queries.MAINTENANCE_FORECAST, today)
+
+    @staticmethod
+    def schedule(today=None):
+        """ Returns one visit per room: its date and the items to repair, soonest first. """
+        return MaintenanceForecast._fetch(Queries.MAINTENANCE_SCHEDULE, today)
+
+    @staticmethod
+    def repair(room_id, equipment_ids):
+        """ Restores the items to full quality and returns how many were repaired. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute(Queries.EQUIPMENT_REPAIR, (Fitness.MAX_QUALITY, room_id, list(equipment_ids)))
+                    repaired = [row['equipment_id'] for row in cursor.fetchall()]
+                    conn.commit()
+                    EquipmentTelemetry.record_repairs(repaired)
+                    EquipmentAlerts.forget(repaired)
+                    return len(repaired)
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    print("An error occurred while repairing the equipment:", e)
+        return 0
+
+    @staticmethod
+    def menu():
+        while True:
+            clear_screen()
+            print("=========================================================")
+            print(f"Maintenance Forecast (next {MaintenanceForecast.HORIZON_DAYS} days)")
+            items = MaintenanceForecast.forecast()
+            if not items:
+                print("No equipment is expected to become dangerous in this period.")
+                input("Press Enter to go back...")
+                return
+
+            print("| {:<20} | {:<15} | {:^7} | {:^8} | {:^9} | {:^10} |".format(
+                "Equipment Name", "Room Name", "Quality", "Uses/Day", "Uses Left", "Due"))
+            for item in items:
+                print("| {:<20} | {:<15} | {:^7} | {:^8} | {:^9} | {:^10} |".format(
+                    item['equipment_name'], item['room_name'], item['quality'],
+                    item['uses_per_day'], item['uses_left'], item['due_date'].isoformat()))
+
+            visits = MaintenanceForecast.schedule()
+            print("\nMaintenance Schedule:")
+            for idx, visit in enumerate(visits, start=1):
+                print(f"{idx}. {visit['visit_date'].isoformat()} {visit['room_name']}: "
+                      f"{visit['items']} item(s) - {', '.join(visit['equipment_names'])}")
+
+            choice = input("\nEnter a visit number to carry it out now, or press Enter to go back: ").strip()
+            if not choice:
+                return
+            if choice.isdigit() and 1 <= int(choice) <= len(visits):
+                visit = visits[int(choice) - 1]
+                repaired = MaintenanceForecast.repair(visit['room_id'], visit['equipment_ids'])
+                print(f"Repaired {repaired} item(s) in {visit['room_name']}.")
+            else:
+                print("Invalid selection.")
+            input("Press Enter to continue...")
@@ -16,7 +16,11 @@ Key Functionalities:
 - edit_fitness_goals(): Manages the selection and updating of preset or custom fitness goals.
 - get_health_info(), show_or_edit_health_info(), and edit_health_info(): Manage the fetching, displaying, and editing of health metrics.
 - show_or_edit_exercise_routines(): Displays and allows the editing of exercise routines.
-- view_fitness_achievements(email): Displays fitness achievements for a member and initializes them if none exist.
+- view_fitness_achievements(email): Displays every achievement in the catalog and whether the member has earned it.
+- Leaderboards: Opens the leaderboard screen, where members see their rank globally and in their gender and age cohorts.
+- My Workout Progress: Shows sessions per week, favourite equipment and stat changes from the workout history.
+- Classes: Shows the class timetable with seats left, and enrolls in or cancels classes (joining the waitlist when full).
+- My Check-in Badge: Shows the member's visits this month and issues the badge they check in with at the door.
 - show_or_edit_health_stats(): Manages the display and editing of health statistics, including initialization for new members.
 
 """
@@ -27,9 +31,16 @@ import bcrypt
 import time
 import psycopg2
 
+from Achievements import Achievements
+from CheckIn import CheckIn
 from ClearScreen import clear_screen
 from DatabaseManager import DBManager
+from Enrollment import Enrollment
+from QueryRegistry import Queries
+from UnitOfWork import UnitOfWork
 from Fitness import Fitness
+from Leaderboard import Leaderboard
+from Workouts import Workouts
 
 class Member:
     def __init__(self, email):
@@ -46,7 +57,7 @@ class Member:
 
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT password FROM member_accounts WHERE email = %s", (email,))
+                cursor.execute(Queries.MEMBER_PASSWORD, (email,))
                 record = cursor.fetchone()
 
                 if record is None:
@@ -76,7 +87,11 @@ class Member:
             print("5. My Exercise Routines")
             print("6. My Fitness Goals")
             print("7. My Fitness Achievements")
-            print("8. Log Out")
+            print("8. Leaderboards")
+            print("9. My Workout Progress")
+            print("10. Classes")
+            print("11. My Check-in Badge")
+            print("12. Log Out")
 
             choice = input("Enter choice: ")
             self.handle_dashboard_choice(choice)
@@ -85,7 +100,7 @@ class Member:
         """ Retrieves member's name from the database. """
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT name FROM member_accounts WHERE email = %s", (self.email,))
+            cursor.execute(Queries.MEMBER_NAME, (self.email,))
             name = cursor.fetchone()
             return name['name'] if name else "Member"
 
@@ -99,7 +114,11 @@ class Member:
             "5": lambda: self.show_or_edit_exercise_routines(),
             "6": lambda: self.show_or_edit_fitness_goals(),
             "7": lambda: self.view_fitness_achievements(self.email),
-            "8": sys.exit
+            "8": lambda: Leaderboard.menu(self.email),
+            "9": lambda: Workouts.show_progress(self.email),
+            "10": lambda: Enrollment.menu(self.email),
+            "11": lambda: CheckIn.show_badge(self.email),
+            "12": sys.exit
         }
         action = actions.get(choice)
         if action:
@@ -139,7 +158,7 @@ class Member:
         """ Fetches personal information from the database. """
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT name, gender, age FROM member_accounts WHERE email = %s", (self.email,))
+            cursor.execute(Queries.MEMBER_PERSONAL_INFO, (self.email,))
             user_info = cursor.fetchone()
             # Ensure all keys are present, even if they are None
             return {key: (user_info[key] if user_info and key in user_info else "Not set") for key in ['name', 'gender', 'age']}
@@ -147,26 +166,27 @@ class Member:
 
     def edit_personal_information(self, user_info):
         """ Edits personal information and updates the database. """
+        work = UnitOfWork()
+        info = work.track(user_info, Queries.MEMBER_UPDATE_PERSONAL_INFO,
+                          lambda row: (row['name'], row['gender'], row['age'], self.email))
+
         # Request new name or keep current if none is entered
         new_name = input(f"Enter new name or press 'Enter' to keep current (current: {user_info.get('name', 'Not set')}): ").strip()
-        new_name = new_name if new_name else user_info['name']
+        if new_name:
+            info['name'] = new_name
 
         # Handle gender input, allowing for 'Enter' to skip
-        new_gender = self.get_new_gender(user_info)
+        info['gender'] = self.get_new_gender(user_info)
 
         # Get a valid age or keep current if 'Enter' is pressed
-        new_age = self.get_valid_age(user_info)
+        info['age'] = self.get_valid_age(user_info)
 
-        with DBManager.connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE member_accounts 
-                SET name = %s, gender = %s, age = %s 
-                WHERE email = %s
-            """, (new_name, new_gender, new_age, self.email))
-            conn.commit()
+        written = work.flush()
+        if written:
             print("Personal information updated successfully. Redirecting...")
-            time.sleep(1)
+        elif written == 0:
+            print("No changes made. Redirecting...")
+        time.sleep(1)
 
     def get_new_gender(self, user_info):
         """ Handles gender selection and input, allowing skip by pressing 'Enter'. """
@@ -202,7 +222,7 @@ class Member:
         try:
             with DBManager.connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute("SELECT goal1, goal2, goal3 FROM fitness_goals WHERE email = %s", (self.email,))
+                    cursor.execute(Queries.FITNESS_GOALS_BY_EMAIL, (self.email,))
                     goals = cursor.fetchone()
 
                     if not goals:
@@ -274,7 +294,7 @@ class Member:
         """ Fetches current fitness goals from the database. """
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT goal1, goal2, goal3 FROM fitness_goals WHERE email = %s", (self.email,))
+            cursor.execute(Queries.FITNESS_GOALS_BY_EMAIL, (self.email,))
             goals = cursor.fetchone()
             return [goals['goal1'], goals['goal2'], goals['goal3']] if goals else [None, None, None]
 
@@ -282,12 +302,7 @@ class Member:
         """ Updates the fitness goals in the database. """
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO fitness_goals (email, goal1, goal2, goal3)
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (email) DO UPDATE SET
-                goal1 = EXCLUDED.goal1, goal2 = EXCLUDED.goal2, goal3 = EXCLUDED.goal3
-            """, (self.email, goals[0], goals[1], goals[2]))
+            cursor.execute(Queries.FITNESS_GOALS_UPSERT, (self.email, goals[0], goals[1], goals[2]))
             conn.commit()
             print("Fitness goals updated successfully.")
             print("Redirecting back to My Dashboard...")
@@ -297,7 +312,7 @@ class Member:
         """Fetches health metrics from the database."""
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT height, weight, body_fat_percentage, resting_heart_rate FROM member_health_metrics WHERE email = %s", (self.email,))
+            cursor.execute(Queries.HEALTH_METRICS_BY_EMAIL, (self.email,))
             return cursor.fetchone()
 
     def show_or_edit_health_info(self):
@@ -329,13 +344,17 @@ class Member:
 
     def edit_health_info(self, health_info=None):
         """Edits health metrics based on user input and updates them in the database."""
+        work = UnitOfWork()
+        is_new = not health_info
         if not health_info:
             health_info = {'height': None, 'weight': None, 'body_fat_percentage': None, 'resting_heart_rate': None}
+        metrics = work.track(health_info, Queries.HEALTH_METRICS_UPSERT, lambda row: (
+            self.email, row['height'], row['weight'], row['body_fat_percentage'], row['resting_heart_rate']), new=is_new)
 
         while True:
             try:
                 new_height = input(f"Enter new height (cm) or press 'Enter' to keep current ({health_info.get('height', 'Not set')}): ").strip()
-                new_height = float(new_height) if new_height else health_info['height']
+                metrics['height'] = float(new_height) if new_height else health_info['height']
                 break
             except ValueError:
                 print("Invalid input. Please enter a valid number for height.")
@@ -343,7 +362,7 @@ class Member:
         while True:
             try:
                 new_weight = input(f"Enter new weight (kg) or press 'Enter' to keep current ({health_info.get('weight', 'Not set')}): ").strip()
-                new_weight = float(new_weight) if new_weight else health_info['weight']
+                metrics['weight'] = float(new_weight) if new_weight else health_info['weight']
                 break
             except ValueError:
                 print("Invalid input. Please enter a valid number for weight.")
@@ -351,7 +370,7 @@ class Member:
         while True:
             try:
                 new_body_fat = input(f"Enter new body fat percentage or press 'Enter' to keep current ({health_info.get('body_fat_percentage', 'Not set')}): ").strip()
-                new_body_fat = float(new_body_fat) if new_body_fat else health_info['body_fat_percentage']
+                metrics['body_fat_percentage'] = float(new_body_fat) if new_body_fat else health_info['body_fat_percentage']
                 break
             except ValueError:
                 print("Invalid input. Please enter a valid number for body fat percentage.")
@@ -359,24 +378,18 @@ class Member:
         while True:
             try:
                 new_heart_rate = input(f"Enter new resting heart rate or press 'Enter' to keep current ({health_info.get('resting_heart_rate', 'Not set')}): ").strip()
-                new_heart_rate = int(new_heart_rate) if new_heart_rate else health_info['resting_heart_rate']
+                metrics['resting_heart_rate'] = int(new_heart_rate) if new_heart_rate else health_info['resting_heart_rate']
                 break
             except ValueError:
                 print("Invalid input. Please enter a valid integer for resting heart rate.")
 
-        with DBManager.connection() as conn:
-            cursor = conn.cursor()
-            update_query = """
-                INSERT INTO member_health_metrics (email, height, weight, body_fat_percentage, resting_heart_rate)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (email) DO UPDATE SET
-                height = EXCLUDED.height, weight = EXCLUDED.weight, body_fat_percentage = EXCLUDED.body_fat_percentage, resting_heart_rate = EXCLUDED.resting_heart_rate
-            """
-            cursor.execute(update_query, (self.email, new_height, new_weight, new_body_fat, new_heart_rate))
-            conn.commit()
+        written = work.flush()
+        if written:
             print("Health metrics updated successfully. Redirecting...")
-            time.sleep(1)
-            self.show_or_edit_health_info()
+        elif written == 0:
+            print("No changes made. Redirecting...")
+        time.sleep(1)
+        self.show_or_edit_health_info()
 
 
     def show_or_edit_exercise_routines(self):
@@ -407,7 +420,7 @@ class Member:
         """Fetches current exercise routines from the database."""
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT routine1, routine2, routine3 FROM exercise_routines WHERE email = %s", (self.email,))
+            cursor.execute(Queries.ROUTINES_BY_EMAIL, (self.email,))
             routines = cursor.fetchone()
             return [routines['routine1'], routines['routine2'], routines['routine3']] if routines else ["", "", ""]
 
@@ -448,12 +461,7 @@ class Member:
         # Updating the database with new routines
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO exercise_routines (email, routine1, routine2, routine3) 
-                VALUES (%s, %s, %s, %s)
-                ON CONFLICT (email) DO UPDATE SET
-                routine1 = EXCLUDED.routine1, routine2 = EXCLUDED.routine2, routine3 = EXCLUDED.routine3
-            """, (self.email, new_routines[0] if len(new_routines) > 0 else None, 
+            cursor.execute(Queries.ROUTINES_UPSERT, (self.email, new_routines[0] if len(new_routines) > 0 else None, 
                 new_routines[1] if len(new_routines) > 1 else None, 
                 new_routines[2] if len(new_routines) > 2 else None))
             conn.commit()
@@ -467,45 +475,20 @@ class Member:
             print("Invalid email type. Email must be a string.")
             return
 
-        default_achievements = {
-            'first_fitness_goal_achieved': False,
-            'never_skipped_leg_day': False,
-            'can_do_pushup': False,
-            'can_do_pullup': False,
-            'can_touch_toes': False,
-            'achieved_weight_loss_goal': False,
-            'achieved_muscle_gain_goal': False
-        }
+        # Members without an achievements row have simply not earned any yet
+        achievements = Achievements.for_member(email)
+        if not achievements:
+            print("Failed to retrieve fitness achievements.")
+            return
 
-        with DBManager.connection() as conn:
-            with conn.cursor() as cursor:
-                try:
-                    cursor.execute("SELECT * FROM fitness_achievements WHERE email = %s", (email,))
-                    achievements = cursor.fetchone()
-
-                    if not achievements:
-                        print("Initializing fitness achievements for the new member.")
-
-                        # Insert default achievements if none are found
-                        placeholders = ', '.join(['%s'] * len(default_achievements))
-                        columns = ', '.join(default_achievements.keys())
-                        values = list(default_achievements.values())
-                        cursor.execute(f"INSERT INTO fitness_achievements (email, {columns}) VALUES (%s, {placeholders})", (email, *values))
-                        conn.commit()
-                        achievements = default_achievements
-
-                    print("Fitness Achievements:")
-                    print("| {:<30} | {:<10} |".format("Achievement", "Status"))
-                    for key, value in achievements.items():
-                        if key != 'email':  # Ensure 'email' is not included in the output
-                            formatted_key = key.replace('_', ' ').capitalize()
-                            status = 'Yes' if value else 'No'
-                            print("| {:<30} | {:<10} |".format(formatted_key, status))
-                            
-                    print("Ask a trainer for more information on achievements!")
-                    input("Press Enter to go back...")  # Wait for user to acknowledge before returning
-                except psycopg2.Error as e:
-                    print(f"Failed to retrieve or initialize fitness achievements. Error: {e}")
+        print("Fitness Achievements:")
+        print("| {:<30} | {:<10} |".format("Achievement", "Status"))
+        for achievement in achievements:
+            status = 'Yes' if achievement['earned'] else 'No'
+            print("| {:<30} | {:<10} |".format(achievement['name'], status))
+
+        print("Ask a trainer for more information on achievements!")
+        input("Press Enter to go back...")  # Wait for user to acknowledge before returning
 
 
     def show_or_edit_health_stats(self):
@@ -544,7 +527,7 @@ class Member:
         """ Fetches health statistics from the database. """
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (self.email,))
+            cursor.execute(Queries.HEALTH_STATS_BY_EMAIL, (self.email,))
             stats = cursor.fetchone()
             return {key: val for key, val in stats.items()} if stats else None
 
@@ -552,66 +535,74 @@ class Member:
     def edit_health_stats(email, callback=None):
         clear_screen()
         """ Allows a member to edit their health statistics or sets up initial stats if none exist. """
+        stats = None
         with DBManager.connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM health_statistics WHERE email = %s", (email,))
+            cursor.execute(Queries.HEALTH_STATS_BY_EMAIL, (email,))
             stats = cursor.fetchone()
 
-            if not stats:
-                print("Setting up initial health statistics for the new member.")
-                default_stats = {
-                    'fitness_level': 1,  # Beginner
-                    'strength': 1,
-                    'flexibility': 1,
-                    'endurance': 1,
-                    'stamina': 1,
-                    'has_water': False,
-                    'has_protein': False,
-                    'is_injured': False
-                }
-                cursor.execute("""
-                    INSERT INTO health_statistics (email, fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """, (email, *default_stats.values()))
-                conn.commit()
-                print("Initial health statistics have been set up.")
-                time.sleep(1)
-                if callback:
-                    callback()  # Redirect to the health stats view/edit menu
-                return
-            else:
-                print("Your current stats:")
-                print("| {:<15} | {:^10} |".format("Metric", "Value"))
-                for key, value in stats.items():
-                    print("| {:<15} | {:^10} |".format(key.capitalize(), value))
-
-            metrics_info = {
-                'fitness_level': ("Fitness Level (1: Beginner, 2: Intermediate, 3: Advanced): ", range(1, 4)),
-                'strength': ("Strength (1-10): ", range(1, 11)),
-                'flexibility': ("Flexibility (1-10): ", range(1, 11)),
-                'endurance': ("Endurance (1-10): ", range(1, 11)),
-                'stamina': ("Stamina (0-10): ", range(0, 11)),
-                'has_water': ("Has Water (1: Yes, 2: No): ", ['1', '2']),
-                'has_protein': ("Has Protein (1: Yes, 2: No): ", ['1', '2']),
-                'is_injured': ("Is Injured (1: Yes, 2: No): ", ['1', '2'])
+        fields = ['fitness_level', 'strength', 'flexibility', 'endurance', 'stamina', 'has_water', 'has_protein', 'is_injured']
+        work = UnitOfWork()
+
+        if not stats:
+            print("Setting up initial health statistics for the new member.")
+            default_stats = {
+                'fitness_level': 1,  # Beginner
+                'strength': 1,
+                'flexibility': 1,
+                'endurance': 1,
+                'stamina': 1,
+                'has_water': False,
+                'has_protein': False,
+                'is_injured': False
             }
+            work.track(default_stats, Queries.HEALTH_STATS_INSERT, lambda row: (email, *(row[field] for field in fields)), new=True)
+            if work.flush():
+                print("Initial health statistics have been set up.")
+            time.sleep(1)
+            if callback:
+                callback()  # Redirect to the health stats view/edit menu
+            return
 
-            # Edit metrics one by one
-            for key, (prompt, valid_inputs) in metrics_info.items():
-                while True:  # Keep asking until valid input or skip
-                    new_value = input(f"{prompt} Current ({stats[key]}): ").strip()
-                    if new_value == "":
-                        break  # Allow skipping
-                    if isinstance(valid_inputs, range) and new_value.isdigit() and int(new_value) in valid_inputs:
-                        new_value = int(new_value) 
-                    elif new_value in valid_inputs:
-                        new_value = True if new_value == '1' else False  
-                    else:
-                        print("Invalid input. Please enter a valid value.")
-                        continue  # Reprompt on invalid input
-
-                    cursor.execute(f"UPDATE health_statistics SET {key} = %s WHERE email = %s", (new_value, email))
-                    conn.commit()
-                    stats[key] = new_value  # Update for display
-                    print(f"{key.replace('_', ' ').capitalize()} updated to {new_value}.")
-                    break  # Move to the next metric after successful update
\ No newline at end of file
+        print("Your current stats:")
+        print("| {:<15} | {:^10} |".format("Metric", "Value"))
+        for key, value in stats.items():
+            print("| {:<15} | {:^10} |".format(key.capitalize(), value))
+
+        stats = work.track(stats, Queries.HEALTH_STATS_UPDATE_CHANGED, lambda row: (email,))
+
+        metrics_info = {
+            'fitness_level': ("Fitness Level (1: Beginner, 2: Intermediate, 3: Advanced): ", range(1, 4)),
+            'strength': ("Strength (1-10): ", range(1, 11)),
+            'flexibility': ("Flexibility (1-10): ", range(1, 11)),
+            'endurance': ("Endurance (1-10): ", range(1, 11)),
+            'stamina': ("Stamina (0-10): ", range(0, 11)),
+            'has_water': ("Has Water (1: Yes, 2: No): ", ['1', '2']),
+            'has_protein': ("Has Protein (1: Yes, 2: No): ", ['1', '2']),
+            'is_injured': ("Is Injured (1: Yes, 2: No): ", ['1', '2'])
+        }
+
+        # Edit metrics one by one; changes are saved together once every metric has been asked
+        for key, (prompt, valid_inputs) in metrics_info.items():
+            while True:  # Keep asking until valid input or skip
+                new_value = input(f"{prompt} Current ({stats[key]}): ").strip()
+                if new_value == "":
+                    break  # Allow skipping
+                if isinstance(valid_inputs, range) and new_value.isdigit() and int(new_value) in valid_inputs:
+                    new_value = int(new_value)
+                elif new_value in valid_inputs:
+                    new_value = True if new_value == '1' else False
+                else:
+                    print("Invalid input. Please enter a valid value.")
+                    continue  # Reprompt on invalid input
+
+                stats[key] = new_value
+                break  # Move to the next metric
+
+        changes = stats.changes()
+        if work.flush():
+            for key, value in changes.items():
+                print(f"{key.replace('_', ' ').capitalize()} updated to {value}.")
+        elif not changes:
+            print("No changes made.")
+        time.sleep(1)
@@ -0,0 +1,82 @@
+"""
+The Migrations class brings an existing database up to date with the current schema. Each file in the
+`migrations/` directory is named `NNNN_description.sql`; the number is its version. Applied versions are
+recorded in `schema_migrations`, and a fresh database created from tables.sql is already marked with
+every version that file contains, so only newer migrations run against it.
+
+Key Functionalities:
+- available(): Lists (version, name, path) for every migration file, ordered by version.
+- applied(): Returns the set of versions already recorded in the database.
+- migrate(): Applies every pending migration, each in its own transaction, and returns the applied versions.
+"""
+
+import os
+import re
+
+import psycopg2
+
+from DatabaseManager import DBManager
+
+
+class Migrations:
+    MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'migrations')
+    FILE_PATTERN = re.compile(r'^(\d{4})_(\w+)\.sql$')
+    LOCK_ID = 3005  # Advisory lock so two app instances never migrate at the same time
+
+    @staticmethod
+    def available():
+        """ Returns (version, name, path) for every migration file, ordered by version. """
+        migrations = []
+        for file_name in sorted(os.listdir(Migrations.MIGRATIONS_DIR)):
+            match = Migrations.FILE_PATTERN.match(file_name)
+            if match:
+                migrations.append((int(match.group(1)), match.group(2), os.path.join(Migrations.MIGRATIONS_DIR, file_name)))
+        return migrations
+
+    @staticmethod
+    def applied(cursor):
+        """ Returns the set of migration versions already applied to the database. """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INT PRIMARY KEY,
+                name TEXT NOT NULL,
+                applied_at TIMESTAMP NOT NULL DEFAULT now()
+            )
+        """)
+        cursor.execute("SELECT version FROM schema_migrations")
+        return {row['version'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def migrate():
+        """ Applies every pending migration in version order and returns the versions applied. """
+        applied_now = []
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", (Migrations.LOCK_ID,))
+                try:
+                    done = Migrations.applied(cursor)
+                    conn.commit()
+                    for version, name, path in Migrations.available():
+                        if version in done:
+                            continue
+                        with open(path, encoding='utf-8') as migration_file:
+                            sql = migration_file.read()
+                        try:
+                            cursor.execute(sql)
+                            cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                            conn.commit()
+                            applied_now.append(version)
+                            print(f"Applied migration {version:04d}_{name}.")
+                        except psycopg2.Error as e:
+                            conn.rollback()
+                            print(f"Migration {version:04d}_{name} failed, stopping: {e}")
+                            break
+                finally:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (Migrations.LOCK_ID,))
+                    conn.commit()
+        return applied_now
+
+
+if __name__ == "__main__":
+    applied_versions = Migrations.migrate()
+    print(f"{len(applied_versions)} migration(s) applied." if applied_versions else "Database is up to date.")
@@ -0,0 +1,121 @@
+"""
+The Notifications class delivers PostgreSQL NOTIFY messages to the app. A single background thread holds
+a dedicated connection that LISTENs on every subscribed channel and calls the channel's handlers with
+each payload as it arrives, so screens can react to changes pushed by triggers instead of polling.
+
+Notifications sent while the listener is disconnected are lost, so every subscription can also supply a
+resync callback. It runs once the channel is being listened to, both when the subscription starts and
+after any reconnect, so the subscriber can reload its state without missing a change.
+
+Key Functionalities:
+- subscribe(channel, handler, resync): Listens on a channel and calls handler(payload) for each notification.
+- stop(): Stops the listener thread and closes its connection.
+"""
+
+import select
+import threading
+import time
+
+import psycopg2
+
+from DatabaseManager import DBManager
+
+
+class Notifications:
+    POLL_SECONDS = 5  # How often the listener wakes up when no notifications arrive
+    RECONNECT_SECONDS = 5
+
+    _subscriptions = {}  # channel -> [(handler, resync)]
+    _lock = threading.Lock()
+    _conn = None
+    _thread = None
+    _stopped = threading.Event()
+
+    @staticmethod
+    def subscribe(channel, handler, resync=None):
+        """ Calls handler(payload) for every notification on channel; resync() runs whenever listening (re)starts. """
+        with Notifications._lock:
+            first = channel not in Notifications._subscriptions
+            Notifications._subscriptions.setdefault(channel, []).append((handler, resync))
+            conn = Notifications._conn
+            if Notifications._thread is None:
+                Notifications._stopped.clear()
+                Notifications._thread = threading.Thread(target=Notifications._run, daemon=True)
+                Notifications._thread.start()
+                return  # The listener resyncs every subscription once it has connected
+
+        if conn is not None:
+            try:
+                if first:
+                    Notifications._listen(conn, channel)
+            except psycopg2.Error as e:
+                print(f"Failed to listen on {channel}, will retry on reconnect: {e}")
+        if resync:
+            resync()
+
+    @staticmethod
+    def _listen(conn, channel):
+        with conn.cursor() as cursor:
+            cursor.execute(f'LISTEN "{channel}"')
+
+    @staticmethod
+    def _connect():
+        """ Opens the listening connection, listens on every channel and resyncs every subscriber. """
+        conn = DBManager.open()
+        conn.autocommit = True  # Notifications are only delivered outside a transaction
+        with Notifications._lock:
+            subscriptions = {channel: list(handlers) for channel, handlers in Notifications._subscriptions.items()}
+            for channel in subscriptions:
+                Notifications._listen(conn, channel)
+            Notifications._conn = conn
+        for handlers in subscriptions.values():
+            for _, resync in handlers:
+                if resync:
+                    resync()
+        return conn
+
+    @staticmethod
+    def _dispatch(notify):
+        with Notifications._lock:
+            handlers = list(Notifications._subscriptions.get(notify.channel, []))
+        for handler, _ in handlers:
+            try:
+                handler(notify.payload)
+            except Exception as e:  # A failing handler must not stop the listener
+                print(f"Notification handler for {notify.channel} failed: {e}")
+
+    @staticmethod
+    def _run():
+        conn = None
+        while not Notifications._stopped.is_set():
+            try:
+                if conn is None or conn.closed:
+                    conn = Notifications._connect()
+                if select.select([conn], [], [], Notifications.POLL_SECONDS) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    Notifications._dispatch(conn.notifies.pop(0))
+            except (psycopg2.Error, OSError) as e:
+                if Notifications._stopped.is_set():
+                    break
+                print(f"Notification listener lost its connection, reconnecting: {e}")
+                with Notifications._lock:
+                    Notifications._conn = None
+                if conn is not None and not conn.closed:
+                    conn.close()
+                conn = None
+                time.sleep(Notifications.RECONNECT_SECONDS)
+        if conn is not None and not conn.closed:
+            conn.close()
+
+    @staticmethod
+    def stop():
+        Notifications._stopped.set()
+        with Notifications._lock:
+            thread, Notifications._thread = Notifications._thread, None
+            conn, Notifications._conn = Notifications._conn, None
+        if conn is not None and not conn.closed:
+            conn.close()  # Wakes the listener out of select()
+        if thread is not None:
+            thread.join(timeout=Notifications.POLL_SECONDS + 1)
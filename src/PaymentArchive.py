@@ -0,0 +1,165 @@
+"""
+The PaymentArchive class manages the monthly partitions of the `payments` table. New partitions are
+created ahead of the payments that need them: the app and the archive job both create the current month
+and the next AHEAD_MONTHS at startup, so a payment never lands on a month without a partition. Partitions older than the retention period are
+detached, written to gzip-compressed CSV files and dropped, keeping the live table small so listings
+stay fast as the payment history grows. Archived months are recorded in `payment_archives` and can
+be restored back into the live table.
+
+Key Functionalities:
+- ensure_partition(day): Creates the monthly partition containing the given day if it does not exist yet.
+- ensure_upcoming(today): Creates the partitions for this month and the next AHEAD_MONTHS.
+- archive_before(cutoff): Moves every monthly partition that ends on or before the cutoff into a compressed file.
+- restore(partition_name): Loads an archived month back into a live partition.
+- archive_menu(): Interactive prompt used by the admin payment screen.
+"""
+
+import datetime
+import gzip
+import os
+import re
+
+import psycopg2
+
+from DatabaseManager import DBManager
+
+
+class PaymentArchive:
+    ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'archive')
+    RETENTION_MONTHS = 24
+    AHEAD_MONTHS = 3
+    PARTITION_PATTERN = re.compile(r'^payments_(\d{4})_(\d{2})$')
+
+    @staticmethod
+    def ensure_partition(day):
+        """ Creates the monthly partition containing day and returns its name. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT create_payment_partition(%s) AS partition_name", (day,))
+                partition_name = cursor.fetchone()['partition_name']
+                conn.commit()
+                return partition_name
+
+    @staticmethod
+    def ensure_upcoming(today=None):
+        """ Creates this month's partition and the next AHEAD_MONTHS; returns their names, or [] if the database could not be reached. """
+        try:
+            with DBManager.connection() as conn:
+                with conn.cursor() as cursor:
+                    names = []
+                    for months in range(PaymentArchive.AHEAD_MONTHS + 1):
+                        cursor.execute("SELECT create_payment_partition(%s) AS partition_name",
+                                       (PaymentArchive.months_ago(-months, today),))
+                        names.append(cursor.fetchone()['partition_name'])
+                    conn.commit()
+                    return names
+        except (psycopg2.Error, RuntimeError) as e:  # RuntimeError: DBManager could not connect
+            print(f"Failed to create the upcoming payment partitions: {e}")
+        return []
+
+    @staticmethod
+    def months_ago(months, today=None):
+        """ Returns the first day of the month that lies the given number of months before today. """
+        today = today or datetime.date.today()
+        month_index = today.year * 12 + today.month - 1 - months
+        return datetime.date(month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def live_partitions():
+        """ Returns (partition_name, range_start, range_end) for every monthly partition, oldest first. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute("""
+                    SELECT c.relname
+                    FROM pg_inherits i
+                    JOIN pg_class c ON c.oid = i.inhrelid
+                    WHERE i.inhparent = 'payments'::regclass
+                    ORDER BY c.relname
+                """)
+                partitions = []
+                for row in cursor.fetchall():
+                    match = PaymentArchive.PARTITION_PATTERN.match(row['relname'])
+                    if match:
+                        range_start = datetime.date(int(match.group(1)), int(match.group(2)), 1)
+                        range_end = PaymentArchive.months_ago(-1, range_start)
+                        partitions.append((row['relname'], range_start, range_end))
+                return partitions
+        return []
+
+    @staticmethod
+    def archive_before(cutoff):
+        """ Archives every monthly partition that ends on or before cutoff and returns the archived names. """
+        os.makedirs(PaymentArchive.ARCHIVE_DIR, exist_ok=True)
+        archived = []
+        for partition_name, range_start, range_end in PaymentArchive.live_partitions():
+            if range_end > cutoff:
+                continue
+            file_path = os.path.join(PaymentArchive.ARCHIVE_DIR, f"{partition_name}.csv.gz")
+            with DBManager.connection() as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        # Detach first so the month disappears from the live table atomically with the drop
+                        cursor.execute(f'ALTER TABLE payments DETACH PARTITION "{partition_name}"')
+                        with gzip.open(file_path, 'wt', encoding='utf-8', newline='') as archive_file:
+                            cursor.copy_expert(f'COPY "{partition_name}" TO STDOUT WITH (FORMAT csv, HEADER)', archive_file)
+                        cursor.execute(f'SELECT count(*) AS row_count FROM "{partition_name}"')
+                        row_count = cursor.fetchone()['row_count']
+                        cursor.execute("""
+                            INSERT INTO payment_archives (partition_name, range_start, range_end, row_count, file_path)
+                            VALUES (%s, %s, %s, %s, %s)
+                            ON CONFLICT (partition_name) DO UPDATE SET
+                            row_count = EXCLUDED.row_count, file_path = EXCLUDED.file_path, archived_at = now()
+                        """, (partition_name, range_start, range_end, row_count, file_path))
+                        cursor.execute(f'DROP TABLE "{partition_name}"')
+                        conn.commit()
+                        archived.append(partition_name)
+                    except (psycopg2.Error, OSError) as e:
+                        conn.rollback()
+                        print(f"Failed to archive {partition_name}: {e}")
+        return archived
+
+    @staticmethod
+    def restore(partition_name):
+        """ Loads an archived month back into the live payments table. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    cursor.execute("SELECT range_start, file_path FROM payment_archives WHERE partition_name = %s", (partition_name,))
+                    archive = cursor.fetchone()
+                    if not archive:
+                        print(f"No archive found for {partition_name}.")
+                        return False
+
+                    cursor.execute("SELECT create_payment_partition(%s)", (archive['range_start'],))
+                    with gzip.open(archive['file_path'], 'rt', encoding='utf-8', newline='') as archive_file:
+                        cursor.copy_expert(f'COPY "{partition_name}" FROM STDIN WITH (FORMAT csv, HEADER)', archive_file)
+                    cursor.execute("DELETE FROM payment_archives WHERE partition_name = %s", (partition_name,))
+                    conn.commit()
+                    return True
+                except (psycopg2.Error, OSError) as e:
+                    conn.rollback()
+                    print(f"Failed to restore {partition_name}: {e}")
+                    return False
+
+    @staticmethod
+    def archive_menu():
+        default_cutoff = PaymentArchive.months_ago(PaymentArchive.RETENTION_MONTHS)
+        cutoff_input = input(f"Archive payments before (YYYY-MM), or press Enter for {default_cutoff.strftime('%Y-%m')}: ").strip()
+        try:
+            cutoff = datetime.datetime.strptime(cutoff_input, '%Y-%m').date() if cutoff_input else default_cutoff
+        except ValueError:
+            print("Invalid month. Please use YYYY-MM format.")
+            return
+
+        archived = PaymentArchive.archive_before(cutoff)
+        if archived:
+            print(f"Archived {len(archived)} month(s) to {os.path.normpath(PaymentArchive.ARCHIVE_DIR)}: {', '.join(archived)}")
+        else:
+            print("No payment months old enough to archive.")
+        input("Press Enter to continue...")
+
+
+if __name__ == "__main__":
+    # Allows archiving to be scheduled from cron with the default retention period
+    print(PaymentArchive.ensure_upcoming())
+    print(PaymentArchive.archive_before(PaymentArchive.months_ago(PaymentArchive.RETENTION_MONTHS)))
@@ -0,0 +1,241 @@
+"""
+The PlanCheck class guards the query plans of every statement in the Queries registry. It seeds a large
+dataset inside a transaction, runs EXPLAIN ANALYZE on each registered statement with its sample
+parameters, and fails when a statement sequentially scans a big table it should reach through an index,
+goes over its cost or latency budget, or touches more payments partitions than it is allowed to.
+Everything runs in one transaction that is rolled back at the end, so the harness can be pointed at a
+development database without leaving anything behind.
+
+Run it after every schema change: `python PlanCheck.py` exits non-zero when any plan has regressed.
+
+Key Functionalities:
+- seed(cursor): Loads the large dataset (members and their profile rows, trainers, rooms, equipment, schedule, enrollments and payments).
+- check(cursor, query): Explains one statement and returns the plan figures and any budget violations.
+- run(): Seeds, checks every registered statement, prints a report and returns the failures.
+"""
+
+import sys
+
+import psycopg2
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries, SAMPLE_BARE_EMAIL
+
+
+class PlanCheck:
+    MEMBERS = 100000
+    TRAINERS = 2000
+    ROOMS = 500
+    EQUIPMENT = 20000
+    BOOKINGS = 20000
+    CLASSES = 20000
+    PAYMENT_MONTHS = ('2023-05-01', '2024-04-01')  # First and last seeded month, inclusive
+    PAYMENTS_PER_MONTH = 40000
+    WORKOUTS = 500000
+    # Tables big enough that a sequential scan over them is a regression unless the query is a listing
+    BIG_TABLES = {'member_accounts', 'exercise_routines', 'fitness_achievements', 'health_statistics', 'fitness_goals',
+                  'member_health_metrics', 'trainer_accounts', 'bookings', 'equipment', 'class_schedule', 'payments',
+                  'leaderboard_entries', 'workouts', 'workout_summaries', 'workout_weeks', 'workout_equipment',
+                  'equipment_usage_hourly', 'class_seats', 'class_waitlist', 'member_badges', 'visits', 'day_passes'}
+    ANALYZED_TABLES = BIG_TABLES | {'rooms', 'achievement_catalog', 'leaderboard_score_counts'}
+
+    @staticmethod
+    def seed(cursor):
+        """ Loads the large dataset. Ids continue after the existing rows, so sample data is left untouched. """
+        cursor.execute("""
+            SELECT (SELECT COALESCE(MAX(trainer_id), 0) FROM trainer_accounts) AS trainer_base,
+                   (SELECT COALESCE(MAX(room_id), 0) FROM rooms) AS room_base,
+                   (SELECT COALESCE(MAX(equipment_id), 0) FROM equipment) AS equipment_base,
+                   (SELECT COALESCE(MAX(booking_id), 0) FROM bookings) AS booking_base,
+                   (SELECT COALESCE(MAX(class_id), 0) FROM class_schedule) AS class_base
+        """)
+        params = dict(cursor.fetchone())
+        params.update(members=PlanCheck.MEMBERS, trainers=PlanCheck.TRAINERS, rooms=PlanCheck.ROOMS,
+                      equipment=PlanCheck.EQUIPMENT, bookings=PlanCheck.BOOKINGS, classes=PlanCheck.CLASSES,
+                      first_month=PlanCheck.PAYMENT_MONTHS[0], last_month=PlanCheck.PAYMENT_MONTHS[1],
+                      payments=PlanCheck.PAYMENTS_PER_MONTH, workouts=PlanCheck.WORKOUTS, bare_email=SAMPLE_BARE_EMAIL)
+
+        cursor.execute("""
+            INSERT INTO member_accounts (email, name, password, gender, age)
+            SELECT 'plan.member.' || g || '@example.com', 'Plan Member ' || g, '',
+                   (ARRAY['Female', 'Male', 'Other'])[1 + g %% 3], 18 + g %% 60
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO member_accounts (email, name, password) VALUES (%(bare_email)s, 'Plan Member Bare', '');
+
+            INSERT INTO health_statistics (email, fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured)
+            SELECT 'plan.member.' || g || '@example.com', 1 + g %% 10, 1 + (g * 3) %% 10, 1 + (g * 7) %% 10,
+                   1 + (g * 9) %% 10, g %% 11, g %% 2 = 0, g %% 3 = 0, g %% 50 = 0
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO fitness_goals (email, goal1, goal2, goal3)
+            SELECT 'plan.member.' || g || '@example.com', 'Lose Weight', 'Gain Muscle', NULL
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO exercise_routines (email, routine1, routine2, routine3)
+            SELECT 'plan.member.' || g || '@example.com', 'Core Chaos', 'Leg Day', NULL
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO member_health_metrics (email, height, weight, body_fat_percentage, resting_heart_rate)
+            SELECT 'plan.member.' || g || '@example.com', 150 + g %% 50, 50 + g %% 60, 10 + g %% 25, 50 + g %% 40
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO member_badges (badge_hash, email, revoked_at)
+            SELECT encode(sha256(convert_to('plan-badge-' || g, 'UTF8')), 'hex'), 'plan.member.' || g || '@example.com',
+                   CASE WHEN g %% 10 = 0 THEN now() END
+            FROM generate_series(1, %(members)s) g;
+
+            INSERT INTO visits (email, checked_in_at)
+            SELECT 'plan.member.' || (1 + g %% %(members)s) || '@example.com', TIMESTAMP '2024-01-01' + g * INTERVAL '30 seconds'
+            FROM generate_series(1, %(workouts)s) g;
+
+            -- A month of sold passes has expired and waits for the purge job; the rest are still valid
+            INSERT INTO day_passes (issued_at, expires_at)
+            SELECT now() - INTERVAL '31 days' + g * INTERVAL '1 minute', now() - INTERVAL '30 days' + g * INTERVAL '1 minute'
+            FROM generate_series(1, %(members)s) g;
+
+            -- Achievements 0-5 are common, achievement 6 is held by one member in 500
+            INSERT INTO fitness_achievements (email, bits)
+            SELECT 'plan.member.' || g || '@example.com', (g %% 64) | CASE WHEN g %% 500 = 0 THEN 64 ELSE 0 END
+            FROM generate_series(1, %(members)s) g;
+
+            -- Trainers work opening hours on a spread of days; one in 200 also covers late Sunday (slot 167)
+            INSERT INTO trainer_accounts (trainer_id, name, password, availability)
+            SELECT %(trainer_base)s + g, 'Plan Trainer ' || g, '',
+                   availability_mask(array_remove(ARRAY[
+                       CASE WHEN g %% 2 = 0 THEN 'Mon' END, CASE WHEN g %% 3 = 0 THEN 'Tue' END,
+                       CASE WHEN g %% 2 = 1 THEN 'Wed' END, CASE WHEN g %% 3 = 1 THEN 'Thu' END,
+                       CASE WHEN g %% 4 = 0 THEN 'Fri' END, CASE WHEN g %% 5 = 0 THEN 'Sat' END,
+                       CASE WHEN g %% 7 = 0 THEN 'Sun' END], NULL), 6, 22)
+                   | CASE WHEN g %% 200 = 0 THEN availability_mask('{Sun}', 23, 24) ELSE B'0'::BIT(168) END
+            FROM generate_series(1, %(trainers)s) g;
+
+            INSERT INTO rooms (room_id, room_name, capacity)
+            SELECT %(room_base)s + g, 'Plan Room ' || g, CASE WHEN g %% 4 <> 0 THEN 10 + g %% 30 ELSE 0 END
+            FROM generate_series(1, %(rooms)s) g;
+
+            INSERT INTO equipment (equipment_id, equipment_name, room_id, quality)
+            SELECT %(equipment_base)s + g, 'Plan Equipment ' || g, %(room_base)s + 1 + g %% %(rooms)s, 1 + g %% 10
+            FROM generate_series(1, %(equipment)s) g;
+
+            INSERT INTO workouts (email, equipment_id, performed_at, strength_delta, stamina_delta)
+            SELECT 'plan.member.' || (1 + g %% %(members)s) || '@example.com', %(equipment_base)s + 1 + g %% %(equipment)s,
+                   TIMESTAMP '2024-01-01' + g * INTERVAL '1 minute', g %% 2, -2
+            FROM generate_series(1, %(workouts)s) g;
+
+            INSERT INTO equipment_usage_hourly (equipment_id, bucket_start, uses, wear)
+            SELECT %(equipment_base)s + 1 + g %% %(equipment)s, TIMESTAMP '2024-04-01' + (g / %(equipment)s) * INTERVAL '29 hours', 1 + g %% 5, 2
+            FROM generate_series(0, %(workouts)s - 1) g;
+
+            -- Sessions i = 0, 1, ... (bookings first, then classes) take hour slot i / rooms of room i %% rooms, and
+            -- a trainer's sessions are rooms / trainers slots apart, so nothing overlaps (see the exclusion constraints)
+            INSERT INTO bookings (booking_id, trainer_id, room_id, duration, day_of_week, start_time)
+            SELECT %(booking_base)s + g, %(trainer_base)s + 1 + i %% %(trainers)s, %(room_base)s + 1 + i %% %(rooms)s,
+                   30 + 10 * (g %% 4), (ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])[1 + (i / %(rooms)s) %% 7],
+                   make_time(6 + (i / %(rooms)s) / 7, 0, 0)
+            FROM generate_series(1, %(bookings)s) g, LATERAL (SELECT g - 1 AS i) s;
+
+            INSERT INTO class_schedule (class_id, class_name, trainer_id, room_id, day_of_week, start_time, duration)
+            SELECT %(class_base)s + g, 'Plan Class ' || g, %(trainer_base)s + 1 + i %% %(trainers)s,
+                   %(room_base)s + 1 + i %% %(rooms)s, (ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])[1 + (i / %(rooms)s) %% 7],
+                   make_time(6 + (i / %(rooms)s) / 7, 30, 0), 30
+            FROM generate_series(1, %(classes)s) g, LATERAL (SELECT %(bookings)s + g - 1 AS i) s;
+
+            -- The insert created 20 seats per class; half are taken, and every tenth class is full with five waiting
+            UPDATE class_seats
+            SET email = 'plan.member.' || (1 + (class_id * 20 + seat_no) %% %(members)s) || '@example.com', enrolled_at = now()
+            WHERE class_id > %(class_base)s AND (seat_no <= 10 OR class_id %% 10 = 0);
+
+            INSERT INTO class_waitlist (class_id, email)
+            SELECT class_id, 'plan.member.' || (1 + (class_id * 20 + 20 + w) %% %(members)s) || '@example.com'
+            FROM class_schedule, generate_series(1, 5) w
+            WHERE class_id > %(class_base)s AND class_id %% 10 = 0
+            ORDER BY class_id, w;
+
+            SELECT create_payment_partition(m::DATE)
+            FROM generate_series(%(first_month)s::DATE, %(last_month)s::DATE, INTERVAL '1 month') m;
+
+            INSERT INTO payments (email, amount, payment_date, payment_type, status)
+            SELECT 'plan.member.' || (1 + g %% %(members)s) || '@example.com', 50.00,
+                   m::DATE + (g %% 28), 'Monthly Membership', (ARRAY['Pending', 'Completed', 'Refunded'])[1 + g %% 3]
+            FROM generate_series(%(first_month)s::DATE, %(last_month)s::DATE, INTERVAL '1 month') m,
+                 generate_series(1, %(payments)s) g;
+        """, params)
+
+        for table in sorted(PlanCheck.ANALYZED_TABLES):
+            cursor.execute(f"ANALYZE {table}")
+
+    @staticmethod
+    def walk(plan):
+        """ Yields every node of a plan tree. """
+        yield plan
+        for child in plan.get('Plans', []):
+            yield from PlanCheck.walk(child)
+
+    @staticmethod
+    def check(cursor, query):
+        """ Returns (cost, milliseconds, problems) for one statement; the statement's effects are rolled back. """
+        cursor.execute("SAVEPOINT plan_check")
+        try:
+            # The first run warms the cache so the timed run measures the plan, not the disk
+            for _ in range(2):
+                cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query.runnable(), query.sample or None)
+                result = cursor.fetchone()['QUERY PLAN'][0]
+                cursor.execute("ROLLBACK TO SAVEPOINT plan_check")
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT plan_check")
+            return None, None, [f"could not be explained: {(e.pgerror or str(e)).strip()}"]
+
+        plan = result['Plan']
+        cost, ms = plan['Total Cost'], result['Execution Time']
+        problems = []
+        partitions = set()
+        for node in PlanCheck.walk(plan):
+            relation = node.get('Relation Name')
+            if not relation:
+                continue
+            table = 'payments' if relation.startswith('payments_') else relation
+            if table == 'payments':
+                partitions.add(relation)
+            if node['Node Type'] == 'Seq Scan' and table in PlanCheck.BIG_TABLES and not query.full_scan:
+                problems.append(f"sequential scan on {relation}")
+        if query.max_cost is not None and cost > query.max_cost:
+            problems.append(f"cost {cost:.0f} over budget {query.max_cost:.0f}")
+        if query.max_ms is not None and ms > query.max_ms:
+            problems.append(f"{ms:.1f} ms over budget {query.max_ms:.1f} ms")
+        if query.max_partitions is not None and len(partitions) > query.max_partitions:
+            problems.append(f"touches {len(partitions)} payments partitions, allowed {query.max_partitions}")
+        return cost, ms, problems
+
+    @staticmethod
+    def run():
+        """ Checks every registered statement against the seeded dataset and returns {name: problems} for the failures, or None if the database could not be reached. """
+        failures = None
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                failures = {}
+                try:
+                    print("Seeding plan check dataset...")
+                    PlanCheck.seed(cursor)
+                    for query in Queries.all():
+                        if not query.check:
+                            print(f"{'SKIP':<5} {query.name}")
+                            continue
+                        cost, ms, problems = PlanCheck.check(cursor, query)
+                        figures = f"cost {cost:>10.1f}  {ms:>8.2f} ms" if cost is not None else ''
+                        print(f"{'FAIL' if problems else 'OK':<5} {query.name:<32} {figures}")
+                        for problem in problems:
+                            print(f"      - {problem}")
+                        if problems:
+                            failures[query.name] = problems
+                finally:
+                    conn.rollback()  # Nothing seeded or modified is kept
+        return failures
+
+
+if __name__ == "__main__":
+    failed = PlanCheck.run()
+    if failed is None:
+        sys.exit(2)
+    print(f"\n{len(failed)} statement(s) failed their plan budgets." if failed else "\nAll query plans within budget.")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,809 @@
+"""
+The Queries class is the registry of every SQL statement the app runs. Statements live here instead of
+as string literals scattered through the screens, so PlanCheck can EXPLAIN each one against a large
+seeded dataset and catch plans that regress when the schema changes.
+
+Each entry is a Query: a str subclass holding the SQL, so it is passed straight to cursor.execute(),
+plus the metadata PlanCheck needs:
+- sample: parameters that make the statement runnable against the seeded dataset.
+- expand: values for {placeholders} in statements whose column names are chosen at runtime.
+- full_scan: the statement reads a whole table by design (listings, reports), so sequential scans are expected.
+- max_cost / max_ms: the planner cost and execution time budgets the statement must stay within.
+- max_partitions: how many payments partitions the statement may touch, for statements that must be pruned.
+- check: False for statements PlanCheck cannot run (batch templates, legacy tables).
+
+Key Functionalities:
+- Query: A registered SQL statement.
+- Queries: The registry, grouped by the screens that use each statement.
+- Queries.all(): Every registered statement in declaration order.
+"""
+
+import datetime
+import hashlib
+
+SAMPLE_EMAIL = 'plan.member.1@example.com'  # Seeded by PlanCheck with every per-member row
+SAMPLE_BARE_EMAIL = 'plan.member.bare@example.com'  # Seeded by PlanCheck with an account row only
+SAMPLE_NEW_EMAIL = 'plan.member.new@example.com'  # Not seeded
+SAMPLE_ID = 1
+SAMPLE_ACHIEVEMENT = 6  # Held by one seeded member in 500
+SAMPLE_MISSING_ID = 2000000000
+SAMPLE_MONTH = (datetime.date(2024, 4, 1), datetime.date(2024, 5, 1))
+SAMPLE_BADGE_HASH = hashlib.sha256(b'plan-badge-1').hexdigest()  # The badge PlanCheck seeds for SAMPLE_EMAIL
+
+REGISTRY = {}
+
+
+class Query(str):
+    DEFAULT_MAX_COST = 100.0
+    DEFAULT_MAX_MS = 5.0
+
+    def __new__(cls, sql, sample=(), expand=None, full_scan=False, max_cost=None, max_ms=None, max_partitions=None, check=True):
+        query = super().__new__(cls, sql)
+        query.name = None
+        query.sample = sample
+        query.expand = expand or {}
+        query.full_scan = full_scan
+        query.max_cost = max_cost if max_cost is not None else (None if full_scan else Query.DEFAULT_MAX_COST)
+        query.max_ms = max_ms if max_ms is not None else (None if full_scan else Query.DEFAULT_MAX_MS)
+        query.max_partitions = max_partitions
+        query.check = check
+        return query
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        REGISTRY[name] = self
+
+    def runnable(self):
+        """ Returns the SQL with any runtime placeholders filled with their sample values. """
+        return str(self).format(**self.expand) if self.expand else str(self)
+
+
+# All scheduled sessions (room bookings and classes) as minute offsets within their day
+SESSIONS_CTE = """
+    sessions AS (
+        SELECT trainer_id, room_id, day_of_week,
+               (EXTRACT(EPOCH FROM start_time) / 60)::INT AS start_minute,
+               LEAST((EXTRACT(EPOCH FROM start_time) / 60)::INT + COALESCE(duration, 0), 1440) AS end_minute
+        FROM bookings
+        UNION ALL
+        SELECT trainer_id, room_id, day_of_week,
+               (EXTRACT(EPOCH FROM start_time) / 60)::INT,
+               LEAST((EXTRACT(EPOCH FROM start_time) / 60)::INT + COALESCE(duration, 0), 1440)
+        FROM class_schedule
+    )
+"""
+
+# Overlapping sessions in the same room are merged into islands so occupied minutes are not double counted
+MERGED_CTE = SESSIONS_CTE + """,
+    ordered AS (
+        SELECT room_id, day_of_week, start_minute, end_minute,
+               MAX(end_minute) OVER (
+                   PARTITION BY room_id, day_of_week ORDER BY start_minute, end_minute
+                   ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+               ) AS previous_end
+        FROM sessions
+        WHERE end_minute > start_minute
+    ),
+    islands AS (
+        SELECT room_id, day_of_week, start_minute, end_minute,
+               SUM(CASE WHEN previous_end >= start_minute THEN 0 ELSE 1 END) OVER (
+                   PARTITION BY room_id, day_of_week ORDER BY start_minute, end_minute
+               ) AS island
+        FROM ordered
+    ),
+    merged AS (
+        SELECT room_id, day_of_week, MIN(start_minute) AS start_minute, MAX(end_minute) AS end_minute
+        FROM islands
+        GROUP BY room_id, day_of_week, island
+    )
+"""
+
+# Per-item forecast of when equipment drops below the danger quality, from its recent usage and wear rates
+FORECAST_CTE = """
+    usage AS (
+        SELECT equipment_id, SUM(uses) AS uses, SUM(wear) AS wear
+        FROM equipment_usage_hourly
+        WHERE bucket_start >= %(since)s
+        GROUP BY equipment_id
+    ),
+    rates AS (
+        SELECT e.equipment_id, e.equipment_name, e.room_id, r.room_name, e.quality,
+               COALESCE(u.uses, 0)::NUMERIC / %(history_days)s AS uses_per_day,
+               COALESCE(NULLIF(u.wear, 0)::NUMERIC / NULLIF(u.uses, 0), %(wear_per_use)s) AS wear_per_use
+        FROM equipment e
+        JOIN rooms r ON r.room_id = e.room_id
+        LEFT JOIN usage u ON u.equipment_id = e.equipment_id
+    ),
+    forecast AS (
+        SELECT *,
+               CASE WHEN quality < %(danger)s THEN 0
+                    ELSE FLOOR((quality - %(danger)s) / wear_per_use)::INT + 1 END AS uses_left
+        FROM rates
+    ),
+    due AS (
+        SELECT *,
+               CASE WHEN uses_left = 0 THEN %(today)s::DATE
+                    WHEN uses_per_day > 0 THEN %(today)s::DATE + FLOOR(uses_left / uses_per_day)::INT END AS due_date
+        FROM forecast
+    )
+"""
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+SAMPLE_FORECAST = {'since': datetime.date(2024, 4, 1), 'history_days': 28, 'wear_per_use': 2, 'danger': 3,
+                   'today': datetime.date(2024, 4, 29), 'horizon_days': 14, 'lead_days': 1}
+
+
+class Queries:
+    # Accounts and log in
+    ADMIN_PASSWORD = Query("SELECT password FROM member_accounts WHERE email = 'admin'")
+    ADMIN_INSERT_PASSWORD = Query("INSERT INTO admin (password) VALUES (%s)", check=False)  # Legacy admin table
+    MEMBER_PASSWORD = Query("SELECT password FROM member_accounts WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    MEMBER_INSERT = Query(
+        "INSERT INTO member_accounts (email, password, name) VALUES (%s, %s, %s)",
+        sample=(SAMPLE_NEW_EMAIL, '', 'Plan Member'))
+    TRAINER_PASSWORD = Query("SELECT password FROM trainer_accounts WHERE trainer_id = %s", sample=(SAMPLE_ID,))
+
+    # Check-in
+    BADGES_ACTIVE = Query("""
+        SELECT b.badge_hash, b.email, m.name
+        FROM member_badges b
+        JOIN member_accounts m ON m.email = b.email
+        WHERE b.revoked_at IS NULL
+    """, full_scan=True)  # Loads every badge into memory once per process
+    BADGE_MEMBER = Query("""
+        SELECT b.badge_hash, b.email, m.name
+        FROM member_badges b
+        JOIN member_accounts m ON m.email = b.email
+        WHERE b.badge_hash = %s AND b.revoked_at IS NULL
+    """, sample=(SAMPLE_BADGE_HASH,))
+    BADGE_REVOKE = Query("""
+        UPDATE member_badges
+        SET revoked_at = now()
+        WHERE email = %s AND revoked_at IS NULL
+    """, sample=(SAMPLE_EMAIL,))
+    BADGE_INSERT = Query("INSERT INTO member_badges (badge_hash, email) VALUES (%s, %s)", sample=('0' * 64, SAMPLE_BARE_EMAIL))
+    VISIT_INSERT = Query("INSERT INTO visits (email, checked_in_at) VALUES %s", check=False)  # execute_values template
+    MEMBER_VISITS_SINCE = Query("""
+        SELECT COUNT(*) AS visits, MAX(checked_in_at) AS last_visit
+        FROM visits
+        WHERE email = %s AND checked_in_at >= %s
+    """, sample=(SAMPLE_EMAIL, datetime.date(2024, 4, 1)))
+
+    # Day passes
+    DAY_PASS_INSERT = Query(
+        "INSERT INTO day_passes (expires_at) VALUES (%s) RETURNING pass_id",
+        sample=(datetime.datetime(2024, 4, 2, 12, 0, tzinfo=datetime.timezone.utc),))
+    DAY_PASS_VALID = Query("""
+        SELECT expires_at
+        FROM day_passes
+        WHERE pass_id = %s AND expires_at > now()
+    """, sample=(SAMPLE_ID,))
+    DAY_PASS_PURGE = Query("""
+        DELETE FROM day_passes
+        WHERE pass_id IN (
+            SELECT pass_id
+            FROM day_passes
+            WHERE expires_at < now()
+            ORDER BY expires_at
+            LIMIT %s
+        )
+    """, sample=(1000,), max_cost=5000, max_ms=50)  # One batch of the purge job, read from the expires_at index
+
+    # Member profile
+    MEMBER_NAME = Query("SELECT name FROM member_accounts WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    MEMBER_PERSONAL_INFO = Query("SELECT name, gender, age FROM member_accounts WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    MEMBER_PROFILE = Query("SELECT email, name, gender, age FROM member_accounts WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    MEMBER_UPDATE_PERSONAL_INFO = Query("""
+        UPDATE member_accounts
+        SET name = %s, gender = %s, age = %s
+        WHERE email = %s
+    """, sample=('Plan Member', 'Other', 30, SAMPLE_EMAIL))
+    MEMBERS_NAME_LIKE = Query(
+        "SELECT email, name FROM member_accounts WHERE name ILIKE %s",
+        sample=('%Plan%',), full_scan=True)  # Substring search cannot use a btree index
+    FITNESS_GOALS_BY_EMAIL = Query("SELECT goal1, goal2, goal3 FROM fitness_goals WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    FITNESS_GOALS_UPSERT = Query("""
+        INSERT INTO fitness_goals (email, goal1, goal2, goal3)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (email) DO UPDATE SET
+        goal1 = EXCLUDED.goal1, goal2 = EXCLUDED.goal2, goal3 = EXCLUDED.goal3
+    """, sample=(SAMPLE_EMAIL, 'Goal', None, None))
+    HEALTH_METRICS_BY_EMAIL = Query(
+        "SELECT height, weight, body_fat_percentage, resting_heart_rate FROM member_health_metrics WHERE email = %s",
+        sample=(SAMPLE_EMAIL,))
+    HEALTH_METRICS_UPSERT = Query("""
+        INSERT INTO member_health_metrics (email, height, weight, body_fat_percentage, resting_heart_rate)
+        VALUES (%s, %s, %s, %s, %s)
+        ON CONFLICT (email) DO UPDATE SET
+        height = EXCLUDED.height, weight = EXCLUDED.weight, body_fat_percentage = EXCLUDED.body_fat_percentage, resting_heart_rate = EXCLUDED.resting_heart_rate
+    """, sample=(SAMPLE_EMAIL, 180, 80, 15, 60))
+    ROUTINES_BY_EMAIL = Query("SELECT routine1, routine2, routine3 FROM exercise_routines WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    ROUTINES_UPSERT = Query("""
+        INSERT INTO exercise_routines (email, routine1, routine2, routine3)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (email) DO UPDATE SET
+        routine1 = EXCLUDED.routine1, routine2 = EXCLUDED.routine2, routine3 = EXCLUDED.routine3
+    """, sample=(SAMPLE_EMAIL, 'Core Chaos', None, None))
+    GOALS_DETAILS_BY_EMAIL = Query("SELECT * FROM fitness_goals WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    ROUTINES_DETAILS_BY_EMAIL = Query("SELECT * FROM exercise_routines WHERE email = %s", sample=(SAMPLE_EMAIL,))
+
+    # Achievements
+    ACHIEVEMENT_CATALOG = Query("SELECT achievement_id, name FROM achievement_catalog ORDER BY achievement_id")
+    ACHIEVEMENT_CATALOG_ADD = Query("""
+        INSERT INTO achievement_catalog (achievement_id, name)
+        SELECT COALESCE(MAX(achievement_id) + 1, 0), %s FROM achievement_catalog
+        RETURNING achievement_id
+    """, sample=('Plan Achievement',))
+    ACHIEVEMENTS_BY_EMAIL = Query("""
+        SELECT c.achievement_id, c.name, COALESCE(a.bits & (1::BIGINT << c.achievement_id) <> 0, FALSE) AS earned
+        FROM achievement_catalog c
+        LEFT JOIN fitness_achievements a ON a.email = %s
+        ORDER BY c.achievement_id
+    """, sample=(SAMPLE_EMAIL,))
+    ACHIEVEMENT_GRANT = Query("""
+        INSERT INTO fitness_achievements (email, bits)
+        VALUES (%s, 1::BIGINT << %s)
+        ON CONFLICT (email) DO UPDATE SET bits = fitness_achievements.bits | EXCLUDED.bits
+    """, sample=(SAMPLE_EMAIL, SAMPLE_ACHIEVEMENT))
+    ACHIEVEMENT_GRANT_BY_STAT = Query("""
+        INSERT INTO fitness_achievements (email, bits)
+        SELECT email, 1::BIGINT << %s FROM health_statistics WHERE {stat} >= %s
+        ON CONFLICT (email) DO UPDATE SET bits = fitness_achievements.bits | EXCLUDED.bits
+        WHERE fitness_achievements.bits & EXCLUDED.bits = 0
+    """, sample=(SAMPLE_ACHIEVEMENT, 10), expand={'stat': 'strength'}, full_scan=True)  # One pass over every member's stats
+    ACHIEVEMENT_HOLDERS = Query("""
+        SELECT m.email, m.name
+        FROM fitness_achievements a
+        JOIN member_accounts m ON m.email = a.email
+        WHERE achievement_ids(a.bits) @> ARRAY[%s]::INT[]
+        ORDER BY m.name
+    """, sample=(SAMPLE_ACHIEVEMENT,), max_cost=5000, max_ms=50)  # Resolved through the GIN index on achievement_ids(bits)
+
+    # Health statistics
+    HEALTH_STATS_BY_EMAIL = Query("""
+        SELECT email, fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured
+        FROM health_statistics
+        WHERE email = %s
+    """, sample=(SAMPLE_EMAIL,))
+    HEALTH_STATS_FOR_WORKOUT = Query(
+        "SELECT fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured FROM health_statistics WHERE email = %s",
+        sample=(SAMPLE_EMAIL,))
+    HEALTH_STATS_INSERT = Query("""
+        INSERT INTO health_statistics
+        (email, fitness_level, strength, flexibility, endurance, stamina, has_water, has_protein, is_injured)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """, sample=(SAMPLE_BARE_EMAIL, 1, 1, 1, 1, 1, False, False, False))
+    HEALTH_STATS_UPDATE_CHANGED = Query(
+        "UPDATE health_statistics SET {assignments} WHERE email = %s",
+        sample=(5, SAMPLE_EMAIL), expand={'assignments': 'strength = %s'})  # Only the fields edited on the screen
+    HEALTH_STAT_UPDATE = Query(
+        "UPDATE health_statistics SET {stat} = %s WHERE email = %s",
+        sample=(5, SAMPLE_EMAIL), expand={'stat': 'strength'})
+    STAMINA_UPDATE = Query("UPDATE health_statistics SET stamina = %s WHERE email = %s", sample=(5, SAMPLE_EMAIL))
+    # The penalty, floor and stamina come from WorkoutRules, as WorkoutRules.injury() applies them to guests
+    INJURY_UPDATE = Query("""
+        UPDATE health_statistics h
+        SET is_injured = TRUE,
+            fitness_level = GREATEST(%(min_stat)s, h.fitness_level - %(penalty)s),
+            strength = GREATEST(%(min_stat)s, h.strength - %(penalty)s),
+            flexibility = GREATEST(%(min_stat)s, h.flexibility - %(penalty)s),
+            endurance = GREATEST(%(min_stat)s, h.endurance - %(penalty)s),
+            stamina = %(stamina)s
+        FROM (SELECT email, fitness_level, strength, flexibility, endurance, stamina
+              FROM health_statistics WHERE email = %(email)s FOR UPDATE) old
+        WHERE h.email = old.email
+        RETURNING h.fitness_level - old.fitness_level AS fitness_level_delta, h.strength - old.strength AS strength_delta,
+                  h.flexibility - old.flexibility AS flexibility_delta, h.endurance - old.endurance AS endurance_delta,
+                  h.stamina - old.stamina AS stamina_delta
+    """, sample={'min_stat': 1, 'penalty': 1, 'stamina': 0, 'email': SAMPLE_EMAIL})
+    # One chunk of the recovery job: the next members by email, skipping rows a workout has locked (they are
+    # caught on the next run). Stamina comes back per_hour points an hour and the leftover part of an hour is
+    # kept in stamina_updated_at; injuries heal after heal_hours, less for fitter members.
+    RECOVERY_CHUNK = Query("""
+        WITH chunk AS (
+            SELECT email
+            FROM health_statistics
+            WHERE email > %(after)s
+            ORDER BY email
+            LIMIT %(chunk)s
+        ),
+        due AS (
+            SELECT h.email, rate.per_hour,
+                   LEAST(FLOOR(EXTRACT(EPOCH FROM now() - h.stamina_updated_at) / 3600 * rate.per_hour)::INT,
+                         %(max_stamina)s - COALESCE(h.stamina, 0)) AS gained,
+                   COALESCE(h.is_injured AND h.injured_at <= now() - make_interval(
+                       hours => GREATEST(%(min_heal_hours)s, %(heal_hours)s - %(heal_hours_per_level)s * COALESCE(h.fitness_level, 1))),
+                       FALSE) AS heals
+            FROM health_statistics h
+            JOIN chunk c ON c.email = h.email
+            CROSS JOIN LATERAL (
+                SELECT %(base_per_hour)s + %(per_hour_per_level)s * COALESCE(h.fitness_level, 1) AS per_hour
+            ) rate
+            FOR UPDATE OF h SKIP LOCKED
+        ),
+        recovered AS (
+            UPDATE health_statistics h
+            SET stamina = COALESCE(h.stamina, 0) + GREATEST(d.gained, 0),
+                stamina_updated_at = CASE
+                    WHEN d.gained <= 0 THEN h.stamina_updated_at
+                    WHEN COALESCE(h.stamina, 0) + d.gained >= %(max_stamina)s THEN now()
+                    ELSE h.stamina_updated_at + make_interval(secs => d.gained * 3600 / d.per_hour) END,
+                is_injured = h.is_injured AND NOT d.heals
+            FROM due d
+            WHERE h.email = d.email AND (d.gained > 0 OR d.heals)
+            RETURNING GREATEST(d.gained, 0) AS gained, d.heals
+        )
+        SELECT (SELECT MAX(email) FROM chunk) AS last_email,
+               (SELECT COUNT(*) FROM chunk) AS scanned,
+               COUNT(*) AS updated,
+               COALESCE(SUM(gained), 0) AS stamina_restored,
+               COUNT(*) FILTER (WHERE heals) AS healed
+        FROM recovered
+    """, sample={'after': '', 'chunk': 5000, 'max_stamina': 10, 'base_per_hour': 0.5, 'per_hour_per_level': 0.1,
+                 'heal_hours': 48, 'heal_hours_per_level': 3, 'min_heal_hours': 12},
+        max_cost=50000, max_ms=500)  # One chunk, an index range scan on the primary key
+
+    # Workout simulation (loaded once per simulated club)
+    SIMULATION_MEMBERS = Query("""
+        SELECT COALESCE(fitness_level, 1) AS fitness_level, COALESCE(strength, 1) AS strength,
+               COALESCE(flexibility, 1) AS flexibility, COALESCE(endurance, 1) AS endurance, COALESCE(stamina, 0) AS stamina
+        FROM health_statistics
+    """, full_scan=True)
+    SIMULATION_EQUIPMENT = Query("SELECT quality FROM equipment", full_scan=True)
+
+    # Workout history
+    WORKOUTS_INSERT = Query("""
+        INSERT INTO workouts (email, equipment_id, performed_at, fitness_level_delta, strength_delta,
+                              flexibility_delta, endurance_delta, stamina_delta, injured)
+        VALUES %s
+    """, check=False)  # execute_values template
+    WORKOUT_SUMMARY_BY_EMAIL = Query("SELECT * FROM workout_summaries WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    WORKOUT_WEEKS_BY_EMAIL = Query("""
+        SELECT week_start, sessions
+        FROM workout_weeks
+        WHERE email = %s
+        ORDER BY week_start DESC
+        LIMIT %s
+    """, sample=(SAMPLE_EMAIL, 8))
+    WORKOUT_FAVOURITE_EQUIPMENT = Query("""
+        SELECT e.equipment_name, w.uses
+        FROM workout_equipment w
+        JOIN equipment e ON e.equipment_id = w.equipment_id
+        WHERE w.email = %s
+        ORDER BY w.uses DESC
+        LIMIT %s
+    """, sample=(SAMPLE_EMAIL, 3))
+
+    # Leaderboards
+    LEADERBOARD_PAGE = Query("""
+        SELECT e.email, m.name, e.score
+        FROM leaderboard_entries e
+        JOIN member_accounts m ON m.email = e.email
+        WHERE e.stat = %s AND e.cohort = %s AND (e.score, e.email) < (%s, %s)
+        ORDER BY e.score DESC, e.email DESC
+        LIMIT %s
+    """, sample=('strength', 'all', 11, '', 10))
+    # Members with the same score share a position; both numbers come from the per-score counts
+    LEADERBOARD_POSITION = Query("""
+        SELECT mine.score,
+               1 + COALESCE((SELECT SUM(c.entries) FROM leaderboard_score_counts c
+                             WHERE c.stat = mine.stat AND c.cohort = mine.cohort AND c.score > mine.score), 0) AS position,
+               (SELECT c.entries FROM leaderboard_score_counts c
+                WHERE c.stat = mine.stat AND c.cohort = mine.cohort AND c.score = mine.score) - 1 AS tied
+        FROM leaderboard_entries mine
+        WHERE mine.stat = %s AND mine.cohort = %s AND mine.email = %s
+    """, sample=('strength', 'all', SAMPLE_EMAIL), max_cost=100, max_ms=50)
+    LEADERBOARD_COHORTS = Query(
+        "SELECT DISTINCT cohort FROM leaderboard_entries WHERE email = %s ORDER BY cohort",
+        sample=(SAMPLE_EMAIL,))
+
+    # Gym floor
+    ROOMS_CAPACITY = Query("SELECT room_id, capacity FROM rooms ORDER BY room_id", full_scan=True)
+    ROOM_OCCUPANCY_UPSERT = Query("""
+        INSERT INTO room_occupancy AS o (instance_id, room_id, occupants)
+        VALUES %s
+        ON CONFLICT (instance_id, room_id) DO UPDATE SET
+        occupants = o.occupants + EXCLUDED.occupants, updated_at = now()
+    """, check=False)  # execute_values template
+    ROOM_OCCUPANCY_OTHERS = Query("""
+        SELECT room_id, SUM(occupants) AS occupants
+        FROM room_occupancy
+        WHERE instance_id <> %s AND updated_at > now() - %s * INTERVAL '1 second'
+        GROUP BY room_id
+    """, sample=('plan-check', 600))
+    ROOM_OCCUPANCY_PURGE = Query("""
+        DELETE FROM room_occupancy
+        WHERE updated_at < now() - %s * INTERVAL '1 second'
+    """, sample=(600,))
+    EQUIPMENT_IN_ROOM = Query("""
+        SELECT equipment_id, equipment_name, quality
+        FROM equipment
+        WHERE room_id = %s AND quality > 0
+        ORDER BY equipment_id
+    """, sample=(SAMPLE_ID,), max_cost=500)
+    EQUIPMENT_QUALITY = Query("SELECT quality FROM equipment WHERE equipment_id = %s", sample=(SAMPLE_ID,))
+    EQUIPMENT_USE = Query("""
+        UPDATE equipment e
+        SET quality = GREATEST(1, e.quality - %s)
+        FROM (SELECT equipment_id, quality FROM equipment WHERE equipment_id = %s FOR UPDATE) old
+        WHERE e.equipment_id = old.equipment_id
+        RETURNING old.quality AS quality, old.quality - e.quality AS wear
+    """, sample=(2, SAMPLE_ID))
+    EQUIPMENT_WEAR_BATCH = Query("""
+        UPDATE equipment e
+        SET quality = GREATEST(1, e.quality - v.wear)
+        FROM (VALUES %s) AS v (equipment_id, wear)
+        WHERE e.equipment_id = v.equipment_id
+    """, check=False)  # execute_values template
+
+    # Equipment alerts
+    EQUIPMENT_NEEDING_ATTENTION = Query(
+        "SELECT equipment_id, quality FROM equipment WHERE quality < %s",
+        sample=(4,), full_scan=True)  # Only run to resync after the alert listener (re)connects
+    EQUIPMENT_BY_IDS = Query("""
+        SELECT e.equipment_id, e.equipment_name, r.room_name, e.quality
+        FROM equipment e
+        JOIN rooms r ON e.room_id = r.room_id
+        WHERE e.equipment_id = ANY(%s)
+        ORDER BY e.quality, e.equipment_name
+    """, sample=([SAMPLE_ID, SAMPLE_ID + 1, SAMPLE_ID + 2],))
+
+    # Equipment telemetry
+    EQUIPMENT_USAGE_UPSERT = Query("""
+        INSERT INTO equipment_usage_hourly AS u (equipment_id, bucket_start, uses, wear, repairs)
+        VALUES %s
+        ON CONFLICT (equipment_id, bucket_start) DO UPDATE SET
+        uses = u.uses + EXCLUDED.uses, wear = u.wear + EXCLUDED.wear, repairs = u.repairs + EXCLUDED.repairs
+    """, check=False)  # execute_values template
+    EQUIPMENT_USAGE_HEATMAP = Query("""
+        SELECT EXTRACT(ISODOW FROM u.bucket_start)::INT AS day_number, EXTRACT(HOUR FROM u.bucket_start)::INT AS hour,
+               SUM(u.uses) AS uses
+        FROM equipment e
+        JOIN equipment_usage_hourly u ON u.equipment_id = e.equipment_id
+        WHERE e.room_id = %s AND u.bucket_start >= %s AND u.bucket_start < %s
+        GROUP BY 1, 2
+    """, sample=(SAMPLE_ID, *SAMPLE_MONTH), max_cost=5000, max_ms=50)  # One index range per item in the room
+    EQUIPMENT_USAGE_TOTALS = Query("""
+        SELECT e.equipment_id, e.equipment_name, r.room_name, e.quality,
+               SUM(u.uses) AS uses, SUM(u.wear) AS wear, SUM(u.repairs) AS repairs
+        FROM equipment_usage_hourly u
+        JOIN equipment e ON e.equipment_id = u.equipment_id
+        JOIN rooms r ON r.room_id = e.room_id
+        WHERE u.bucket_start >= %s AND u.bucket_start < %s
+        GROUP BY e.equipment_id, e.equipment_name, r.room_name, e.quality
+        ORDER BY uses DESC
+    """, sample=SAMPLE_MONTH, full_scan=True)  # Fleet-wide report over a period
+
+    # Maintenance forecast
+    MAINTENANCE_FORECAST = Query("WITH" + FORECAST_CTE + """
+        SELECT equipment_id, equipment_name, room_name, quality, ROUND(uses_per_day, 1) AS uses_per_day, uses_left, due_date
+        FROM due
+        WHERE due_date < %(today)s::DATE + %(horizon_days)s
+        ORDER BY due_date, room_name, equipment_name
+    """, sample=SAMPLE_FORECAST, full_scan=True)  # Forecasts the whole fleet in one pass
+    MAINTENANCE_SCHEDULE = Query("WITH" + FORECAST_CTE + """
+        SELECT room_id, room_name,
+               GREATEST(MIN(due_date) - %(lead_days)s, %(today)s::DATE) AS visit_date,
+               COUNT(*) AS items,
+               array_agg(equipment_id ORDER BY due_date, equipment_id) AS equipment_ids,
+               array_agg(equipment_name ORDER BY due_date, equipment_id) AS equipment_names
+        FROM due
+        WHERE due_date < %(today)s::DATE + %(horizon_days)s
+        GROUP BY room_id, room_name
+        ORDER BY visit_date, room_name
+    """, sample=SAMPLE_FORECAST, full_scan=True)
+    EQUIPMENT_REPAIR = Query("""
+        UPDATE equipment
+        SET quality = %s
+        WHERE room_id = %s AND equipment_id = ANY(%s)
+        RETURNING equipment_id
+    """, sample=(10, SAMPLE_ID, [SAMPLE_ID]))
+
+    # Trainers
+    TRAINER_NAME = Query("SELECT name FROM trainer_accounts WHERE trainer_id = %s", sample=(SAMPLE_ID,))
+    TRAINER_AVAILABILITY = Query("SELECT availability FROM trainer_accounts WHERE trainer_id = %s", sample=(SAMPLE_ID,))
+    TRAINER_UPDATE_AVAILABILITY = Query(
+        "UPDATE trainer_accounts SET availability = %s::BIT(168) WHERE trainer_id = %s",
+        sample=('0' * 168, SAMPLE_ID))
+    TRAINER_ROSTER = Query("SELECT trainer_id, name, availability FROM trainer_accounts ORDER BY trainer_id", full_scan=True)
+    TRAINERS_FREE = Query("""
+        SELECT t.trainer_id, t.name
+        FROM trainer_accounts t
+        WHERE availability_slots(t.availability) @> %(slots)s::SMALLINT[]
+          AND t.trainer_id <> ALL(%(exclude)s::INT[])
+          AND NOT EXISTS (
+              SELECT 1 FROM bookings b
+              WHERE b.trainer_id = t.trainer_id AND b.week_slot && int4range(%(start)s, %(end)s))
+          AND NOT EXISTS (
+              SELECT 1 FROM class_schedule c
+              WHERE c.trainer_id = t.trainer_id AND c.week_slot && int4range(%(start)s, %(end)s))
+        ORDER BY t.trainer_id
+    """, sample={'slots': [167], 'exclude': [], 'start': 10020, 'end': 10080})
+    SCHEDULE_CONFLICTS = Query("""
+        SELECT 'Booking' AS session_name, r.room_name, t.name AS trainer_name, b.day_of_week, b.start_time, b.duration
+        FROM bookings b
+        JOIN rooms r ON r.room_id = b.room_id
+        JOIN trainer_accounts t ON t.trainer_id = b.trainer_id
+        WHERE (b.room_id = %(room_id)s OR b.trainer_id = %(trainer_id)s)
+          AND b.week_slot && int4range(%(start)s, %(end)s)
+          AND b.booking_id IS DISTINCT FROM %(booking_id)s
+        UNION ALL
+        SELECT c.class_name, r.room_name, t.name, c.day_of_week, c.start_time, c.duration
+        FROM class_schedule c
+        JOIN rooms r ON r.room_id = c.room_id
+        JOIN trainer_accounts t ON t.trainer_id = c.trainer_id
+        WHERE (c.room_id = %(room_id)s OR c.trainer_id = %(trainer_id)s)
+          AND c.week_slot && int4range(%(start)s, %(end)s)
+          AND c.class_id IS DISTINCT FROM %(class_id)s
+    """, sample={'room_id': SAMPLE_ID, 'trainer_id': SAMPLE_ID, 'start': 540, 'end': 600, 'booking_id': None, 'class_id': None})
+    TRAINER_SESSIONS = Query("""
+        SELECT *
+        FROM (
+            SELECT 'Booking' AS session_name, r.room_name, b.day_of_week, b.start_time, b.duration
+            FROM bookings b
+            JOIN rooms r ON r.room_id = b.room_id
+            WHERE b.trainer_id = %(trainer_id)s
+            UNION ALL
+            SELECT c.class_name, r.room_name, c.day_of_week, c.start_time, c.duration
+            FROM class_schedule c
+            JOIN rooms r ON r.room_id = c.room_id
+            WHERE c.trainer_id = %(trainer_id)s
+        ) sessions
+        ORDER BY array_position(%(days)s, day_of_week), start_time
+    """, sample={'trainer_id': SAMPLE_ID, 'days': DAYS})
+    TRAINER_INSERT = Query(
+        "INSERT INTO trainer_accounts (name, password) VALUES (%s, %s) RETURNING trainer_id",
+        sample=('Plan Trainer', ''))
+    TRAINER_DELETE = Query("DELETE FROM trainer_accounts WHERE trainer_id = %s", sample=(SAMPLE_MISSING_ID,))
+
+    # Rooms and bookings
+    ROOMS_ALL = Query("SELECT room_id, room_name FROM rooms ORDER BY room_id", full_scan=True)
+    BOOKING_EXISTS = Query("SELECT booking_id FROM bookings WHERE booking_id = %s", sample=(SAMPLE_ID,))
+    BOOKING_BY_ID = Query("""
+        SELECT b.booking_id, r.room_name, b.day_of_week, b.start_time, b.duration, b.room_id
+        FROM bookings b
+        JOIN rooms r ON b.room_id = r.room_id
+        WHERE b.booking_id = %s
+    """, sample=(SAMPLE_ID,))
+    BOOKING_INSERT = Query("""
+        INSERT INTO bookings (booking_id, room_id, trainer_id, duration, day_of_week, start_time)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, sample=(SAMPLE_MISSING_ID, SAMPLE_ID, SAMPLE_ID, 60, 'Mon', datetime.time(9)))
+    BOOKING_UPDATE = Query("""
+        UPDATE bookings
+        SET room_id = %s, day_of_week = %s, start_time = %s, duration = %s
+        WHERE booking_id = %s
+    """, sample=(SAMPLE_ID, 'Mon', datetime.time(9), 60, SAMPLE_ID))
+    BOOKING_DELETE = Query("DELETE FROM bookings WHERE booking_id = %s", sample=(SAMPLE_ID,))
+
+    # Equipment maintenance
+    EQUIPMENT_WITH_ROOMS = Query("""
+        SELECT e.equipment_name, r.room_name, e.quality
+        FROM equipment e
+        JOIN rooms r ON e.room_id = r.room_id
+        ORDER BY e.quality DESC
+    """, full_scan=True)
+    EQUIPMENT_FIX_WORN = Query("""
+        UPDATE equipment
+        SET quality = 10
+        WHERE quality < 4
+        RETURNING equipment_id
+    """, max_cost=5000, max_ms=200)  # Touches every worn item, so the budget scales with the fleet
+
+    # Class schedule
+    CLASS_BY_ID = Query("""
+        SELECT class_name, trainer_id, room_id, day_of_week, start_time, duration, capacity
+        FROM class_schedule
+        WHERE class_id = %s
+    """, sample=(SAMPLE_ID,))
+    CLASS_INSERT = Query("""
+        INSERT INTO class_schedule (class_name, trainer_id, room_id, day_of_week, start_time, duration, capacity)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        RETURNING class_id
+    """, sample=('Plan Class', SAMPLE_ID, SAMPLE_ID, 'Mon', datetime.time(9), 60, 20))
+    CLASS_UPDATE = Query("""
+        UPDATE class_schedule
+        SET class_name = %s, trainer_id = %s, room_id = %s, day_of_week = %s,
+            start_time = %s, duration = %s, capacity = %s
+        WHERE class_id = %s
+    """, sample=('Plan Class', SAMPLE_ID, SAMPLE_ID, 'Mon', datetime.time(9), 60, 20, SAMPLE_ID))
+    CLASS_DELETE = Query("DELETE FROM class_schedule WHERE class_id = %s", sample=(SAMPLE_ID,))
+
+    # Class enrollment
+    CLASSES_WITH_SEATS = Query("""
+        SELECT c.class_id, c.class_name, r.room_name, t.name AS trainer_name, c.day_of_week, c.start_time,
+               c.duration, c.capacity,
+               (SELECT COUNT(*) FROM class_seats s WHERE s.class_id = c.class_id AND s.email IS NULL) AS seats_left,
+               (SELECT COUNT(*) FROM class_waitlist w WHERE w.class_id = c.class_id) AS waitlisted
+        FROM class_schedule c
+        JOIN rooms r ON r.room_id = c.room_id
+        JOIN trainer_accounts t ON t.trainer_id = c.trainer_id
+        ORDER BY array_position(ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']::VARCHAR[], c.day_of_week),
+                 c.start_time, c.class_id
+    """, full_scan=True)
+    MEMBER_CLASSES = Query("""
+        SELECT s.class_id, c.class_name, c.day_of_week, c.start_time, 'Enrolled' AS status, NULL::BIGINT AS position
+        FROM class_seats s
+        JOIN class_schedule c ON c.class_id = s.class_id
+        WHERE s.email = %(email)s
+        UNION ALL
+        SELECT w.class_id, c.class_name, c.day_of_week, c.start_time, 'Waitlisted',
+               (SELECT COUNT(*) FROM class_waitlist a WHERE a.class_id = w.class_id AND a.waitlist_id <= w.waitlist_id)
+        FROM class_waitlist w
+        JOIN class_schedule c ON c.class_id = w.class_id
+        WHERE w.email = %(email)s
+    """, sample={'email': SAMPLE_EMAIL})
+    # Takes the lowest free seat nobody else is claiming right now; seats locked by concurrent claims are
+    # skipped instead of waited on, so a rush on one class proceeds in parallel
+    CLASS_SEAT_CLAIM = Query("""
+        UPDATE class_seats s
+        SET email = %(email)s, enrolled_at = now()
+        FROM (
+            SELECT class_id, seat_no
+            FROM class_seats
+            WHERE class_id = %(class_id)s AND email IS NULL
+            ORDER BY seat_no
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+        ) free
+        WHERE s.class_id = free.class_id AND s.seat_no = free.seat_no
+        RETURNING s.seat_no
+    """, sample={'email': SAMPLE_BARE_EMAIL, 'class_id': SAMPLE_ID})
+    CLASS_SEATS_FREE = Query("""
+        SELECT COUNT(*) AS free
+        FROM class_seats
+        WHERE class_id = %s AND email IS NULL
+    """, sample=(SAMPLE_ID,))
+    CLASS_WAITLIST_LOCK = Query("SELECT pg_advisory_xact_lock(3006, %s)", sample=(SAMPLE_ID,))  # See promote_waitlist()
+    CLASS_WAITLIST_JOIN = Query("""
+        WITH joined AS (
+            INSERT INTO class_waitlist (class_id, email)
+            VALUES (%(class_id)s, %(email)s)
+            RETURNING waitlist_id
+        )
+        SELECT 1 + COUNT(*) AS position
+        FROM class_waitlist
+        WHERE class_id = %(class_id)s
+    """, sample={'class_id': SAMPLE_ID, 'email': SAMPLE_BARE_EMAIL})
+    CLASS_ENROLLMENT_STATUS = Query("""
+        SELECT 'Enrolled' AS status
+        FROM class_seats
+        WHERE email = %(email)s AND class_id = %(class_id)s
+        UNION ALL
+        SELECT 'Waitlisted'
+        FROM class_waitlist
+        WHERE email = %(email)s AND class_id = %(class_id)s
+    """, sample={'email': SAMPLE_EMAIL, 'class_id': SAMPLE_ID})
+    CLASS_SEAT_RELEASE = Query("""
+        UPDATE class_seats s
+        SET email = NULL, enrolled_at = NULL
+        FROM class_schedule c
+        WHERE s.email = %(email)s AND s.class_id = %(class_id)s AND c.class_id = s.class_id
+        RETURNING s.seat_no, s.seat_no <= c.capacity AS kept
+    """, sample={'email': SAMPLE_EMAIL, 'class_id': SAMPLE_ID})
+    CLASS_SEAT_DROP = Query("""
+        DELETE FROM class_seats
+        WHERE class_id = %s AND seat_no = %s AND email IS NULL
+    """, sample=(SAMPLE_ID, SAMPLE_ID))
+    CLASS_WAITLIST_PROMOTE = Query("SELECT promote_waitlist(%s) AS email", sample=(SAMPLE_ID,))
+    CLASS_MEMBER_SEATS = Query("""
+        SELECT class_id
+        FROM class_seats
+        WHERE email = %s
+        ORDER BY class_id
+    """, sample=(SAMPLE_EMAIL,))
+    CLASS_WAITLIST_LEAVE = Query("""
+        DELETE FROM class_waitlist
+        WHERE email = %(email)s AND class_id = %(class_id)s
+        RETURNING waitlist_id
+    """, sample={'email': SAMPLE_EMAIL, 'class_id': SAMPLE_ID})
+
+    # Payments
+    PAYMENTS_IN_WINDOW = Query("""
+        SELECT payment_id, email, amount, payment_date, payment_type, status
+        FROM payments
+        WHERE payment_date >= %s AND payment_date < %s
+        ORDER BY payment_date DESC, payment_id DESC
+    """, sample=SAMPLE_MONTH, full_scan=True, max_partitions=1)  # Lists a whole month, but only that month's partition
+    PAYMENT_SET_STATUS = Query("""
+        UPDATE payments
+        SET status = %s
+        WHERE payment_id = %s AND payment_date >= %s AND payment_date < %s
+    """, sample=('Completed', SAMPLE_ID, *SAMPLE_MONTH), max_partitions=1)
+    BILLING_MEMBER_BATCH = Query("""
+        SELECT email FROM member_accounts
+        WHERE email > %s
+          AND email NOT IN %s
+          AND (hashtext(email) & 2147483647) %% %s = %s  -- Masks the sign bit; abs() overflows at INT_MIN
+        ORDER BY email
+        LIMIT %s
+    """, sample=('', ('guest', 'admin'), 4, 0, 5000), max_cost=20000, max_ms=500)  # One batch of a billing run
+    BILLING_INSERT_CHARGES = Query("""
+        INSERT INTO payments (email, amount, payment_date, payment_type, status, billing_period)
+        VALUES %s
+        ON CONFLICT (email, billing_period, payment_date) DO NOTHING
+    """, check=False)  # execute_values template
+
+    # Member management
+    MEMBERS_BY_NAME = Query("SELECT email, name FROM member_accounts ORDER BY name", full_scan=True)
+    DELETE_MEMBER_GOALS = Query("DELETE FROM fitness_goals WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    DELETE_MEMBER_ROUTINES = Query("DELETE FROM exercise_routines WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    DELETE_MEMBER_HEALTH_METRICS = Query("DELETE FROM member_health_metrics WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    DELETE_MEMBER_PAYMENTS = Query("DELETE FROM payments WHERE email = %s", sample=(SAMPLE_EMAIL,), max_cost=1000)  # One index probe per partition
+    DELETE_MEMBER_ACHIEVEMENTS = Query("DELETE FROM fitness_achievements WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    DELETE_MEMBER_HEALTH_STATS = Query("DELETE FROM health_statistics WHERE email = %s", sample=(SAMPLE_EMAIL,))
+    DELETE_MEMBER_ACCOUNT = Query("DELETE FROM member_accounts WHERE email = %s", sample=(SAMPLE_BARE_EMAIL,), max_cost=1000)  # Checks referencing tables
+
+    # Utilization reports
+    SCHEDULE_VERSION = Query("SELECT version FROM schedule_version")
+
+    # Timetable
+    TIMETABLE_SESSIONS = Query("""
+        SELECT 'bookings' AS source, booking_id AS session_id, NULL AS class_name, trainer_id, room_id,
+               day_of_week, start_time, duration, NULL::INT AS capacity,
+               lower(week_slot) AS start_minute, upper(week_slot) AS end_minute
+        FROM bookings
+        UNION ALL
+        SELECT 'class_schedule', class_id, class_name, trainer_id, room_id,
+               day_of_week, start_time, duration, capacity, lower(week_slot), upper(week_slot)
+        FROM class_schedule
+    """, full_scan=True)
+    TIMETABLE_SESSIONS_BY_ID = Query("""
+        SELECT 'bookings' AS source, booking_id AS session_id, NULL AS class_name, trainer_id, room_id,
+               day_of_week, start_time, duration, NULL::INT AS capacity,
+               lower(week_slot) AS start_minute, upper(week_slot) AS end_minute
+        FROM bookings
+        WHERE booking_id = ANY(%(booking_ids)s::INT[])
+        UNION ALL
+        SELECT 'class_schedule', class_id, class_name, trainer_id, room_id,
+               day_of_week, start_time, duration, capacity, lower(week_slot), upper(week_slot)
+        FROM class_schedule
+        WHERE class_id = ANY(%(class_ids)s::INT[])
+    """, sample={'booking_ids': [SAMPLE_ID, 2, 3], 'class_ids': [SAMPLE_ID]})
+    TRAINER_MINUTES_PER_DAY = Query("WITH" + SESSIONS_CTE + """
+        SELECT t.trainer_id, t.name, s.day_of_week,
+               SUM(s.end_minute - s.start_minute) AS minutes_booked,
+               SUM(SUM(s.end_minute - s.start_minute)) OVER (PARTITION BY t.trainer_id) AS weekly_minutes,
+               RANK() OVER (PARTITION BY s.day_of_week ORDER BY SUM(s.end_minute - s.start_minute) DESC) AS day_rank
+        FROM sessions s
+        JOIN trainer_accounts t ON t.trainer_id = s.trainer_id
+        GROUP BY t.trainer_id, t.name, s.day_of_week
+        ORDER BY t.trainer_id, array_position(%s, s.day_of_week::TEXT)
+    """, sample=(DAYS,), full_scan=True)
+    ROOM_OCCUPANCY = Query("WITH" + MERGED_CTE + """,
+        slots AS (
+            SELECT r.room_id, r.room_name, d.day_of_week, d.day_index, h.hour
+            FROM rooms r
+            CROSS JOIN unnest(%s::TEXT[]) WITH ORDINALITY AS d(day_of_week, day_index)
+            CROSS JOIN generate_series(%s, %s - 1) AS h(hour)
+        )
+        SELECT sl.room_id, sl.room_name, sl.day_of_week, sl.hour,
+               ROUND(100.0 * COALESCE(SUM(
+                   GREATEST(0, LEAST(m.end_minute, (sl.hour + 1) * 60) - GREATEST(m.start_minute, sl.hour * 60))
+               ), 0) / 60, 1) AS occupancy_percentage
+        FROM slots sl
+        LEFT JOIN merged m
+            ON m.room_id = sl.room_id
+           AND m.day_of_week = sl.day_of_week
+           AND m.start_minute < (sl.hour + 1) * 60
+           AND m.end_minute > sl.hour * 60
+        GROUP BY sl.room_id, sl.room_name, sl.day_of_week, sl.day_index, sl.hour
+        ORDER BY sl.room_id, sl.day_index, sl.hour
+    """, sample=(DAYS, 6, 22), full_scan=True)
+    IDLE_ROOMS = Query("WITH" + MERGED_CTE + """
+        SELECT r.room_id, r.room_name,
+               COALESCE(SUM(GREATEST(0, LEAST(m.end_minute, %(close)s) - GREATEST(m.start_minute, %(open)s))), 0) AS occupied_minutes,
+               ROUND(100.0 * COALESCE(SUM(GREATEST(0, LEAST(m.end_minute, %(close)s) - GREATEST(m.start_minute, %(open)s))), 0)
+                     / (7 * (%(close)s - %(open)s)), 1) AS weekly_occupancy
+        FROM rooms r
+        LEFT JOIN merged m ON m.room_id = r.room_id
+        GROUP BY r.room_id, r.room_name
+        HAVING ROUND(100.0 * COALESCE(SUM(GREATEST(0, LEAST(m.end_minute, %(close)s) - GREATEST(m.start_minute, %(open)s))), 0)
+                     / (7 * (%(close)s - %(open)s)), 1) < %(threshold)s
+        ORDER BY weekly_occupancy, r.room_id
+    """, sample={'open': 360, 'close': 1320, 'threshold': 10.0}, full_scan=True)
+
+    @staticmethod
+    def all():
+        """ Every registered statement in declaration order. """
+        return list(REGISTRY.values())
@@ -0,0 +1,81 @@
+"""
+The Recovery class is the nightly job that lets members recover between gym visits. Stamina only goes
+down during a workout, so without it a member who ran out would stay out. The job brings stamina back
+with the time elapsed since it last changed, faster for fitter members, and clears injuries that have had
+long enough to heal. Both clocks are stamped by a trigger on `health_statistics`, so logging in and
+working out do no extra work for it.
+
+The job walks `health_statistics` in primary key order, CHUNK_SIZE members at a time. Each chunk is one
+set-based UPDATE in its own short transaction, so no lock is held for long. Rows that a workout has locked
+are skipped rather than waited for, and they are picked up on the next run. The job is safe to stop and
+rerun at any time: a member's recovery is measured from their own timestamps, not from the last run.
+
+Run it from the src directory, e.g. nightly from cron: `python Recovery.py [chunk_size]`.
+
+Key Functionalities:
+- run(chunk_size, pause, report): Recovers every member chunk by chunk and returns the totals.
+"""
+
+import sys
+import time
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+
+
+class Recovery:
+    CHUNK_SIZE = 5000
+    CHUNK_PAUSE = 0.05  # Seconds between chunks, so the job leaves room for the app's own writes
+    MAX_STAMINA = 10
+    # Stamina regained per hour is BASE_PER_HOUR + PER_HOUR_PER_LEVEL * fitness level (0.6 to 1.5)
+    BASE_PER_HOUR = 0.5
+    PER_HOUR_PER_LEVEL = 0.1
+    # An injury heals after HEAL_HOURS - HEAL_HOURS_PER_LEVEL * fitness level, but never less than MIN_HEAL_HOURS
+    HEAL_HOURS = 48
+    HEAL_HOURS_PER_LEVEL = 3
+    MIN_HEAL_HOURS = 12
+
+    @staticmethod
+    def run(chunk_size=None, pause=None, report=print):
+        """
+        Recovers every member and returns {'chunks', 'scanned', 'updated', 'stamina_restored', 'healed', 'seconds'}.
+        report receives a progress line after each chunk (pass None for a silent run).
+        """
+        params = {'after': '', 'chunk': chunk_size or Recovery.CHUNK_SIZE, 'max_stamina': Recovery.MAX_STAMINA,
+                  'base_per_hour': Recovery.BASE_PER_HOUR, 'per_hour_per_level': Recovery.PER_HOUR_PER_LEVEL,
+                  'heal_hours': Recovery.HEAL_HOURS, 'heal_hours_per_level': Recovery.HEAL_HOURS_PER_LEVEL,
+                  'min_heal_hours': Recovery.MIN_HEAL_HOURS}
+        pause = Recovery.CHUNK_PAUSE if pause is None else pause
+        totals = {'chunks': 0, 'scanned': 0, 'updated': 0, 'stamina_restored': 0, 'healed': 0}
+        started = time.perf_counter()
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                while True:
+                    chunk_started = time.perf_counter()
+                    cursor.execute(Queries.RECOVERY_CHUNK, params)
+                    result = cursor.fetchone()
+                    conn.commit()  # Each chunk is durable on its own and releases its row locks
+                    if not result['scanned']:
+                        break
+
+                    totals['chunks'] += 1
+                    for key in ('scanned', 'updated', 'stamina_restored', 'healed'):
+                        totals[key] += result[key]
+                    params['after'] = result['last_email']
+                    if report:
+                        elapsed = time.perf_counter() - started
+                        report(f"Chunk {totals['chunks']}: {result['updated']}/{result['scanned']} members updated, "
+                               f"{result['healed']} healed in {(time.perf_counter() - chunk_started) * 1000:.0f} ms "
+                               f"({totals['scanned']} scanned, {totals['scanned'] / elapsed:.0f} members/s)")
+                    if result['scanned'] < params['chunk']:
+                        break
+                    time.sleep(pause)
+        totals['seconds'] = round(time.perf_counter() - started, 3)
+        return totals
+
+
+if __name__ == "__main__":
+    totals = Recovery.run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"Recovery complete: {totals['updated']} of {totals['scanned']} members updated "
+          f"({totals['stamina_restored']} stamina restored, {totals['healed']} injuries healed) "
+          f"in {totals['chunks']} chunks, {totals['seconds']:.1f}s.")
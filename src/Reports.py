@@ -0,0 +1,205 @@
+"""
+The Reports class produces utilization reports over the club's schedule so administrators can decide
+whether more rooms or trainers are needed. Every report is computed set-based in SQL by combining
+`bookings` and `class_schedule` and using window functions over start_time + duration.
+
+Results are cached in memory until the schedule changes. A statement-level trigger on both schedule
+tables bumps the single row in `schedule_version`, so checking whether a cached report is still valid
+costs one primary-key lookup instead of recomputing the report.
+
+Key Functionalities:
+- menu(): Displays the reports menu for administrators.
+- trainer_minutes_per_day(): Minutes booked per trainer per day, with weekly totals and daily ranking.
+- room_occupancy(): Occupancy percentage per room, weekday and hour, merging overlapping sessions.
+- idle_rooms(threshold): Rooms whose weekly occupancy during opening hours is below a threshold.
+- invalidate(): Drops all cached reports.
+- print_usage_heatmap() / print_usage_totals(): Equipment usage from the hourly telemetry recorded by EquipmentTelemetry.
+"""
+
+import datetime
+
+import psycopg2
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from EquipmentTelemetry import EquipmentTelemetry
+from QueryRegistry import Queries
+
+
+class Reports:
+    DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+    OPEN_HOUR = 6    # Club opens at 06:00
+    CLOSE_HOUR = 22  # Club closes at 22:00
+    IDLE_THRESHOLD = 10.0  # Weekly occupancy percentage below which a room counts as idle
+    TELEMETRY_DAYS = 28  # Period covered by the equipment usage reports
+
+    _cache = {}
+    _cached_version = None
+
+    @staticmethod
+    def invalidate():
+        """ Drops every cached report so the next request recomputes it. """
+        Reports._cache.clear()
+        Reports._cached_version = None
+
+    @staticmethod
+    def _cached(key, query, params=()):
+        """ Returns cached rows for key, re-running the query only if the schedule version has moved. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.SCHEDULE_VERSION)
+                record = cursor.fetchone()
+                version = record['version'] if record else None
+
+                if version is None or version != Reports._cached_version:
+                    Reports._cache.clear()
+                    Reports._cached_version = version
+
+                if key not in Reports._cache:
+                    cursor.execute(query, params)
+                    Reports._cache[key] = cursor.fetchall()
+                return Reports._cache[key]
+        return []
+
+    @staticmethod
+    def trainer_minutes_per_day():
+        """ Minutes booked per trainer per day, with the trainer's weekly total and their rank for that day. """
+        return Reports._cached('trainer_minutes', Queries.TRAINER_MINUTES_PER_DAY, (Reports.DAYS,))
+
+    @staticmethod
+    def room_occupancy():
+        """ Occupancy percentage for every room, weekday and opening hour. """
+        return Reports._cached('room_occupancy', Queries.ROOM_OCCUPANCY, (Reports.DAYS, Reports.OPEN_HOUR, Reports.CLOSE_HOUR))
+
+    @staticmethod
+    def idle_rooms(threshold=None):
+        """ Rooms whose weekly occupancy during opening hours is below the threshold percentage. """
+        threshold = Reports.IDLE_THRESHOLD if threshold is None else threshold
+        open_minute, close_minute = Reports.OPEN_HOUR * 60, Reports.CLOSE_HOUR * 60
+        params = {'open': open_minute, 'close': close_minute, 'threshold': threshold}
+        return Reports._cached(('idle_rooms', threshold), Queries.IDLE_ROOMS, params)
+
+    @staticmethod
+    def menu():
+        while True:
+            clear_screen()
+            print("=========================================================")
+            print("Utilization Reports")
+            print("1. Trainer Minutes Booked per Day")
+            print("2. Room Occupancy by Weekday and Hour")
+            print("3. Idle Rooms")
+            print("4. Equipment Usage Heatmap")
+            print("5. Equipment Usage Totals")
+            print("6. Go Back")
+
+            choice = input("Enter choice: ")
+            try:
+                if choice == "1":
+                    Reports.print_trainer_minutes()
+                elif choice == "2":
+                    Reports.print_room_occupancy()
+                elif choice == "3":
+                    Reports.print_idle_rooms()
+                elif choice == "4":
+                    Reports.print_usage_heatmap()
+                elif choice == "5":
+                    Reports.print_usage_totals()
+                elif choice == "6":
+                    break
+                else:
+                    print("Invalid choice. Please choose again.")
+                    continue
+            except psycopg2.Error as e:
+                print("An error occurred while building the report:", e)
+            input("Press Enter to go back...")
+
+    @staticmethod
+    def print_trainer_minutes():
+        clear_screen()
+        rows = Reports.trainer_minutes_per_day()
+        print("Minutes Booked per Trainer per Day:")
+        print("| {:^10} | {:<20} | {:^5} | {:^10} | {:^10} | {:^8} |".format(
+            "Trainer ID", "Name", "Day", "Minutes", "Weekly", "Day Rank"))
+        for row in rows:
+            print("| {:^10} | {:<20} | {:^5} | {:^10} | {:^10} | {:^8} |".format(
+                row['trainer_id'], row['name'], row['day_of_week'],
+                row['minutes_booked'], row['weekly_minutes'], row['day_rank']))
+        if not rows:
+            print("No bookings or classes scheduled.")
+
+    @staticmethod
+    def print_room_occupancy():
+        clear_screen()
+        rows = Reports.room_occupancy()
+        hours = range(Reports.OPEN_HOUR, Reports.CLOSE_HOUR)
+        grid = {}
+        for row in rows:
+            grid.setdefault((row['room_id'], row['room_name']), {}).setdefault(row['day_of_week'], {})[row['hour']] = row['occupancy_percentage']
+
+        print("Room Occupancy (% of each hour in use):")
+        for (room_id, room_name), days in grid.items():
+            print(f"\n{room_id}: {room_name}")
+            print("| {:^5} |".format("Day") + "".join(" {:>3} |".format(f"{hour:02d}") for hour in hours))
+            for day in Reports.DAYS:
+                occupancy = days.get(day, {})
+                print("| {:^5} |".format(day) + "".join(" {:>3} |".format(round(occupancy.get(hour, 0))) for hour in hours))
+
+    @staticmethod
+    def print_idle_rooms():
+        clear_screen()
+        rows = Reports.idle_rooms()
+        print(f"Rooms below {Reports.IDLE_THRESHOLD}% weekly occupancy ({Reports.OPEN_HOUR:02d}:00-{Reports.CLOSE_HOUR:02d}:00):")
+        if not rows:
+            print("No idle rooms found.")
+            return
+        print("| {:^7} | {:<25} | {:^16} | {:^10} |".format("Room ID", "Room Name", "Occupied Minutes", "Occupancy"))
+        for row in rows:
+            print("| {:^7} | {:<25} | {:^16} | {:>9}% |".format(
+                row['room_id'], row['room_name'], row['occupied_minutes'], row['weekly_occupancy']))
+
+    @staticmethod
+    def telemetry_period():
+        """ Returns (start, end) covering the last TELEMETRY_DAYS days up to the current hour. """
+        end = EquipmentTelemetry.bucket() + datetime.timedelta(hours=1)
+        return end - datetime.timedelta(days=Reports.TELEMETRY_DAYS), end
+
+    @staticmethod
+    def print_usage_heatmap():
+        clear_screen()
+        rooms = []
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.ROOMS_ALL)
+                rooms = cursor.fetchall()
+        for room in rooms:
+            print(f"{room['room_id']}. {room['room_name']}")
+        room_id = input("Enter the room ID: ").strip()
+        if not room_id.isdigit():
+            print("Invalid room ID.")
+            return
+
+        start, end = Reports.telemetry_period()
+        usage = EquipmentTelemetry.heatmap(int(room_id), start, end)
+        hours = range(Reports.OPEN_HOUR, Reports.CLOSE_HOUR)
+        print(f"\nEquipment uses per hour, last {Reports.TELEMETRY_DAYS} days:")
+        print("| {:^5} |".format("Day") + "".join(" {:>3} |".format(f"{hour:02d}") for hour in hours))
+        for day_number, day in enumerate(Reports.DAYS, start=1):
+            print("| {:^5} |".format(day) + "".join(" {:>3} |".format(usage.get((day_number, hour), 0)) for hour in hours))
+        if not usage:
+            print("No equipment use recorded in this room.")
+
+    @staticmethod
+    def print_usage_totals():
+        clear_screen()
+        start, end = Reports.telemetry_period()
+        rows = EquipmentTelemetry.totals(start, end)
+        print(f"Equipment Usage, last {Reports.TELEMETRY_DAYS} days:")
+        if not rows:
+            print("No equipment use recorded.")
+            return
+        print("| {:^12} | {:<20} | {:<15} | {:^7} | {:^6} | {:^6} | {:^7} |".format(
+            "Equipment ID", "Name", "Room", "Quality", "Uses", "Wear", "Repairs"))
+        for row in rows:
+            print("| {:^12} | {:<20} | {:<15} | {:^7} | {:^6} | {:^6} | {:^7} |".format(
+                row['equipment_id'], row['equipment_name'], row['room_name'], row['quality'],
+                row['uses'], row['wear'], row['repairs']))
@@ -0,0 +1,105 @@
+"""
+The RoomOccupancy class tracks how many members are in each room right now and keeps rooms within their
+capacity. Entering or leaving a room only changes an in-memory count, so the gym floor adds no write to the
+hot `rooms` rows. Each app process keeps its own counts and a WriteBehindCounters flushes the changes as
+one upsert per room into that process's `room_occupancy` rows. Other processes' counts are read back
+at most every REFRESH_SECONDS.
+
+A room's occupancy is this process's exact count plus the others' last flushed counts. Capacity is
+therefore exact within a process, but across processes it is only as fresh as the last flush and
+refresh: two processes entering the last free place at the same moment can both get in. Rows that have
+not been written for STALE_SECONDS (for example from a process that crashed) stop counting. Each process
+rewrites its busy rooms every HEARTBEAT_SECONDS so members who stay a while do not expire.
+
+Key Functionalities:
+- enter(room_id): Counts a member into a room, or returns False if the room is full or closed.
+- leave(room_id): Counts a member out of a room.
+- current(): The occupancy of every room that has anyone in it.
+- flush(): Writes this process's counts now.
+"""
+
+import threading
+import time
+import uuid
+
+from CatalogCache import CatalogCache
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from WriteBehind import WriteBehindCounters
+
+
+class RoomOccupancy:
+    FLUSH_EVENTS = 50  # Entries and exits counted before the counts are written
+    FLUSH_MS = 2000  # Longest a change waits in memory before it is written
+    REFRESH_SECONDS = 5  # How long other processes' counts are reused before being read again
+    HEARTBEAT_SECONDS = 300  # How often rooms with members in them are rewritten
+    STALE_SECONDS = 900  # Rows older than this no longer count
+
+    INSTANCE_ID = uuid.uuid4().hex  # This process's rows in room_occupancy
+    counters = WriteBehindCounters(Queries.ROOM_OCCUPANCY_UPSERT, 2, FLUSH_EVENTS, FLUSH_MS)
+
+    _local = {}  # room_id -> members this process has in the room
+    _others = {}  # room_id -> members other processes had in the room when last read
+    _refreshed_at = None
+    _heartbeat_at = 0.0
+    _lock = threading.Lock()  # Makes checking capacity and counting a member in one step
+
+    @staticmethod
+    def _refresh():
+        """ Re-reads the other processes' counts once REFRESH_SECONDS have passed. """
+        now = time.monotonic()
+        if RoomOccupancy._refreshed_at is not None and now - RoomOccupancy._refreshed_at < RoomOccupancy.REFRESH_SECONDS:
+            return
+        first = RoomOccupancy._refreshed_at is None
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                if first:  # Once per process, clear out the rows of processes that are gone
+                    cursor.execute(Queries.ROOM_OCCUPANCY_PURGE, (RoomOccupancy.STALE_SECONDS,))
+                    conn.commit()
+                cursor.execute(Queries.ROOM_OCCUPANCY_OTHERS, (RoomOccupancy.INSTANCE_ID, RoomOccupancy.STALE_SECONDS))
+                others = {row['room_id']: row['occupants'] for row in cursor.fetchall()}
+                with RoomOccupancy._lock:
+                    RoomOccupancy._others = others
+                RoomOccupancy._refreshed_at = now
+
+        if now - RoomOccupancy._heartbeat_at >= RoomOccupancy.HEARTBEAT_SECONDS:
+            RoomOccupancy._heartbeat_at = now
+            with RoomOccupancy._lock:
+                busy = [room_id for room_id, count in RoomOccupancy._local.items() if count]
+            for room_id in busy:
+                RoomOccupancy.counters.add((RoomOccupancy.INSTANCE_ID, room_id, 0))  # Only bumps updated_at
+
+    @staticmethod
+    def current():
+        """ Returns {room_id: members} for every room with anyone in it. """
+        RoomOccupancy._refresh()
+        with RoomOccupancy._lock:
+            rooms = set(RoomOccupancy._local) | set(RoomOccupancy._others)
+            counts = {room_id: RoomOccupancy._local.get(room_id, 0) + RoomOccupancy._others.get(room_id, 0)
+                      for room_id in rooms}
+        return {room_id: count for room_id, count in counts.items() if count > 0}
+
+    @staticmethod
+    def enter(room_id):
+        """ Counts a member into the room; returns False, counting nobody, if the room is full or closed. """
+        capacity = CatalogCache.room_capacities().get(room_id, 0)
+        RoomOccupancy._refresh()
+        with RoomOccupancy._lock:
+            inside = RoomOccupancy._local.get(room_id, 0) + RoomOccupancy._others.get(room_id, 0)
+            if inside >= capacity:
+                return False
+            RoomOccupancy._local[room_id] = RoomOccupancy._local.get(room_id, 0) + 1
+        RoomOccupancy.counters.add((RoomOccupancy.INSTANCE_ID, room_id, 1))
+        return True
+
+    @staticmethod
+    def leave(room_id):
+        with RoomOccupancy._lock:
+            if not RoomOccupancy._local.get(room_id):
+                return
+            RoomOccupancy._local[room_id] -= 1
+        RoomOccupancy.counters.add((RoomOccupancy.INSTANCE_ID, room_id, -1))
+
+    @staticmethod
+    def flush():
+        return RoomOccupancy.counters.flush()
@@ -0,0 +1,74 @@
+"""
+The Schedule class answers time questions about bookings and classes with range operators. Both tables
+carry a generated `week_slot` column, the minutes since Monday 00:00 a session covers as an int4range, with
+GiST indexes on (room_id, week_slot) and (trainer_id, week_slot). Exclusion constraints on those indexes
+stop two sessions in one table from sharing a room or trainer, and a trigger applies the same rule between
+bookings and classes. Clashes are therefore index lookups in the database, with no end times computed
+row by row. A session must end by Sunday midnight (a CHECK on week_slot), since a range running past minute
+10080 would not wrap around to overlap early Monday.
+
+Key Functionalities:
+- week_minute(day, at_time): Minutes since Monday 00:00.
+- week_range(day, start_time, minutes): The [start, end) week minutes of a session.
+- within_week(day, start_time, minutes): Whether a session ends by Sunday midnight.
+- conflicts(room_id, trainer_id, day, start_time, minutes, booking_id, class_id): Sessions that would clash.
+- is_overlap(error): Whether a database error was raised by the overlap rules.
+- is_past_week_end(error): Whether a database error was raised for a session running past Sunday midnight.
+- print_conflicts(conflicts): Lists clashing sessions for the admin screens.
+"""
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from Reports import Reports
+
+
+class Schedule:
+    DAYS = Reports.DAYS
+    MINUTES_PER_DAY = 24 * 60
+    MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+    OVERLAP_PGCODE = '23P01'  # exclusion_violation, raised by the constraints and the cross-table trigger
+    CHECK_PGCODE = '23514'  # check_violation
+    WEEK_END_CONSTRAINTS = ('bookings_within_week', 'class_schedule_within_week')
+
+    @staticmethod
+    def week_minute(day, at_time):
+        return Schedule.DAYS.index(day) * Schedule.MINUTES_PER_DAY + at_time.hour * 60 + at_time.minute
+
+    @staticmethod
+    def week_range(day, start_time, minutes):
+        start = Schedule.week_minute(day, start_time)
+        return start, start + max(int(minutes or 0), 0)
+
+    @staticmethod
+    def within_week(day, start_time, minutes):
+        return Schedule.week_range(day, start_time, minutes)[1] <= Schedule.MINUTES_PER_WEEK
+
+    @staticmethod
+    def conflicts(room_id, trainer_id, day, start_time, minutes, booking_id=None, class_id=None):
+        """ Returns the sessions sharing the room or trainer during that time, ignoring the session being edited. """
+        start, end = Schedule.week_range(day, start_time, minutes)
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.SCHEDULE_CONFLICTS, {
+                    'room_id': room_id, 'trainer_id': trainer_id, 'start': start, 'end': end,
+                    'booking_id': booking_id, 'class_id': class_id,
+                })
+                return cursor.fetchall()
+        return []
+
+    @staticmethod
+    def is_overlap(error):
+        return getattr(error, 'pgcode', None) == Schedule.OVERLAP_PGCODE
+
+    @staticmethod
+    def is_past_week_end(error):
+        diag = getattr(error, 'diag', None)
+        return (getattr(error, 'pgcode', None) == Schedule.CHECK_PGCODE
+                and getattr(diag, 'constraint_name', None) in Schedule.WEEK_END_CONSTRAINTS)
+
+    @staticmethod
+    def print_conflicts(conflicts):
+        print("That time clashes with:")
+        for session in conflicts:
+            print(f"- {session['session_name']} in {session['room_name']} with {session['trainer_name']}, "
+                  f"{session['day_of_week']} {session['start_time'].strftime('%H:%M')} ({session['duration']} min)")
@@ -0,0 +1,204 @@
+"""
+The Simulator class plays the workout rules over a whole club at once to see what a change to them would do
+before any member feels it. Members and equipment are NumPy arrays and every simulated round is a handful
+of array operations over all members in the gym, so millions of sessions take seconds. Each member then
+uses one random item. Members who pick the same item in a round see it worn by those before them, just as
+EquipmentUsage hands out the quality left by the previous claim.
+
+A simulated day sends each member to the gym with VISIT_CHANCE. Visitors work out for up to
+SESSIONS_PER_VISIT sessions, until their stamina runs out or they are injured, following WorkoutRules.
+Injured members stay away until they have healed. Overnight, stamina recovers at Recovery's rates and
+maintenance repairs worn items. A policy overrides any of the rule numbers in DEFAULT_POLICY, and the
+same seed gives every policy the same members, equipment and random draws, so their results compare
+directly.
+
+Run it from the src directory, e.g. `python Simulator.py --days 30 --policy wear_per_use=1 --policy
+repair_below=5,repairs_per_day=20`. The current rules are always simulated first, as the baseline. With
+--club, the simulation starts from the club's members and equipment instead of a generated club. The
+simulator needs NumPy (`pip install numpy`), which the rest of the app does not use.
+
+Key Functionalities:
+- policy(text): Parses 'setting=value,...' into a policy based on the current rules.
+- generated(members, equipment, seed): A generated club to simulate.
+- club(): The club's current members and equipment, from the database.
+- run(population, policy, days, visit_chance, sessions_per_visit, seed): Simulates the club and returns the results.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from Recovery import Recovery
+from WorkoutRules import WorkoutRules
+
+
+class Simulator:
+    MEMBERS = 50000
+    EQUIPMENT = 10000
+    DAYS = 30
+    VISIT_CHANCE = 0.3  # Chance that a member visits on a given day
+    SESSIONS_PER_VISIT = 5  # Most sessions in one visit (a full stamina bar lasts five)
+    STATS = WorkoutRules.IMPROVABLE_STATS  # Columns of the stats array; fitness_level is column 0
+    DEFAULT_POLICY = {
+        'wear_per_use': WorkoutRules.WEAR_PER_USE,
+        'danger_quality': WorkoutRules.DANGER_QUALITY,
+        'injury_chance': WorkoutRules.INJURY_CHANCE,
+        'improve_chance': WorkoutRules.IMPROVE_CHANCE,
+        'stamina_per_workout': WorkoutRules.STAMINA_PER_WORKOUT,
+        'repair_below': WorkoutRules.DANGER_QUALITY,  # Items below this quality are repaired overnight
+        'repairs_per_day': 0,  # Most items repaired in a night, worst first; 0 for no limit
+    }
+
+    @staticmethod
+    def policy(text=''):
+        """ Returns DEFAULT_POLICY with the settings in text ('wear_per_use=1,repair_below=5') changed. """
+        policy = dict(Simulator.DEFAULT_POLICY)
+        for setting in filter(None, (part.strip() for part in text.split(','))):
+            key, _, value = setting.partition('=')
+            if key not in policy:
+                raise ValueError(f"Unknown policy setting '{key}'; expected one of {', '.join(policy)}")
+            policy[key] = type(policy[key])(value)
+        return policy
+
+    @staticmethod
+    def generated(members=None, equipment=None, seed=None):
+        """ Returns (stats, stamina, quality) for a club of rested members with random stats and part-worn equipment. """
+        rng = np.random.default_rng(seed)
+        members = members or Simulator.MEMBERS
+        stats = rng.integers(WorkoutRules.MIN_STAT, WorkoutRules.MAX_STAT + 1, size=(members, len(Simulator.STATS)))
+        stamina = np.full(members, Recovery.MAX_STAMINA)
+        quality = rng.integers(WorkoutRules.DANGER_QUALITY, WorkoutRules.MAX_QUALITY + 1, size=equipment or Simulator.EQUIPMENT)
+        return stats, stamina, quality
+
+    @staticmethod
+    def club():
+        """ Returns (stats, stamina, quality) for the club's members and equipment, or None if the database could not be reached. """
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.SIMULATION_MEMBERS)
+                members = cursor.fetchall()
+                cursor.execute(Queries.SIMULATION_EQUIPMENT)
+                equipment = cursor.fetchall()
+                stats = np.array([[row[stat] for stat in Simulator.STATS] for row in members],
+                                 dtype=np.int64).reshape(-1, len(Simulator.STATS))
+                stamina = np.array([row['stamina'] for row in members], dtype=np.int64)
+                quality = np.array([row['quality'] for row in equipment], dtype=np.int64)
+                return stats, stamina, quality
+        return None
+
+    @staticmethod
+    def run(population, policy=None, days=None, visit_chance=None, sessions_per_visit=None, seed=None):
+        """
+        Simulates the club under the policy and returns the totals ('sessions', 'injuries', 'dangerous_uses',
+        'improvements', 'repairs', 'turned_away') and rates ('injury_rate', 'dangerous_share',
+        'stat_gain_per_member', 'repairs_per_day', 'mean_quality', 'per_second'). population is left unchanged.
+        """
+        policy = policy or Simulator.policy()
+        days = days or Simulator.DAYS
+        visit_chance = Simulator.VISIT_CHANCE if visit_chance is None else visit_chance
+        sessions_per_visit = sessions_per_visit or Simulator.SESSIONS_PER_VISIT
+        rng = np.random.default_rng(seed)
+
+        stats, stamina, quality = (np.array(array, dtype=np.int64) for array in population)
+        members, equipment = len(stamina), len(quality)
+        starting_stats = stats.sum(axis=1)
+        back_on = np.zeros(members, dtype=np.int64)  # Day an injured member may return
+        totals = {'sessions': 0, 'injuries': 0, 'dangerous_uses': 0, 'improvements': 0, 'repairs': 0, 'turned_away': 0}
+
+        started = time.perf_counter()
+        for day in range(days):
+            visiting = rng.random(members) < visit_chance
+            healing = back_on > day
+            totals['turned_away'] += int(np.count_nonzero(visiting & healing))
+            in_gym = visiting & ~healing
+
+            for _ in range(sessions_per_visit):
+                who = rng.permutation(np.flatnonzero(in_gym & (stamina > 0)))
+                if not len(who):
+                    break
+                items = rng.integers(0, equipment, size=len(who))
+
+                # The k-th member on an item this round finds it worn by the k members before them
+                order = np.argsort(items, kind='stable')
+                by_item = items[order]
+                earlier = np.empty(len(who), dtype=np.int64)
+                earlier[order] = np.arange(len(who)) - np.searchsorted(by_item, by_item)
+                seen = np.maximum(WorkoutRules.MIN_QUALITY, quality[items] - policy['wear_per_use'] * earlier)
+                quality = np.maximum(WorkoutRules.MIN_QUALITY,
+                                     quality - policy['wear_per_use'] * np.bincount(items, minlength=equipment))
+
+                dangerous = seen < policy['danger_quality']
+                hurt = dangerous & (rng.random(len(who)) < policy['injury_chance'])
+                injured = who[hurt]
+                stats[injured] = np.maximum(WorkoutRules.MIN_STAT, stats[injured] - WorkoutRules.INJURY_PENALTY)
+                stamina[injured] = WorkoutRules.INJURED_STAMINA
+                in_gym[injured] = False
+                heal_hours = np.maximum(Recovery.MIN_HEAL_HOURS,
+                                        Recovery.HEAL_HOURS - Recovery.HEAL_HOURS_PER_LEVEL * stats[injured, 0])
+                back_on[injured] = day + 1 + (heal_hours - 1) // 24  # Healed by the first nightly run after heal_hours
+
+                trained = who[~hurt]
+                improves = rng.random(len(trained)) < policy['improve_chance']
+                picked = rng.integers(0, len(Simulator.STATS), size=len(trained))
+                rows, columns = trained[improves], picked[improves]
+                below_max = stats[rows, columns] < WorkoutRules.MAX_STAT
+                stats[rows[below_max], columns[below_max]] += 1  # Each member trains once per round, so no row repeats
+                stamina[trained] = np.maximum(0, stamina[trained] - policy['stamina_per_workout'])
+
+                totals['sessions'] += len(who)
+                totals['injuries'] += int(np.count_nonzero(hurt))
+                totals['dangerous_uses'] += int(np.count_nonzero(dangerous))
+                totals['improvements'] += int(np.count_nonzero(below_max))
+
+            # Overnight: a day's stamina recovery for everyone, then maintenance on the most worn items
+            per_hour = Recovery.BASE_PER_HOUR + Recovery.PER_HOUR_PER_LEVEL * stats[:, 0]
+            stamina = np.minimum(Recovery.MAX_STAMINA, stamina + np.floor(24 * per_hour).astype(np.int64))
+            due = np.flatnonzero(quality < policy['repair_below'])
+            if policy['repairs_per_day'] and len(due) > policy['repairs_per_day']:
+                due = due[np.argsort(quality[due], kind='stable')[:policy['repairs_per_day']]]
+            quality[due] = WorkoutRules.MAX_QUALITY
+            totals['repairs'] += len(due)
+
+        seconds = time.perf_counter() - started
+        sessions = totals['sessions']
+        return dict(totals, days=days, members=members, equipment=equipment, seconds=seconds,
+                    injury_rate=totals['injuries'] / sessions if sessions else 0.0,
+                    dangerous_share=totals['dangerous_uses'] / sessions if sessions else 0.0,
+                    stat_gain_per_member=float((stats.sum(axis=1) - starting_stats).mean()) if members else 0.0,
+                    repairs_per_day=totals['repairs'] / days,
+                    mean_quality=float(quality.mean()) if equipment else 0.0,
+                    per_second=sessions / seconds if seconds else 0.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate workout outcomes and equipment wear under different rules.")
+    parser.add_argument('--members', type=int, default=Simulator.MEMBERS, help="Members in a generated club")
+    parser.add_argument('--equipment', type=int, default=Simulator.EQUIPMENT, help="Items in a generated club")
+    parser.add_argument('--club', action='store_true', help="Start from the club's members and equipment in the database")
+    parser.add_argument('--days', type=int, default=Simulator.DAYS)
+    parser.add_argument('--visit-chance', type=float, default=Simulator.VISIT_CHANCE)
+    parser.add_argument('--sessions-per-visit', type=int, default=Simulator.SESSIONS_PER_VISIT)
+    parser.add_argument('--seed', type=int, default=3005, help="The same seed gives every policy the same draws")
+    parser.add_argument('--policy', action='append', default=[], help="Settings to change, e.g. wear_per_use=1,repair_below=5")
+    args = parser.parse_args()
+
+    try:
+        policies = [('current rules', Simulator.policy())] + [(text, Simulator.policy(text)) for text in args.policy]
+    except ValueError as e:
+        parser.error(str(e))
+    population = Simulator.club() if args.club else Simulator.generated(args.members, args.equipment, args.seed)
+    if population is None:
+        sys.exit(2)
+
+    print("| {:<32} | {:>10} | {:>9} | {:>9} | {:>9} | {:>9} | {:>11} | {:>7} | {:>10} |".format(
+        "Policy", "Sessions", "Injury %", "Danger %", "Stat gain", "Repairs/d", "Turned away", "Quality", "Sessions/s"))
+    for name, policy in policies:
+        result = Simulator.run(population, policy, args.days, args.visit_chance, args.sessions_per_visit, args.seed)
+        print("| {:<32} | {:>10} | {:>9.3f} | {:>9.3f} | {:>9.2f} | {:>9.1f} | {:>11} | {:>7.2f} | {:>10.0f} |".format(
+            name[:32], result['sessions'], result['injury_rate'] * 100, result['dangerous_share'] * 100,
+            result['stat_gain_per_member'], result['repairs_per_day'], result['turned_away'], result['mean_quality'],
+            result['per_second']))
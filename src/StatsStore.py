@@ -0,0 +1,89 @@
+"""
+The MemberStats and GuestSession classes are the two stores a gym visit keeps its fitness statistics in, and
+expose the same methods so the workout logic in Fitness runs unchanged against either. A member's stats are
+read from and written to their `health_statistics` row. A guest's live only in memory for the length of
+their one-day pass, so day-pass traffic never writes to `health_statistics` and concurrent guests no longer
+overwrite each other. If the guest then creates an account, the session can be saved as the new member's stats.
+
+Key Functionalities:
+- load(): The stats the workout logic works with (fitness level, stats, water, protein, injury).
+- all(): Every stat, for display.
+- set(stat, value): Changes one stat.
+- injure(): Applies an injury and returns how much each stat changed.
+- commit(): Makes the changes so far durable (a no-op for guests).
+- record(equipment_id, deltas, injured): Adds the workout to the member's history (guests have none).
+- GuestSession.save(cursor, email): Stores a guest's stats as a new member's health statistics.
+"""
+
+from QueryRegistry import Queries
+from Workouts import Workouts
+from WorkoutRules import WorkoutRules
+
+
+class MemberStats:
+    """ Stats kept in the member's health_statistics row. """
+
+    def __init__(self, cursor, email):
+        self.cursor = cursor
+        self.email = email
+
+    def load(self):
+        self.cursor.execute(Queries.HEALTH_STATS_FOR_WORKOUT, (self.email,))
+        return self.cursor.fetchone()
+
+    def all(self):
+        self.cursor.execute(Queries.HEALTH_STATS_BY_EMAIL, (self.email,))
+        return self.cursor.fetchone()
+
+    def set(self, stat, value):
+        if stat == 'stamina':
+            self.cursor.execute(Queries.STAMINA_UPDATE, (value, self.email))
+        else:
+            self.cursor.execute(Queries.HEALTH_STAT_UPDATE.format(stat=stat), (value, self.email))
+
+    def injure(self):
+        self.cursor.execute(Queries.INJURY_UPDATE, {
+            'min_stat': WorkoutRules.MIN_STAT, 'penalty': WorkoutRules.INJURY_PENALTY,
+            'stamina': WorkoutRules.INJURED_STAMINA, 'email': self.email,
+        })
+        deltas = self.cursor.fetchone()
+        return {key.replace('_delta', ''): value for key, value in deltas.items()} if deltas else None
+
+    def commit(self):
+        self.cursor.connection.commit()
+
+    def record(self, equipment_id, deltas, injured=False):
+        Workouts.record(self.email, equipment_id, deltas, injured)
+
+
+class GuestSession:
+    """ Stats held in memory for one guest's day pass. """
+    STATS = ('fitness_level', 'strength', 'flexibility', 'endurance', 'stamina', 'has_water', 'has_protein', 'is_injured')
+
+    def __init__(self, stats):
+        self.email = "guest"
+        self.stats = {stat: stats[stat] for stat in GuestSession.STATS}
+
+    def load(self):
+        return dict(self.stats)
+
+    def all(self):
+        return {'email': self.email, **self.stats}
+
+    def set(self, stat, value):
+        self.stats[stat] = value
+
+    def injure(self):
+        before = dict(self.stats)
+        self.stats = WorkoutRules.injury(self.stats)
+        return {stat: self.stats[stat] - before[stat] for stat in WorkoutRules.IMPROVABLE_STATS + ('stamina',)}
+
+    def commit(self):
+        pass
+
+    def record(self, equipment_id, deltas, injured=False):
+        pass  # Guests have no workout history
+
+    def save(self, cursor, email):
+        """ Inserts the session's stats as the health statistics of the member with this email; the caller commits. """
+        cursor.execute(Queries.HEALTH_STATS_INSERT, (email, *(self.stats[stat] for stat in GuestSession.STATS)))
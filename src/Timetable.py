@@ -0,0 +1,218 @@
+"""
+The Timetable class keeps the club's weekly timetable in memory: every room's week as 15-minute slots,
+filled from both `bookings` and `class_schedule`. Each room's week is one compact array of 672 ints, where
+a cell holds the booking id, minus the class id, or 0 if the room is free. The exclusion constraints on
+both tables guarantee that no two sessions share a cell. The admin schedule screens and the front desk grid
+render from this copy instead of re-querying the schedule on every loop.
+
+It is kept current incrementally. A trigger sends a NOTIFY on `schedule_changes` naming the table and id
+of every booking or class that is added, edited or deleted, and screens in this process report their own
+edits through changed(). Those sessions are re-read and repainted the next time the timetable is read.
+A full reload happens only on the first read, after a TRUNCATE and whenever the listener reconnects.
+
+Key Functionalities:
+- start(): Subscribes the process to schedule change notifications.
+- changed(table, session_id): Marks one session (or, without an id, the whole timetable) for refresh.
+- refresh(): Re-reads the sessions marked since the last read.
+- bookings() / classes(): The current sessions, as the admin schedule screens list them.
+- cell(room_id, slot): The session occupying a room in one slot of the week.
+- in_use(moment): The sessions taking place at a moment (now by default).
+- print_day(day): Prints the rooms-by-time grid of one day during opening hours.
+- menu(): The timetable screen, one day at a time.
+"""
+
+import datetime
+import json
+import threading
+from array import array
+
+import psycopg2
+
+from CatalogCache import CatalogCache
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from Notifications import Notifications
+from QueryRegistry import Queries
+from Reports import Reports
+
+
+class Timetable:
+    CHANNEL = 'schedule_changes'
+    SLOT_MINUTES = 15
+    SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+    SLOTS = 7 * SLOTS_PER_DAY
+    DAYS = Reports.DAYS
+
+    _grid = {}  # room_id -> array('i') of SLOTS cells
+    _sessions = {}  # cell value -> the session's row (with its slots) as last read
+    _pending = set()  # (table, id) waiting to be re-read
+    _stale = True  # Everything must be reloaded
+    _lock = threading.Lock()
+    _started = False
+
+    @staticmethod
+    def start():
+        if not Timetable._started:
+            Timetable._started = True
+            Notifications.subscribe(Timetable.CHANNEL, Timetable.handle, Timetable.changed)
+
+    @staticmethod
+    def handle(payload):
+        change = json.loads(payload)
+        Timetable.changed(change['table'], change.get('id'))
+
+    @staticmethod
+    def changed(table=None, session_id=None):
+        """ Marks a session for refresh; without a session id the whole timetable is reloaded. """
+        with Timetable._lock:
+            if session_id is None:
+                Timetable._stale = True
+                Timetable._pending.clear()
+            else:
+                Timetable._pending.add((table, int(session_id)))
+
+    @staticmethod
+    def key(table, session_id):
+        return session_id if table == 'bookings' else -session_id
+
+    @staticmethod
+    def slots(row):
+        """ The cells a session covers, from its week_slot minutes (sessions end by Sunday midnight). """
+        if row['start_minute'] is None:
+            return range(0)
+        first = row['start_minute'] // Timetable.SLOT_MINUTES
+        last = -(-row['end_minute'] // Timetable.SLOT_MINUTES)  # Rounds up, so a partly used slot is occupied
+        return range(first, min(last, first + Timetable.SLOTS))
+
+    @staticmethod
+    def _paint(key, row):
+        """ Stores a session and fills its cells; the caller holds the lock. """
+        row = dict(row, slots=Timetable.slots(row))
+        cells = Timetable._grid.setdefault(row['room_id'], array('i', [0]) * Timetable.SLOTS)
+        for slot in row['slots']:
+            cells[slot % Timetable.SLOTS] = key
+        Timetable._sessions[key] = row
+
+    @staticmethod
+    def _erase(key):
+        """ Removes a session and clears its cells; the caller holds the lock. """
+        row = Timetable._sessions.pop(key, None)
+        if row is None:
+            return
+        cells = Timetable._grid[row['room_id']]
+        for slot in row['slots']:
+            if cells[slot % Timetable.SLOTS] == key:
+                cells[slot % Timetable.SLOTS] = 0
+
+    @staticmethod
+    def refresh():
+        """ Applies the pending changes, reloading everything if needed. Returns False if the database could not be reached. """
+        Timetable.start()
+        with Timetable._lock:
+            stale, pending = Timetable._stale, Timetable._pending
+            Timetable._stale, Timetable._pending = False, set()
+        if not stale and not pending:
+            return True
+
+        rows = None
+        try:
+            with DBManager.connection() as conn:
+                with conn.cursor() as cursor:
+                    if stale:
+                        cursor.execute(Queries.TIMETABLE_SESSIONS)
+                    else:
+                        cursor.execute(Queries.TIMETABLE_SESSIONS_BY_ID, {
+                            'booking_ids': [session_id for table, session_id in pending if table == 'bookings'],
+                            'class_ids': [session_id for table, session_id in pending if table == 'class_schedule'],
+                        })
+                    rows = cursor.fetchall()
+        except (psycopg2.Error, RuntimeError) as e:  # RuntimeError: DBManager could not connect
+            print(f"Could not refresh the timetable: {e}")
+
+        with Timetable._lock:
+            if rows is None:  # Keep the changes for the next read
+                Timetable._stale = Timetable._stale or stale
+                Timetable._pending |= pending
+                return False
+            if stale:
+                Timetable._grid, Timetable._sessions = {}, {}
+            for table, session_id in pending:
+                Timetable._erase(Timetable.key(table, session_id))  # Edited sessions are repainted below
+            for row in rows:
+                key = Timetable.key(row['source'], row['session_id'])
+                Timetable._erase(key)
+                Timetable._paint(key, row)
+        return True
+
+    @staticmethod
+    def _listing(source):
+        Timetable.refresh()
+        with Timetable._lock:
+            rows = [row for row in Timetable._sessions.values() if row['source'] == source]
+        return sorted(rows, key=lambda row: row['session_id'])
+
+    @staticmethod
+    def bookings():
+        """ Every booking as {'booking_id', 'room_id', 'room_name', 'trainer_id', 'day_of_week', 'start_time', 'duration'}. """
+        rooms = CatalogCache.rooms()
+        return [dict(row, booking_id=row['session_id'], room_name=rooms.get(row['room_id'], '?'))
+                for row in Timetable._listing('bookings')]
+
+    @staticmethod
+    def classes():
+        """ Every class as {'class_id', 'class_name', 'trainer_id', 'room_id', 'day_of_week', 'start_time', 'duration', 'capacity'}. """
+        return [dict(row, class_id=row['session_id']) for row in Timetable._listing('class_schedule')]
+
+    @staticmethod
+    def cell(room_id, slot):
+        """ Returns the row of the session in room_id at slot (0 = Monday 00:00-00:15), or None if the room is free. """
+        with Timetable._lock:
+            cells = Timetable._grid.get(room_id)
+            return Timetable._sessions.get(cells[slot]) if cells is not None and cells[slot] else None
+
+    @staticmethod
+    def in_use(moment=None):
+        """ Returns the rows of the sessions taking place at moment (now by default), one per busy room. """
+        moment = moment or datetime.datetime.now()
+        slot = (moment.weekday() * Timetable.SLOTS_PER_DAY
+                + (moment.hour * 60 + moment.minute) // Timetable.SLOT_MINUTES)
+        Timetable.refresh()
+        with Timetable._lock:
+            keys = {cells[slot] for cells in Timetable._grid.values() if cells[slot]}
+            return [Timetable._sessions[key] for key in keys]
+
+    @staticmethod
+    def print_day(day):
+        clear_screen()
+        Timetable.refresh()
+        per_hour = 60 // Timetable.SLOT_MINUTES
+        first = Timetable.DAYS.index(day) * Timetable.SLOTS_PER_DAY + Reports.OPEN_HOUR * per_hour
+        last = Timetable.DAYS.index(day) * Timetable.SLOTS_PER_DAY + Reports.CLOSE_HOUR * per_hour
+        print(f"Timetable for {day} ({Reports.OPEN_HOUR:02d}:00-{Reports.CLOSE_HOUR:02d}:00, "
+              f"one column per {Timetable.SLOT_MINUTES} minutes; B = booking, C = class, . = free)")
+        print("{:<20} |".format("Room") + "".join(f"{hour:02d}  " for hour in range(Reports.OPEN_HOUR, Reports.CLOSE_HOUR)))
+        rooms = CatalogCache.rooms()
+        with Timetable._lock:
+            for room_id, room_name in rooms.items():
+                cells = Timetable._grid.get(room_id)
+                line = ''.join('.' if cells is None or not cells[slot] else ('B' if cells[slot] > 0 else 'C')
+                               for slot in range(first, last))
+                print("{:<20} |{}".format(room_name[:20], line))
+
+    @staticmethod
+    def menu():
+        while True:
+            clear_screen()
+            print("=========================================================")
+            print("Weekly Timetable")
+            for idx, day in enumerate(Timetable.DAYS, start=1):
+                print(f"{idx}. {day}")
+            print(f"{len(Timetable.DAYS) + 1}. Go Back")
+            choice = input("Choose a day: ").strip()
+            if choice.isdigit() and 1 <= int(choice) <= len(Timetable.DAYS):
+                Timetable.print_day(Timetable.DAYS[int(choice) - 1])
+                input("Press Enter to go back...")
+            elif choice == str(len(Timetable.DAYS) + 1):
+                return
+            else:
+                print("Invalid choice. Please choose again.")
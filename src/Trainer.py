@@ -6,8 +6,11 @@ view and update member profiles, award fitness achievements, and edit their avai
 Key Functionalities:
 - log_in(): Allows a trainer to log in with their unique ID and password to access their personalized dashboard.
 - run_dashboard(): Displays the trainer dashboard where they can manage their daily schedule, access member profiles, award achievements, and update their availability.
-- edit_availability(): Enables trainers to update their weekly availability for scheduling purposes.
+- edit_availability(): Enables trainers to update their weekly availability, day by day and down to the hour, for scheduling purposes.
 - give_member_achievement(): Allows trainers to award fitness achievements to members based on their performance and milestones.
+- award_achievement_by_stat(): Awards an achievement to every member whose health statistic reaches a threshold, in one statement.
+- view_achievement_holders(): Lists the members who have earned an achievement.
+- add_achievement(): Adds a new achievement to the catalog.
 - view_member_profile(): Provides detailed profiles of members including personal information, health statistics, fitness goals, and exercise routines, facilitating better personalized training plans.
 - display_member_details(): Displays comprehensive details of a selected member, aiding trainers in providing tailored fitness guidance.
 """
@@ -16,8 +19,12 @@ import time
 import bcrypt
 import getpass
 
+from Achievements import Achievements
 from ClearScreen import clear_screen
 from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from Reports import Reports
+from TrainerRoster import TrainerRoster
 
 class Trainer:
     def __init__(self, trainer_id):
@@ -34,7 +41,7 @@ class Trainer:
 
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT password FROM trainer_accounts WHERE trainer_id = %s", (trainer_id,))
+                cursor.execute(Queries.TRAINER_PASSWORD, (trainer_id,))
                 record = cursor.fetchone()
 
                 if record is None:
@@ -60,21 +67,25 @@ class Trainer:
             print(f"Welcome to Trainer Dashboard, {trainer_name}! (ID: {self.trainer_id})")
             
             availability = self.fetch_availability()
-            if not availability:
+            if availability is None:
                 print("No availability data found for this trainer.")
                 return
 
             print("Your Current Availability:")
             print("| {:^5} | {:<14} |".format("Day", "Availability"))
-            for day, available in availability.items():
-                print("| {:^5} | {:<14} |".format(day[:3].capitalize(), 'Available' if available else 'Not Available'))
+            for day in TrainerRoster.DAYS:
+                hours = TrainerRoster.describe(availability, day)
+                print("| {:^5} | {:<14} |".format(day, hours if hours != '-' else 'Not Available'))
             print("----------------------------------------------------")
 
             print("1. Edit Availability")
             print("2. View Member Profiles")
             print("3. Give Member Achievement")
-            print("4. Go back to Main Menu")
-            print("5. Log Out")
+            print("4. Award Achievement by Health Stat")
+            print("5. View Achievement Holders")
+            print("6. Add New Achievement")
+            print("7. Go back to Main Menu")
+            print("8. Log Out")
 
             choice = input("Enter choice: ")
 
@@ -85,8 +96,14 @@ class Trainer:
             elif choice == "3":
                 self.give_member_achievement()
             elif choice == "4":
-                return  # Go back to main menu
+                self.award_achievement_by_stat()
             elif choice == "5":
+                self.view_achievement_holders()
+            elif choice == "6":
+                self.add_achievement()
+            elif choice == "7":
+                return  # Go back to main menu
+            elif choice == "8":
                 break  # Log out
             else:
                 print("Invalid choice. Please choose again.")
@@ -94,133 +111,155 @@ class Trainer:
     def fetch_trainer_name(self):
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute("SELECT name FROM trainer_accounts WHERE trainer_id = %s", (self.trainer_id,))
+                cursor.execute(Queries.TRAINER_NAME, (self.trainer_id,))
                 record = cursor.fetchone()
                 return record['name'] if record else "Trainer"
 
     def fetch_availability(self):
-        days = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+        """ Returns the trainer's availability as a TrainerRoster mask, or None if the trainer was not found. """
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(f"SELECT {', '.join([day + '_available' for day in days])} FROM trainer_accounts WHERE trainer_id = %s", (self.trainer_id,))
-                availability = cursor.fetchone()
-                return {day: availability[day] for day in availability} if availability else {}
+                cursor.execute(Queries.TRAINER_AVAILABILITY, (self.trainer_id,))
+                record = cursor.fetchone()
+                return TrainerRoster.parse(record['availability']) if record else None
 
     def edit_availability(self, current_availability):
-        new_availability = {}
-        for day in current_availability.keys():
-            current_status = 'y' if current_availability[day] else 'n'
-            choice = input(f"Available on {day.capitalize()[:3]} (y/n)? [current: {current_status}]: ").strip().lower()
-            if choice in ['y', 'n']:
-                new_availability[day] = True if choice == 'y' else False
-            elif choice == '':
-                new_availability[day] = current_availability[day]
+        opening = f"{Reports.OPEN_HOUR:02d}-{Reports.CLOSE_HOUR:02d}"
+        print(f"For each day enter 'y' for opening hours ({opening}), 'n' for not available, "
+              "hours such as 09-17, or press Enter to keep the current hours.")
+        availability = current_availability
+        for day in TrainerRoster.DAYS:
+            choice = input(f"Available on {day}? [current: {TrainerRoster.describe(availability, day)}]: ").strip().lower()
+            if choice == '':
+                continue
+            if choice == 'y':
+                hours = (Reports.OPEN_HOUR, Reports.CLOSE_HOUR)
+            elif choice == 'n':
+                hours = (0, 0)
             else:
-                print("Invalid input, please enter 'y' for yes, 'n' for no, or press Enter to keep the current status.")
-
+                hours = Trainer.parse_hours(choice)
+                if hours is None:
+                    print(f"Invalid input, {day} keeps its current hours.")
+                    continue
+            availability = TrainerRoster.with_hours(availability, day, *hours)
+
+        if availability == current_availability:
+            print("No changes made.")
+            return
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                update_query = f"UPDATE trainer_accounts SET {', '.join([f'{day} = %s' for day in new_availability.keys()])} WHERE trainer_id = %s"
-                cursor.execute(update_query, list(new_availability.values()) + [self.trainer_id])
+                cursor.execute(Queries.TRAINER_UPDATE_AVAILABILITY, (TrainerRoster.to_bits(availability), self.trainer_id))
                 conn.commit()
                 print("Availability updated successfully.")
 
+    @staticmethod
+    def parse_hours(text):
+        """ Parses 'HH-HH' into (from_hour, to_hour), or returns None if it is not a valid range within a day. """
+        start, _, end = text.partition('-')
+        if start.isdigit() and end.isdigit() and 0 <= int(start) < int(end) <= 24:
+            return int(start), int(end)
+        return None
+
+    @staticmethod
+    def choose_achievement(achievements, prompt):
+        """ Lists the achievements and returns the id of the one selected, or None. """
+        for idx, achievement in enumerate(achievements, start=1):
+            print(f"{idx}. {achievement['name']}")
+        choice = input(prompt)
+        if choice.isdigit() and 1 <= int(choice) <= len(achievements):
+            return achievements[int(choice) - 1]['achievement_id']
+        print("Invalid selection.")
+        return None
+
     def give_member_achievement(self):
         member_name = input("Enter the member's name to award an achievement: ").strip()
+        members = []
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
-                # First fetch member details to ensure they exist
-                cursor.execute("SELECT email FROM member_accounts WHERE name ILIKE %s", (f'%{member_name}%',))
-                member = cursor.fetchone()
-                if not member:
-                    print("No member found by that name.")
-                    return
-                
-                # Fetch existing achievements for the member
-                cursor.execute("SELECT * FROM fitness_achievements WHERE email = %s", (member['email'],))
-                current_achievements = cursor.fetchone()
-                
-                if current_achievements is None:
-                    # Initialize all achievements to False if none exist
-                    achievements_defaults = {
-                        'first_fitness_goal_achieved': False,
-                        'never_skipped_leg_day': False,
-                        'can_do_pushup': False,
-                        'can_do_pullup': False,
-                        'can_touch_toes': False,
-                        'achieved_weight_loss_goal': False,
-                        'achieved_muscle_gain_goal': False
-                    }
-                    cursor.execute("""
-                        INSERT INTO fitness_achievements (email, first_fitness_goal_achieved, never_skipped_leg_day, can_do_pushup, can_do_pullup, can_touch_toes, achieved_weight_loss_goal, achieved_muscle_gain_goal)
-                        VALUES (%s, %(first_fitness_goal_achieved)s, %(never_skipped_leg_day)s, %(can_do_pushup)s, %(can_do_pullup)s, %(can_touch_toes)s, %(achieved_weight_loss_goal)s, %(achieved_muscle_gain_goal)s)
-                    """, {'email': member['email'], **achievements_defaults})
-                    conn.commit()
-                    current_achievements = achievements_defaults
-
-                # Display available achievements
-                print("Available Achievements:")
-                achievements_keys = {
-                    1: "first_fitness_goal_achieved",
-                    2: "never_skipped_leg_day",
-                    3: "can_do_pushup",
-                    4: "can_do_pullup",
-                    5: "can_touch_toes",
-                    6: "achieved_weight_loss_goal",
-                    7: "achieved_muscle_gain_goal"
-                }
-                available_achievements = []
-                current_member_achievements = []
-
-                for idx, key in achievements_keys.items():
-                    achievement_status = current_achievements.get(key)
-                    formatted_key = key.replace('_', ' ').capitalize()
-                    if achievement_status:
-                        current_member_achievements.append(formatted_key)
-                    else:
-                        available_achievements.append((idx, formatted_key))
-
-                if current_member_achievements:
-                    print("Current Member's Achievements:")
-                    for achievement in current_member_achievements:
-                        print("- " + achievement)
-
-                if available_achievements:
-                    print("\nAvailable Achievements:")
-                    for idx, formatted_key in available_achievements:
-                        print(f"{idx}. {formatted_key}")
-
-                    # Let the trainer choose an achievement to grant
-                    choice = input("Select an achievement to grant (enter the number): ")
-                    if choice.isdigit():
-                        choice_idx = int(choice)
-                        if 1 <= choice_idx <= len(available_achievements):
-                            achievement_to_grant = achievements_keys[available_achievements[choice_idx - 1][0]]
-                            # Update the member's achievements
-                            cursor.execute(f"""
-                                UPDATE fitness_achievements
-                                SET {achievement_to_grant} = TRUE
-                                WHERE email = %s
-                            """, (member['email'],))
-                            conn.commit()
-                            print(f"Achievement '{achievement_to_grant.replace('_', ' ').capitalize()}' granted to {member_name}.")
-                        else:
-                            print("Invalid selection.")
-                    else:
-                        print("Invalid input.")
-                else:
-                    print("All achievements have been earned by this member.")
-
-
+                cursor.execute(Queries.MEMBERS_NAME_LIKE, (f'%{member_name}%',))
+                members = cursor.fetchall()
+        if not members:
+            print("No member found by that name.")
+            return
+
+        member = members[0]
+        if len(members) > 1:
+            print("Select a member:")
+            for idx, candidate in enumerate(members, start=1):
+                print(f"{idx}. {candidate['name']} ({candidate['email']})")
+            choice = input("Enter choice (number): ")
+            if not (choice.isdigit() and 1 <= int(choice) <= len(members)):
+                print("Invalid selection.")
+                return
+            member = members[int(choice) - 1]
+
+        achievements = Achievements.for_member(member['email'])
+        earned = [achievement for achievement in achievements if achievement['earned']]
+        available = [achievement for achievement in achievements if not achievement['earned']]
+
+        if earned:
+            print("Current Member's Achievements:")
+            for achievement in earned:
+                print("- " + achievement['name'])
+
+        if not available:
+            print("All achievements have been earned by this member.")
+            return
+
+        print("\nAvailable Achievements:")
+        achievement_id = self.choose_achievement(available, "Select an achievement to grant (enter the number): ")
+        if achievement_id is not None and Achievements.award(member['email'], achievement_id):
+            name = next(achievement['name'] for achievement in available if achievement['achievement_id'] == achievement_id)
+            print(f"Achievement '{name}' granted to {member['name']}.")
+
+    def award_achievement_by_stat(self):
+        """ Grants an achievement to every member whose health statistic reaches a threshold. """
+        print("Award to members whose stat is at least a threshold.")
+        for idx, stat in enumerate(Achievements.STATS, start=1):
+            print(f"{idx}. {stat.replace('_', ' ').capitalize()}")
+        choice = input("Select a stat (enter the number): ")
+        if not (choice.isdigit() and 1 <= int(choice) <= len(Achievements.STATS)):
+            print("Invalid selection.")
+            return
+        stat = Achievements.STATS[int(choice) - 1]
+
+        threshold = input("Minimum value (0-10): ").strip()
+        if not (threshold.isdigit() and 0 <= int(threshold) <= 10):
+            print("Invalid value.")
+            return
+
+        achievement_id = self.choose_achievement(Achievements.catalog(), "Select an achievement to grant (enter the number): ")
+        if achievement_id is None:
+            return
+        awarded = Achievements.award_by_stat(achievement_id, stat, int(threshold))
+        print(f"Achievement granted to {awarded} member(s).")
+        input("Press enter to go back...")
+
+    def view_achievement_holders(self):
+        achievement_id = self.choose_achievement(Achievements.catalog(), "Select an achievement (enter the number): ")
+        if achievement_id is None:
+            return
+        holders = Achievements.holders(achievement_id)
+        if not holders:
+            print("No member has earned this achievement yet.")
+        for holder in holders:
+            print(f"- {holder['name']} ({holder['email']})")
+        input("Press enter to go back...")
+
+    def add_achievement(self):
+        name = input("Enter the new achievement's name: ").strip()
+        if not name:
+            print("Achievement name cannot be empty.")
+            return
+        if Achievements.add(name) is not None:
+            print(f"Achievement '{name}' added.")
 
     def view_member_profile(self):
         member_name = input("Enter the member's name to view profiles: ").strip()
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 # Fetch all members with a similar name
-                cursor.execute("""
-                    SELECT email, name FROM member_accounts WHERE name ILIKE %s
-                """, (f'%{member_name}%',))
+                cursor.execute(Queries.MEMBERS_NAME_LIKE, (f'%{member_name}%',))
                 members = cursor.fetchall()
 
                 if not members:
@@ -242,27 +281,19 @@ class Trainer:
         with DBManager.connection() as conn:
             with conn.cursor() as cursor:
                 # Fetch and display personal information
-                cursor.execute("""
-                SELECT email, name, gender, age FROM member_accounts WHERE email = %s
-                """, (email,))
+                cursor.execute(Queries.MEMBER_PROFILE, (email,))
                 member_info = cursor.fetchone()
 
                 # Fetch and display health stats
-                cursor.execute("""
-                    SELECT * FROM health_statistics WHERE email = %s
-                """, (email,))
+                cursor.execute(Queries.HEALTH_STATS_BY_EMAIL, (email,))
                 health_stats = cursor.fetchone()
 
                 # Fetch and display fitness goals
-                cursor.execute("""
-                    SELECT * FROM fitness_goals WHERE email = %s
-                """, (email,))
+                cursor.execute(Queries.GOALS_DETAILS_BY_EMAIL, (email,))
                 fitness_goals = cursor.fetchone()
 
                 # Fetch and display exercise routines
-                cursor.execute("""
-                    SELECT * FROM exercise_routines WHERE email = %s
-                """, (email,))
+                cursor.execute(Queries.ROUTINES_DETAILS_BY_EMAIL, (email,))
                 exercise_routines = cursor.fetchone()
 
                 # Displaying the details
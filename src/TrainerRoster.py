@@ -0,0 +1,108 @@
+"""
+The TrainerRoster class works with trainer availability, which is stored as a weekly bitmask of hour slots
+(`trainer_accounts.availability`, BIT(168)): slot day * 24 + hour is set when the trainer works that hour,
+with Monday as day 0. In memory each mask is a Python int in which bit s is slot s, so checking whether a
+trainer covers a session is a single AND, and filtering the whole roster for the admin scheduling screens
+never goes back to the database. The roster itself comes from CatalogCache, so it is reloaded only when a
+trainer is added, renamed, deleted or changes their availability.
+
+The database answers the same question through availability_slots(), whose GIN index finds the trainers
+whose slots contain a session's slots in one indexed query; free_and_unbooked() uses it, together with
+the trainers' existing sessions, to find cover for a trainer.
+
+Key Functionalities:
+- parse(bits) / to_bits(mask): Convert between the BIT(168) column and an int mask.
+- slots(day, start_time, minutes): The hour slots a session occupies.
+- day_hours(mask, day) / with_hours(mask, day, from_hour, to_hour) / describe(mask, day): Read, change and print one day.
+- roster(): Every trainer with their availability mask.
+- free(day, start_time, minutes, exclude): Trainers whose availability covers a session, from memory.
+- free_and_unbooked(day, start_time, minutes, exclude): Trainers who are available and have no clashing session.
+"""
+
+from CatalogCache import CatalogCache
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from Reports import Reports
+from Schedule import Schedule
+
+
+class TrainerRoster:
+    DAYS = Reports.DAYS
+    HOURS = 24
+    SLOTS = 7 * 24
+
+    @staticmethod
+    def parse(bits):
+        """ Turns a BIT(168) value ('0101...', slot 0 first) into an int whose bit s is slot s. """
+        return int(bits[::-1], 2) if bits else 0
+
+    @staticmethod
+    def to_bits(mask):
+        return format(mask, f'0{TrainerRoster.SLOTS}b')[::-1]
+
+    @staticmethod
+    def slots(day, start_time, minutes):
+        """ Returns the slots from start_time on day for the given minutes, wrapping past Sunday midnight. """
+        start = TrainerRoster.DAYS.index(day) * 24 * 60 + start_time.hour * 60 + start_time.minute
+        end = start + max(int(minutes or 0), 1)
+        return [slot % TrainerRoster.SLOTS for slot in range(start // 60, (end - 1) // 60 + 1)]
+
+    @staticmethod
+    def mask_of(slots):
+        mask = 0
+        for slot in slots:
+            mask |= 1 << slot
+        return mask
+
+    @staticmethod
+    def day_hours(mask, day):
+        first = TrainerRoster.DAYS.index(day) * TrainerRoster.HOURS
+        return [hour for hour in range(TrainerRoster.HOURS) if mask >> (first + hour) & 1]
+
+    @staticmethod
+    def with_hours(mask, day, from_hour, to_hour):
+        """ Returns mask with day's availability replaced by the hours from_hour up to (not including) to_hour. """
+        first = TrainerRoster.DAYS.index(day) * TrainerRoster.HOURS
+        day_mask = ((1 << TrainerRoster.HOURS) - 1) << first
+        hours_mask = TrainerRoster.mask_of(range(first + from_hour, first + max(from_hour, to_hour)))
+        return (mask & ~day_mask) | hours_mask
+
+    @staticmethod
+    def describe(mask, day):
+        """ Returns the day's hours as ranges, e.g. '06-12,17-22', or '-' if the trainer is not available. """
+        ranges = []
+        for hour in TrainerRoster.day_hours(mask, day):
+            if ranges and ranges[-1][1] == hour:
+                ranges[-1][1] = hour + 1
+            else:
+                ranges.append([hour, hour + 1])
+        return ','.join(f"{start:02d}-{end:02d}" for start, end in ranges) or '-'
+
+    @staticmethod
+    def roster():
+        """ Returns (trainer_id, name, mask) for every trainer, ordered by id. """
+        return [(row['trainer_id'], row['name'], TrainerRoster.parse(row['availability']))
+                for row in CatalogCache.trainer_availability()]
+
+    @staticmethod
+    def free(day, start_time, minutes, exclude=()):
+        """ Returns {'trainer_id', 'name'} rows for the trainers whose availability covers the session. """
+        needed = TrainerRoster.mask_of(TrainerRoster.slots(day, start_time, minutes))
+        return [{'trainer_id': trainer_id, 'name': name}
+                for trainer_id, name, mask in TrainerRoster.roster()
+                if mask & needed == needed and trainer_id not in exclude]
+
+    @staticmethod
+    def free_and_unbooked(day, start_time, minutes, exclude=()):
+        """ Like free(), but asks the database so trainers with a booking or class at that time are left out. """
+        start, end = Schedule.week_range(day, start_time, minutes)
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.TRAINERS_FREE, {
+                    'slots': TrainerRoster.slots(day, start_time, minutes),
+                    'exclude': list(exclude),
+                    'start': start,
+                    'end': end,
+                })
+                return cursor.fetchall()
+        return []
@@ -0,0 +1,96 @@
+"""
+The UnitOfWork class collects the edits made on a screen and writes them in a single transaction when
+the screen finishes, instead of issuing an UPDATE and a commit for every field the user changes.
+
+Rows are tracked with the registered statement that saves them (an UPDATE, or an upsert for rows that
+may not exist yet). Edits only change the in-memory values; flush() then runs one statement per row
+that actually changed and commits once. Rows whose values end up unchanged are not written at all.
+
+A statement with an {assignments} placeholder (e.g. `UPDATE t SET {assignments} WHERE id = %s`) writes only
+the fields that were edited, so columns changed elsewhere while the screen was open are left alone. Its
+params(row) then builds just the WHERE parameters.
+
+Key Functionalities:
+- Tracked: A row's values together with the values it was loaded with.
+- Tracked.write(): The statement and parameters that save the row.
+- track(values, statement, params, new): Starts tracking a row and returns it for editing.
+- flush(): Saves every changed row in one transaction and returns how many rows were written.
+"""
+
+import psycopg2
+
+from DatabaseManager import DBManager
+
+
+class Tracked:
+    def __init__(self, values, statement, params, new=False):
+        self._original = dict(values)
+        self._values = dict(values)
+        self.statement = statement
+        self.params = params  # Builds the statement's parameters from the row
+        self.new = new  # Rows that do not exist in the database yet are always written
+
+    def __getitem__(self, field):
+        return self._values[field]
+
+    def __setitem__(self, field, value):
+        self._values[field] = value
+
+    def get(self, field, default=None):
+        return self._values.get(field, default)
+
+    def items(self):
+        return self._values.items()
+
+    def changes(self):
+        """ Returns {field: new value} for every field edited since the row was loaded or last saved. """
+        return {field: value for field, value in self._values.items() if self._original.get(field) != value}
+
+    def is_dirty(self):
+        return self.new or bool(self.changes())
+
+    def write(self):
+        """ Returns (statement, parameters) for saving the row; {assignments} becomes the changed fields only. """
+        if '{assignments}' not in self.statement:
+            return self.statement, self.params(self)
+        changes = self.changes()
+        assignments = ', '.join(f"{field} = %s" for field in changes)
+        return self.statement.format(assignments=assignments), (*changes.values(), *self.params(self))
+
+    def mark_saved(self):
+        self._original = dict(self._values)
+        self.new = False
+
+
+class UnitOfWork:
+    def __init__(self):
+        self._tracked = []
+
+    def track(self, values, statement, params, new=False):
+        """ Tracks a row saved by statement, whose parameters params(row) builds, and returns it for editing. """
+        row = Tracked(values, statement, params, new)
+        self._tracked.append(row)
+        return row
+
+    def is_dirty(self):
+        return any(row.is_dirty() for row in self._tracked)
+
+    def flush(self):
+        """ Writes every changed row in one transaction. Returns the number of rows written, or None on failure. """
+        pending = [row for row in self._tracked if row.is_dirty()]
+        if not pending:
+            return 0
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    for row in pending:
+                        cursor.execute(*row.write())
+                    conn.commit()
+                except psycopg2.Error as e:
+                    conn.rollback()
+                    print(f"Failed to save changes, nothing was written: {e}")
+                    return None
+                for row in pending:
+                    row.mark_saved()
+                return len(pending)
+        return None
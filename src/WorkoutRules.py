@@ -0,0 +1,72 @@
+"""
+The WorkoutRules class holds the rules of a gym visit: how equipment wears, when worn equipment injures,
+what a workout and an injury do to a member's stats and how much stamina a rest gives back. The rules are
+pure functions of the stats and a random number generator. They never print, prompt or touch the
+database, so Fitness applies them to a real visit and Simulator plays them over a whole club of simulated
+members to tune the numbers below.
+
+Key Functionalities:
+- worn(quality, wear): The quality an item is left with after one use.
+- injures(quality, rng): Whether a use of an item at that quality injures the member.
+- workout(stats, rng): The stat picked for improvement this session (if any) and the change to each stat.
+- injury(stats): The stats after an injury.
+- rested_stamina(fitness_level): The stamina a member is reset to after an injury.
+"""
+
+import random
+
+
+class WorkoutRules:
+    MAX_QUALITY = 10  # Quality of new or repaired equipment
+    MIN_QUALITY = 1  # Wear stops here (see the CHECK on equipment.quality)
+    WEAR_PER_USE = 2  # Quality lost per use
+    DANGER_QUALITY = 3  # Equipment below this quality can injure members
+    INJURY_CHANCE = 0.9  # Chance that a use of dangerous equipment injures the member
+    INJURY_PENALTY = 1  # Points an injury takes off each improvable stat
+    INJURED_STAMINA = 0
+
+    MIN_STAT = 1
+    MAX_STAT = 10
+    IMPROVE_CHANCE = 0.5  # Chance that a workout improves one stat
+    IMPROVABLE_STATS = ('fitness_level', 'strength', 'flexibility', 'endurance')
+    STAMINA_PER_WORKOUT = 2
+    RESTED_STAMINA = {1: 5, 2: 7, 3: 10}  # By fitness level: Beginner, Intermediate, Advanced
+    DEFAULT_RESTED_STAMINA = 5
+
+    @staticmethod
+    def worn(quality, wear=WEAR_PER_USE):
+        return max(WorkoutRules.MIN_QUALITY, quality - wear)
+
+    @staticmethod
+    def injures(quality, rng=random):
+        """ Dangerous equipment injures INJURY_CHANCE of the time; safe equipment never does. """
+        return quality < WorkoutRules.DANGER_QUALITY and rng.random() < WorkoutRules.INJURY_CHANCE
+
+    @staticmethod
+    def workout(stats, rng=random):
+        """
+        Returns (stat, deltas): the stat picked for improvement, or None if the session brought none, and the
+        change to each stat. The picked stat is left out of deltas when it is already at MAX_STAT.
+        """
+        deltas = {}
+        stat = None
+        if rng.random() < WorkoutRules.IMPROVE_CHANCE:
+            stat = rng.choice(WorkoutRules.IMPROVABLE_STATS)
+            if stats[stat] < WorkoutRules.MAX_STAT:
+                deltas[stat] = 1
+        deltas['stamina'] = max(0, stats['stamina'] - WorkoutRules.STAMINA_PER_WORKOUT) - stats['stamina']
+        return stat, deltas
+
+    @staticmethod
+    def injury(stats):
+        """ Returns the stats after an injury: INJURY_PENALTY off each improvable stat (down to MIN_STAT) and INJURED_STAMINA. """
+        injured = dict(stats)
+        for stat in WorkoutRules.IMPROVABLE_STATS:
+            injured[stat] = max(WorkoutRules.MIN_STAT, stats[stat] - WorkoutRules.INJURY_PENALTY)
+        injured['stamina'] = WorkoutRules.INJURED_STAMINA
+        injured['is_injured'] = True
+        return injured
+
+    @staticmethod
+    def rested_stamina(fitness_level):
+        return WorkoutRules.RESTED_STAMINA.get(fitness_level, WorkoutRules.DEFAULT_RESTED_STAMINA)
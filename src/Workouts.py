@@ -0,0 +1,79 @@
+"""
+The Workouts class records every gym session in the append-only `workouts` history and shows members
+their progress. Sessions are buffered by a WriteBehind and inserted in batches, so a workout in
+navigate_gym never waits on the database. Each inserted batch is folded by a trigger into per-member
+aggregates (`workout_summaries`, `workout_weeks` and `workout_equipment`), so the progress screen reads
+a handful of rows no matter how long a member's history is.
+
+Key Functionalities:
+- record(email, equipment_id, deltas, injured): Buffers one workout with the stat changes it caused.
+- progress(email): Returns the member's totals, recent weekly sessions and favourite equipment.
+- show_progress(email): Displays the progress screen on the member dashboard.
+"""
+
+import datetime
+
+from ClearScreen import clear_screen
+from DatabaseManager import DBManager
+from QueryRegistry import Queries
+from WriteBehind import WriteBehind
+
+
+class Workouts:
+    FLUSH_EVENTS = 50  # Workouts buffered before a batch is written
+    FLUSH_MS = 2000  # Longest a buffered workout waits before it is written
+    STATS = ('fitness_level', 'strength', 'flexibility', 'endurance', 'stamina')
+    RECENT_WEEKS = 8
+    FAVOURITES = 3
+
+    log = WriteBehind(Queries.WORKOUTS_INSERT, FLUSH_EVENTS, FLUSH_MS)
+
+    @staticmethod
+    def record(email, equipment_id, deltas, injured=False):
+        """ Buffers one workout. deltas maps stat names to how much the workout changed them. """
+        Workouts.log.add((email, equipment_id, datetime.datetime.now(),
+                          *(deltas.get(stat, 0) for stat in Workouts.STATS), injured))
+
+    @staticmethod
+    def progress(email):
+        """ Returns (summary, weeks, favourites) for the member, including any workouts still buffered. """
+        Workouts.log.flush()
+        with DBManager.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.execute(Queries.WORKOUT_SUMMARY_BY_EMAIL, (email,))
+                summary = cursor.fetchone()
+                cursor.execute(Queries.WORKOUT_WEEKS_BY_EMAIL, (email, Workouts.RECENT_WEEKS))
+                weeks = cursor.fetchall()
+                cursor.execute(Queries.WORKOUT_FAVOURITE_EQUIPMENT, (email, Workouts.FAVOURITES))
+                favourites = cursor.fetchall()
+                return summary, weeks, favourites
+        return None, [], []
+
+    @staticmethod
+    def show_progress(email):
+        clear_screen()
+        summary, weeks, favourites = Workouts.progress(email)
+        print("====================================================")
+        print("My Workout Progress")
+        if not summary:
+            print("No workouts recorded yet. Head to the gym to start tracking your progress!")
+            input("Press Enter to go back...")
+            return
+
+        print(f"Sessions: {summary['sessions']} (since {summary['first_workout_at']:%Y-%m-%d}, last {summary['last_workout_at']:%Y-%m-%d})")
+        print(f"Injuries: {summary['injuries']}")
+        print("| {:<15} | {:^10} |".format("Stat", "Change"))
+        for stat in Workouts.STATS[:-1]:
+            print("| {:<15} | {:^+10} |".format(stat.replace('_', ' ').capitalize(), summary[f'{stat}_gain']))
+
+        if weeks:
+            print("\nSessions per week:")
+            for week in weeks:
+                print(f"  Week of {week['week_start']:%Y-%m-%d}: {week['sessions']}")
+
+        if favourites:
+            print("\nFavourite equipment:")
+            for favourite in favourites:
+                print(f"  {favourite['equipment_name']} ({favourite['uses']} uses)")
+
+        input("\nPress Enter to go back...")
@@ -0,0 +1,158 @@
+"""
+The WriteBehind class buffers rows in memory and inserts them in batches from a background thread, so
+code on an interactive path (such as a workout in navigate_gym) only appends to a list instead of
+waiting on the database. A batch is written as soon as the buffer holds max_events rows, and otherwise
+every max_delay_ms, so no row waits longer than that. Anything still buffered is written when the
+program exits.
+
+When the database cannot be reached or the connection fails mid-batch, the unwritten rows stay in the
+buffer and are retried with the next batch. A batch rejected for its data (an integrity or data error,
+such as a visit by a member who has just been deleted) is split in halves and retried until the rows that
+cannot be written are isolated; those are logged and dropped, so one bad row never holds back the rows
+queued behind it. The background thread keeps running through such failures.
+
+WriteBehindCounters is the variant for counters: rows with the same key are summed in memory, so a
+batch holds one upsert per key however many events were recorded.
+
+Key Functionalities:
+- add(row): Buffers one row (a tuple matching the statement's VALUES template).
+- flush(): Writes everything buffered in one transaction and returns the number of rows written.
+- close(): Stops the background thread and writes whatever is left.
+- WriteBehindCounters: Sums the counts of rows sharing a key before they are written; pending(key) reads them back.
+"""
+
+import atexit
+import threading
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from DatabaseManager import DBManager
+
+
+class WriteBehind:
+    def __init__(self, statement, max_events=100, max_delay_ms=1000):
+        self.statement = statement  # INSERT ... VALUES %s, filled by execute_values
+        self.max_events = max_events
+        self.max_delay_ms = max_delay_ms
+        self._pending = []
+        self._events = 0  # Rows added since the last batch was taken
+        self._lock = threading.Lock()  # Guards _pending and _events
+        self._flush_lock = threading.Lock()  # One batch in flight at a time
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = None
+        atexit.register(self.close)
+
+    def add(self, row):
+        with self._lock:
+            self._buffer(row)
+            self._events += 1
+            full = self._events >= self.max_events
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.max_delay_ms / 1000)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:  # An unexpected error must not stop the writer; the rows stay buffered
+                print(f"Buffered write failed, will retry: {e}")
+
+    def flush(self):
+        """ Writes every buffered row, in one transaction unless some rows are rejected. Returns the number written. """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._drain()
+                self._events = 0
+            if not batch:
+                return 0
+
+            written = 0
+            settled = [False] * len(batch)  # Written, or dropped as unwritable
+            try:
+                with DBManager.connection() as conn:
+                    with conn.cursor() as cursor:
+                        written = self._write(conn, cursor, batch, 0, len(batch), settled)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError, RuntimeError) as e:  # DBManager.connection() raises RuntimeError when it cannot connect
+                print(f"Failed to write {settled.count(False)} buffered rows, will retry: {e}")
+            finally:
+                unsettled = [row for row, done in zip(batch, settled) if not done]
+                if unsettled:
+                    with self._lock:
+                        self._restore(unsettled)
+            return written
+
+    def _write(self, conn, cursor, batch, start, end, settled):
+        """
+        Writes batch[start:end] and marks the rows written or dropped in settled. A rejected range is split in
+        halves; a single row that is still rejected is dropped. Connection errors propagate, leaving the rest unsettled.
+        """
+        try:
+            execute_values(cursor, self.statement, batch[start:end], page_size=self.max_events)
+            conn.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise
+        except psycopg2.Error as e:
+            conn.rollback()
+            if end - start == 1:
+                print(f"Dropped a buffered row that cannot be written: {batch[start]}: {e}")
+                settled[start] = True
+                return 0
+            middle = (start + end) // 2
+            return (self._write(conn, cursor, batch, start, middle, settled)
+                    + self._write(conn, cursor, batch, middle, end, settled))
+        settled[start:end] = [True] * (end - start)
+        return end - start
+
+    def _buffer(self, row):
+        self._pending.append(row)
+
+    def _drain(self):
+        """ Takes every buffered row as the next batch. """
+        batch, self._pending = self._pending, []
+        return batch
+
+    def _restore(self, batch):
+        """ Puts a batch that failed to write back into the buffer. """
+        self._pending[:0] = batch  # Keep the original order ahead of newer rows
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.max_delay_ms / 1000 + 5)
+        self.flush()
+
+
+class WriteBehindCounters(WriteBehind):
+    """ WriteBehind whose rows are (*key, *counts); counts for the same key are summed before writing. """
+
+    def __init__(self, statement, key_size, max_events=100, max_delay_ms=1000):
+        super().__init__(statement, max_events, max_delay_ms)
+        self.key_size = key_size
+        self._pending = {}
+
+    def _buffer(self, row):
+        key, counts = tuple(row[:self.key_size]), tuple(row[self.key_size:])
+        current = self._pending.get(key)
+        self._pending[key] = counts if current is None else tuple(a + b for a, b in zip(current, counts))
+
+    def pending(self, key):
+        """ Returns the counts buffered for key and not yet taken into a batch, or None. """
+        with self._lock:
+            return self._pending.get(tuple(key))
+
+    def _drain(self):
+        batch = [key + counts for key, counts in self._pending.items()]
+        self._pending = {}
+        return batch
+
+    def _restore(self, batch):
+        for row in batch:
+            self._buffer(row)
@@ -13,6 +13,8 @@ from Guest import Guest
 from Member import Member
 from Trainer import Trainer
 from Admin import Admin
+from DayPass import DayPass
+from PaymentArchive import PaymentArchive
 
 def main_menu():
     
@@ -46,6 +48,8 @@ def main_menu():
 def main():
     # Admin.add_admin_password()
     # print("thonk")
+    DayPass.warn_if_unconfigured()
+    PaymentArchive.ensure_upcoming()
     main_menu()
 
 if __name__ == "__main__":
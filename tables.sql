@@ -10,6 +10,8 @@ CREATE TABLE member_accounts (
     age INT
 );
 
+CREATE INDEX member_accounts_name_idx ON member_accounts (name);
+
 -- Exercise Routines
 CREATE TABLE exercise_routines (
     email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email),
@@ -18,18 +20,34 @@ CREATE TABLE exercise_routines (
     routine3 TEXT
 );
 
--- Fitness Achievements
+-- Achievement Catalog (each achievement's id is its bit position in fitness_achievements.bits)
+CREATE TABLE achievement_catalog (
+    achievement_id SMALLINT PRIMARY KEY CHECK (achievement_id BETWEEN 0 AND 62),
+    name VARCHAR(255) NOT NULL UNIQUE
+);
+
+INSERT INTO achievement_catalog (achievement_id, name) VALUES
+    (0, 'First fitness goal achieved'),
+    (1, 'Never skipped leg day'),
+    (2, 'Can do pushup'),
+    (3, 'Can do pullup'),
+    (4, 'Can touch toes'),
+    (5, 'Achieved weight loss goal'),
+    (6, 'Achieved muscle gain goal');
+
+-- Fitness Achievements (one bit per earned achievement; members without a row have earned none)
 CREATE TABLE fitness_achievements (
     email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email),
-    first_fitness_goal_achieved BOOLEAN,
-    never_skipped_leg_day BOOLEAN,
-    can_do_pushup BOOLEAN,
-    can_do_pullup BOOLEAN,
-    can_touch_toes BOOLEAN,
-    achieved_weight_loss_goal BOOLEAN,
-    achieved_muscle_gain_goal BOOLEAN
+    bits BIGINT NOT NULL DEFAULT 0
 );
 
+-- Ids of the achievements set in a bitmask, so "who has X" can be answered from a GIN index
+CREATE FUNCTION achievement_ids(bits BIGINT) RETURNS INT[] AS $$
+    SELECT COALESCE(array_agg(id), '{}') FROM generate_series(0, 62) id WHERE bits & (1::BIGINT << id) <> 0
+$$ LANGUAGE SQL IMMUTABLE;
+
+CREATE INDEX fitness_achievements_ids_idx ON fitness_achievements USING GIN (achievement_ids(bits));
+
 -- Health Statistics
 CREATE TABLE health_statistics (
     email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email),
@@ -40,9 +58,174 @@ CREATE TABLE health_statistics (
     stamina INT CHECK (stamina BETWEEN 0 AND 10),
     has_water BOOLEAN,
     has_protein BOOLEAN,
-    is_injured BOOLEAN
+    is_injured BOOLEAN,
+    stamina_updated_at TIMESTAMP NOT NULL DEFAULT now(), -- Stamina recovers from this moment on (see Recovery.py)
+    injured_at TIMESTAMP -- When the current injury happened
+);
+
+-- Stamps the recovery clocks whenever stamina or the injury flag changes, so the gym screens need no extra
+-- writes. The recovery job sets stamina_updated_at itself, to carry over the part of an hour not yet recovered.
+CREATE FUNCTION stamp_health_statistics() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' OR NEW.stamina IS DISTINCT FROM OLD.stamina
+                          AND NEW.stamina_updated_at IS NOT DISTINCT FROM OLD.stamina_updated_at THEN
+        NEW.stamina_updated_at := now();
+    END IF;
+    IF NOT COALESCE(NEW.is_injured, FALSE) THEN
+        NEW.injured_at := NULL;
+    ELSIF TG_OP = 'INSERT' OR NOT COALESCE(OLD.is_injured, FALSE) THEN
+        NEW.injured_at := now();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER health_statistics_stamp
+    BEFORE INSERT OR UPDATE OF stamina, is_injured ON health_statistics
+    FOR EACH ROW EXECUTE FUNCTION stamp_health_statistics();
+
+-- Leaderboard Entries (one row per member, ranked stat and cohort, kept in step with health_statistics by triggers
+-- so a leaderboard page is an index range scan instead of a sort over the whole club)
+CREATE TABLE leaderboard_entries (
+    stat VARCHAR(50) NOT NULL,
+    cohort VARCHAR(50) NOT NULL, -- 'all', 'gender:<gender>' or 'age:<band>'
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    score INT NOT NULL,
+    PRIMARY KEY (stat, cohort, email)
 );
 
+CREATE INDEX leaderboard_entries_rank_idx ON leaderboard_entries (stat, cohort, score, email);
+CREATE INDEX leaderboard_entries_email_idx ON leaderboard_entries (email);
+
+-- Leaderboard Score Counts (how many entries each leaderboard has per score, kept by statement triggers on
+-- leaderboard_entries, so a member's position adds up at most one row per score instead of counting every
+-- member ranked above them)
+CREATE TABLE leaderboard_score_counts (
+    stat VARCHAR(50) NOT NULL,
+    cohort VARCHAR(50) NOT NULL,
+    score INT NOT NULL,
+    entries INT NOT NULL,
+    PRIMARY KEY (stat, cohort, score)
+);
+
+CREATE FUNCTION age_band(age INT) RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN age IS NULL THEN NULL
+        WHEN age < 18 THEN 'under 18'
+        WHEN age < 30 THEN '18-29'
+        WHEN age < 40 THEN '30-39'
+        WHEN age < 50 THEN '40-49'
+        WHEN age < 60 THEN '50-59'
+        ELSE '60+'
+    END
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- One member's entries as their current stats, gender and age rank them
+CREATE FUNCTION member_leaderboard_scores(member_email VARCHAR) RETURNS TABLE (stat TEXT, cohort TEXT, score INT) AS $$
+    SELECT s.stat, c.cohort, s.score
+    FROM health_statistics h
+    JOIN member_accounts m ON m.email = h.email
+    CROSS JOIN LATERAL (VALUES ('fitness_level', h.fitness_level), ('strength', h.strength),
+                               ('flexibility', h.flexibility), ('endurance', h.endurance)) s (stat, score)
+    CROSS JOIN LATERAL (VALUES ('all'), ('gender:' || m.gender), ('age:' || age_band(m.age))) c (cohort)
+    WHERE h.email = member_email
+      AND h.email NOT IN ('guest', 'admin') -- Shared guest and admin rows are not members
+      AND s.score IS NOT NULL AND c.cohort IS NOT NULL
+$$ LANGUAGE SQL STABLE;
+
+-- Brings one member's entries up to date. Entries for cohorts the member left are deleted and changed
+-- scores are updated in place, so a workout only moves the member between two score counts.
+CREATE FUNCTION refresh_leaderboard(member_email VARCHAR) RETURNS VOID AS $$
+    DELETE FROM leaderboard_entries e
+    WHERE e.email = member_email
+      AND NOT EXISTS (SELECT 1 FROM member_leaderboard_scores(member_email) s WHERE s.stat = e.stat AND s.cohort = e.cohort);
+    INSERT INTO leaderboard_entries AS e (stat, cohort, email, score)
+    SELECT s.stat, s.cohort, member_email, s.score
+    FROM member_leaderboard_scores(member_email) s
+    ON CONFLICT (stat, cohort, email) DO UPDATE SET score = EXCLUDED.score
+    WHERE e.score <> EXCLUDED.score;
+$$ LANGUAGE SQL;
+
+-- Adds the changes to the score counts, locking the count rows in key order so that concurrent workouts
+-- queue on a shared count instead of deadlocking
+CREATE FUNCTION add_leaderboard_counts(stats VARCHAR[], cohorts VARCHAR[], scores INT[], changes INT[]) RETURNS VOID AS $$
+    INSERT INTO leaderboard_score_counts AS c (stat, cohort, score, entries)
+    SELECT d.stat, d.cohort, d.score, SUM(d.change)
+    FROM unnest(stats, cohorts, scores, changes) d (stat, cohort, score, change)
+    GROUP BY d.stat, d.cohort, d.score
+    HAVING SUM(d.change) <> 0
+    ORDER BY d.stat, d.cohort, d.score
+    ON CONFLICT (stat, cohort, score) DO UPDATE SET entries = c.entries + EXCLUDED.entries;
+$$ LANGUAGE SQL;
+
+CREATE FUNCTION leaderboard_entries_count() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(1))
+        FROM new_entries;
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(-1))
+        FROM old_entries;
+    ELSE
+        PERFORM add_leaderboard_counts(array_agg(stat), array_agg(cohort), array_agg(score), array_agg(change))
+        FROM (SELECT stat, cohort, score, 1 AS change FROM new_entries
+              UNION ALL
+              SELECT stat, cohort, score, -1 FROM old_entries) d;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION health_statistics_leaderboard() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM leaderboard_entries WHERE email = OLD.email;
+    ELSE
+        PERFORM refresh_leaderboard(NEW.email);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION member_accounts_leaderboard() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM refresh_leaderboard(NEW.email);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER leaderboard_entries_count_insert
+    AFTER INSERT ON leaderboard_entries
+    REFERENCING NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+CREATE TRIGGER leaderboard_entries_count_update
+    AFTER UPDATE ON leaderboard_entries
+    REFERENCING OLD TABLE AS old_entries NEW TABLE AS new_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+CREATE TRIGGER leaderboard_entries_count_delete
+    AFTER DELETE ON leaderboard_entries
+    REFERENCING OLD TABLE AS old_entries
+    FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_entries_count();
+
+CREATE TRIGGER health_statistics_leaderboard
+    AFTER INSERT OR DELETE ON health_statistics
+    FOR EACH ROW EXECUTE FUNCTION health_statistics_leaderboard();
+
+CREATE TRIGGER health_statistics_leaderboard_update
+    AFTER UPDATE OF fitness_level, strength, flexibility, endurance ON health_statistics
+    FOR EACH ROW
+    WHEN ((OLD.fitness_level, OLD.strength, OLD.flexibility, OLD.endurance)
+          IS DISTINCT FROM (NEW.fitness_level, NEW.strength, NEW.flexibility, NEW.endurance))
+    EXECUTE FUNCTION health_statistics_leaderboard();
+
+CREATE TRIGGER member_accounts_leaderboard
+    AFTER UPDATE OF gender, age ON member_accounts
+    FOR EACH ROW
+    WHEN ((OLD.gender, OLD.age) IS DISTINCT FROM (NEW.gender, NEW.age))
+    EXECUTE FUNCTION member_accounts_leaderboard();
+
 -- Fitness Goals
 CREATE TABLE fitness_goals (
     email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email),
@@ -60,27 +243,107 @@ CREATE TABLE member_health_metrics (
     resting_heart_rate INT
 );
 
+-- Member Badges (the door badge a member checks in with; only a SHA-256 hash of the badge token is stored)
+CREATE TABLE member_badges (
+    badge_hash CHAR(64) PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    issued_at TIMESTAMP NOT NULL DEFAULT now(),
+    revoked_at TIMESTAMP
+);
+
+CREATE UNIQUE INDEX member_badges_active_idx ON member_badges (email) WHERE revoked_at IS NULL;
+
+-- Visits (one row per check-in at the door, written in batches by the app)
+CREATE TABLE visits (
+    visit_id BIGSERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    checked_in_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX visits_email_idx ON visits (email, checked_in_at);
+
+-- Badge changes are announced on `badge_changes` so check-in points drop the badge from memory
+CREATE FUNCTION notify_badge_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('badge_changes', '');
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('badge_changes', OLD.badge_hash);
+    ELSE
+        PERFORM pg_notify('badge_changes', NEW.badge_hash);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER member_badges_change
+    AFTER INSERT OR UPDATE OR DELETE ON member_badges
+    FOR EACH ROW EXECUTE FUNCTION notify_badge_change();
+
+CREATE TRIGGER member_badges_truncate
+    AFTER TRUNCATE ON member_badges
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_badge_change();
+
+-- Day Passes (one-day guest passes; the pass token is signed by the app, so only the id and expiry are stored)
+CREATE TABLE day_passes (
+    pass_id BIGSERIAL PRIMARY KEY,
+    issued_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL -- An absolute moment, compared with the token's UTC expiry and the server's now()
+);
+
+-- Expired passes are purged oldest first in small batches
+CREATE INDEX day_passes_expires_idx ON day_passes (expires_at);
+
+-- Trainer availability is a weekly bitmask of hour slots: bit day * 24 + hour (Monday = day 0, leftmost bit first)
+CREATE FUNCTION availability_mask(days TEXT[], from_hour INT, to_hour INT) RETURNS BIT(168) AS $$
+    SELECT string_agg(CASE WHEN (ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])[s / 24 + 1] = ANY(days)
+                            AND s % 24 >= from_hour AND s % 24 < to_hour THEN '1' ELSE '0' END, '' ORDER BY s)::BIT(168)
+    FROM generate_series(0, 167) s
+$$ LANGUAGE SQL IMMUTABLE;
+
+-- Slots set in an availability mask, so "who is free for these slots" can be answered from a GIN index
+CREATE FUNCTION availability_slots(availability BIT(168)) RETURNS SMALLINT[] AS $$
+    SELECT COALESCE(array_agg(s::SMALLINT ORDER BY s), '{}') FROM generate_series(0, 167) s WHERE get_bit(availability, s) = 1
+$$ LANGUAGE SQL IMMUTABLE;
+
 -- Trainer Accounts
 CREATE TABLE trainer_accounts (
     trainer_id SERIAL PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
     password TEXT,
-    monday_available BOOLEAN,
-    tuesday_available BOOLEAN,
-    wednesday_available BOOLEAN,
-    thursday_available BOOLEAN,
-    friday_available BOOLEAN,
-    saturday_available BOOLEAN,
-    sunday_available BOOLEAN
+    availability BIT(168) NOT NULL DEFAULT B'0'::BIT(168)
 );
 
+CREATE INDEX trainer_accounts_availability_idx ON trainer_accounts USING GIN (availability_slots(availability));
+
 -- Rooms
 CREATE TABLE rooms (
     room_id SERIAL PRIMARY KEY,
     room_name VARCHAR(255) NOT NULL,
-    room_availability BOOLEAN
+    capacity INT NOT NULL DEFAULT 30 CHECK (capacity >= 0) -- Members allowed in at once; 0 closes the room
+);
+
+-- Room Occupancy (each app process upserts its own live head count per room; see RoomOccupancy.py)
+CREATE TABLE room_occupancy (
+    instance_id TEXT NOT NULL,
+    room_id INT NOT NULL REFERENCES rooms(room_id) ON DELETE CASCADE,
+    occupants INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT now(),
+    PRIMARY KEY (instance_id, room_id)
 );
 
+-- Schedules are stored as the minutes since Monday 00:00 a session covers, so overlaps and "what is on now"
+-- are range operators answered by GiST indexes (btree_gist lets room_id and trainer_id share those indexes)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE FUNCTION session_range(day_of_week VARCHAR, start_time TIME, duration INT) RETURNS INT4RANGE AS $$
+    SELECT CASE WHEN day_of_week IS NOT NULL AND start_time IS NOT NULL THEN
+        int4range(m, m + GREATEST(COALESCE(duration, 0), 0))
+    END
+    FROM (SELECT (array_position(ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']::VARCHAR[], day_of_week) - 1) * 1440
+                 + (EXTRACT(EPOCH FROM start_time) / 60)::INT AS m) s
+$$ LANGUAGE SQL IMMUTABLE;
+
 -- Bookings
 CREATE TABLE bookings (
     booking_id SERIAL PRIMARY KEY,
@@ -88,9 +351,16 @@ CREATE TABLE bookings (
     room_id INT NOT NULL REFERENCES rooms(room_id),
     duration INT,
     day_of_week VARCHAR(3) CHECK (day_of_week IN ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')),
-    start_time TIME
+    start_time TIME,
+    week_slot INT4RANGE GENERATED ALWAYS AS (session_range(day_of_week, start_time, duration)) STORED,
+    CONSTRAINT bookings_room_overlap EXCLUDE USING GIST (room_id WITH =, week_slot WITH &&),
+    CONSTRAINT bookings_trainer_overlap EXCLUDE USING GIST (trainer_id WITH =, week_slot WITH &&),
+    CONSTRAINT bookings_within_week CHECK (upper(week_slot) <= 10080) -- Ranges do not wrap, so sessions end by Sunday midnight
 );
 
+CREATE INDEX bookings_room_id_idx ON bookings (room_id);
+CREATE INDEX bookings_trainer_id_idx ON bookings (trainer_id);
+
 -- Equipment
 CREATE TABLE equipment (
     equipment_id SERIAL PRIMARY KEY,
@@ -99,6 +369,172 @@ CREATE TABLE equipment (
     quality INT CHECK (quality BETWEEN 1 AND 10)
 );
 
+CREATE INDEX equipment_room_id_idx ON equipment (room_id, equipment_id);
+CREATE INDEX equipment_quality_idx ON equipment (quality);
+
+-- Equipment alerts: notifies listening admin sessions whenever an item needing attention (quality below 4) changes,
+-- with a NULL quality once it no longer needs attention
+CREATE FUNCTION notify_equipment_alert() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        IF OLD.quality < 4 THEN
+            PERFORM pg_notify('equipment_alerts', json_build_object('equipment_id', OLD.equipment_id, 'quality', NULL)::TEXT);
+        END IF;
+    ELSIF NEW.quality < 4 OR (TG_OP = 'UPDATE' AND OLD.quality < 4) THEN
+        PERFORM pg_notify('equipment_alerts', json_build_object(
+            'equipment_id', NEW.equipment_id, 'quality', CASE WHEN NEW.quality < 4 THEN NEW.quality END)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER equipment_alert
+    AFTER INSERT OR UPDATE OF quality OR DELETE ON equipment
+    FOR EACH ROW EXECUTE FUNCTION notify_equipment_alert();
+
+-- Catalog changes: notifies listening sessions when rooms, trainers or equipment are edited so their cached
+-- catalogs can be dropped. Equipment changes name the room affected; wear from members (a quality drop) is not
+-- a catalog change, but a repair is.
+CREATE FUNCTION notify_catalog_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'equipment' AND TG_LEVEL = 'ROW' THEN
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('catalog_changes', json_build_object('table', 'equipment', 'room_id', OLD.room_id)::TEXT);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM pg_notify('catalog_changes', json_build_object('table', 'equipment', 'room_id', NEW.room_id)::TEXT);
+        END IF;
+    ELSE
+        PERFORM pg_notify('catalog_changes', json_build_object('table', TG_TABLE_NAME)::TEXT);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER rooms_catalog_change
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON rooms
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+
+CREATE TRIGGER trainer_accounts_catalog_change
+    AFTER INSERT OR UPDATE OF name, availability OR DELETE OR TRUNCATE ON trainer_accounts
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+
+CREATE TRIGGER equipment_catalog_change
+    AFTER INSERT OR DELETE ON equipment
+    FOR EACH ROW EXECUTE FUNCTION notify_catalog_change();
+
+CREATE TRIGGER equipment_catalog_update
+    AFTER UPDATE OF equipment_name, room_id, quality ON equipment
+    FOR EACH ROW
+    WHEN (OLD.equipment_name IS DISTINCT FROM NEW.equipment_name
+          OR OLD.room_id IS DISTINCT FROM NEW.room_id
+          OR NEW.quality > OLD.quality)
+    EXECUTE FUNCTION notify_catalog_change();
+
+CREATE TRIGGER equipment_catalog_truncate
+    AFTER TRUNCATE ON equipment
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change();
+
+-- Workouts (append-only history of gym sessions, written in batches by the app)
+CREATE TABLE workouts (
+    workout_id BIGSERIAL PRIMARY KEY,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    equipment_id INT REFERENCES equipment(equipment_id) ON DELETE SET NULL,
+    performed_at TIMESTAMP NOT NULL,
+    fitness_level_delta INT NOT NULL DEFAULT 0,
+    strength_delta INT NOT NULL DEFAULT 0,
+    flexibility_delta INT NOT NULL DEFAULT 0,
+    endurance_delta INT NOT NULL DEFAULT 0,
+    stamina_delta INT NOT NULL DEFAULT 0,
+    injured BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX workouts_email_idx ON workouts (email, performed_at);
+CREATE INDEX workouts_equipment_id_idx ON workouts (equipment_id);
+
+-- Workout aggregates, maintained incrementally from each inserted batch so progress never scans the history
+CREATE TABLE workout_summaries (
+    email VARCHAR(255) PRIMARY KEY REFERENCES member_accounts(email) ON DELETE CASCADE,
+    sessions INT NOT NULL DEFAULT 0,
+    injuries INT NOT NULL DEFAULT 0,
+    fitness_level_gain INT NOT NULL DEFAULT 0,
+    strength_gain INT NOT NULL DEFAULT 0,
+    flexibility_gain INT NOT NULL DEFAULT 0,
+    endurance_gain INT NOT NULL DEFAULT 0,
+    first_workout_at TIMESTAMP,
+    last_workout_at TIMESTAMP
+);
+
+CREATE TABLE workout_weeks (
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    week_start DATE NOT NULL,
+    sessions INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, week_start)
+);
+
+CREATE TABLE workout_equipment (
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    equipment_id INT NOT NULL REFERENCES equipment(equipment_id) ON DELETE CASCADE,
+    uses INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (email, equipment_id)
+);
+
+CREATE INDEX workout_equipment_uses_idx ON workout_equipment (email, uses);
+CREATE INDEX workout_equipment_equipment_id_idx ON workout_equipment (equipment_id);
+
+-- Folds each inserted batch of workouts into the aggregates, set-based over the batch
+CREATE FUNCTION summarize_workouts() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO workout_summaries AS s (email, sessions, injuries, fitness_level_gain, strength_gain, flexibility_gain,
+                                        endurance_gain, first_workout_at, last_workout_at)
+    SELECT email, COUNT(*), COUNT(*) FILTER (WHERE injured), SUM(fitness_level_delta), SUM(strength_delta),
+           SUM(flexibility_delta), SUM(endurance_delta), MIN(performed_at), MAX(performed_at)
+    FROM new_workouts
+    GROUP BY email
+    ON CONFLICT (email) DO UPDATE SET
+        sessions = s.sessions + EXCLUDED.sessions,
+        injuries = s.injuries + EXCLUDED.injuries,
+        fitness_level_gain = s.fitness_level_gain + EXCLUDED.fitness_level_gain,
+        strength_gain = s.strength_gain + EXCLUDED.strength_gain,
+        flexibility_gain = s.flexibility_gain + EXCLUDED.flexibility_gain,
+        endurance_gain = s.endurance_gain + EXCLUDED.endurance_gain,
+        first_workout_at = LEAST(s.first_workout_at, EXCLUDED.first_workout_at),
+        last_workout_at = GREATEST(s.last_workout_at, EXCLUDED.last_workout_at);
+
+    INSERT INTO workout_weeks AS w (email, week_start, sessions)
+    SELECT email, date_trunc('week', performed_at)::DATE, COUNT(*)
+    FROM new_workouts
+    GROUP BY 1, 2
+    ON CONFLICT (email, week_start) DO UPDATE SET sessions = w.sessions + EXCLUDED.sessions;
+
+    INSERT INTO workout_equipment AS e (email, equipment_id, uses)
+    SELECT email, equipment_id, COUNT(*)
+    FROM new_workouts
+    WHERE equipment_id IS NOT NULL
+    GROUP BY 1, 2
+    ON CONFLICT (email, equipment_id) DO UPDATE SET uses = e.uses + EXCLUDED.uses;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER workouts_summarize
+    AFTER INSERT ON workouts
+    REFERENCING NEW TABLE AS new_workouts
+    FOR EACH STATEMENT EXECUTE FUNCTION summarize_workouts();
+
+-- Equipment Usage (hourly telemetry buckets, flushed from in-memory counters by the app)
+CREATE TABLE equipment_usage_hourly (
+    equipment_id INT NOT NULL REFERENCES equipment(equipment_id) ON DELETE CASCADE,
+    bucket_start TIMESTAMP NOT NULL, -- Start of the hour
+    uses INT NOT NULL DEFAULT 0,
+    wear INT NOT NULL DEFAULT 0, -- Quality points lost
+    repairs INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (equipment_id, bucket_start)
+);
+
+CREATE INDEX equipment_usage_hourly_bucket_start_idx ON equipment_usage_hourly (bucket_start);
+
 
 -- Class Schedule
 CREATE TABLE class_schedule (
@@ -108,15 +544,279 @@ CREATE TABLE class_schedule (
     room_id INT NOT NULL REFERENCES rooms(room_id),
     day_of_week VARCHAR(3) CHECK (day_of_week IN ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')),
     start_time TIME,
-    duration INT
+    duration INT,
+    capacity INT NOT NULL DEFAULT 20 CHECK (capacity >= 0),
+    week_slot INT4RANGE GENERATED ALWAYS AS (session_range(day_of_week, start_time, duration)) STORED,
+    CONSTRAINT class_schedule_room_overlap EXCLUDE USING GIST (room_id WITH =, week_slot WITH &&),
+    CONSTRAINT class_schedule_trainer_overlap EXCLUDE USING GIST (trainer_id WITH =, week_slot WITH &&),
+    CONSTRAINT class_schedule_within_week CHECK (upper(week_slot) <= 10080) -- Ranges do not wrap, so sessions end by Sunday midnight
+);
+
+CREATE INDEX class_schedule_trainer_id_idx ON class_schedule (trainer_id);
+CREATE INDEX class_schedule_room_id_idx ON class_schedule (room_id);
+
+-- Bookings and classes may not share a room or trainer at the same time either; exclusion constraints only
+-- cover one table, so this trigger checks the other one. Schedule edits are rare admin actions, so one
+-- advisory lock serializes them and two concurrent edits cannot both miss each other.
+CREATE FUNCTION check_schedule_overlap() RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.week_slot IS NULL OR isempty(NEW.week_slot) THEN
+        RETURN NULL;
+    END IF;
+    PERFORM pg_advisory_xact_lock(3005, 1);
+    IF TG_TABLE_NAME = 'bookings' THEN
+        PERFORM 1 FROM class_schedule
+        WHERE (room_id = NEW.room_id OR trainer_id = NEW.trainer_id) AND week_slot && NEW.week_slot;
+    ELSE
+        PERFORM 1 FROM bookings
+        WHERE (room_id = NEW.room_id OR trainer_id = NEW.trainer_id) AND week_slot && NEW.week_slot;
+    END IF;
+    IF FOUND THEN
+        RAISE EXCEPTION 'session on % at % overlaps a % in the same room or with the same trainer',
+            NEW.day_of_week, NEW.start_time, CASE WHEN TG_TABLE_NAME = 'bookings' THEN 'class' ELSE 'booking' END
+            USING ERRCODE = 'exclusion_violation';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_schedule_overlap
+    AFTER INSERT OR UPDATE OF room_id, trainer_id, day_of_week, start_time, duration ON bookings
+    FOR EACH ROW EXECUTE FUNCTION check_schedule_overlap();
+
+CREATE TRIGGER class_schedule_schedule_overlap
+    AFTER INSERT OR UPDATE OF room_id, trainer_id, day_of_week, start_time, duration ON class_schedule
+    FOR EACH ROW EXECUTE FUNCTION check_schedule_overlap();
+
+-- Class Seats (one row per seat, so members booking the same class claim different rows in parallel)
+CREATE TABLE class_seats (
+    class_id INT NOT NULL REFERENCES class_schedule(class_id) ON DELETE CASCADE,
+    seat_no INT NOT NULL,
+    email VARCHAR(255) REFERENCES member_accounts(email) ON DELETE SET NULL, -- NULL while the seat is free; Admin frees a deleted member's seats first, through Enrollment.release_all
+    enrolled_at TIMESTAMP,
+    PRIMARY KEY (class_id, seat_no)
+);
+
+CREATE INDEX class_seats_free_idx ON class_seats (class_id, seat_no) WHERE email IS NULL;
+CREATE UNIQUE INDEX class_seats_email_idx ON class_seats (email, class_id) WHERE email IS NOT NULL;
+
+-- Class Waitlist (served in waitlist_id order)
+CREATE TABLE class_waitlist (
+    waitlist_id BIGSERIAL PRIMARY KEY,
+    class_id INT NOT NULL REFERENCES class_schedule(class_id) ON DELETE CASCADE,
+    email VARCHAR(255) NOT NULL REFERENCES member_accounts(email) ON DELETE CASCADE,
+    joined_at TIMESTAMP NOT NULL DEFAULT now(),
+    UNIQUE (email, class_id)
 );
 
--- Create Payment Table
+CREATE INDEX class_waitlist_class_id_idx ON class_waitlist (class_id, waitlist_id);
+
+-- Moves waitlisted members into a class's free seats, first come first served. Callers hold the class's
+-- waitlist lock, pg_advisory_xact_lock(3006, class_id), which also serializes joining the waitlist with
+-- seats being freed, so nobody is left waiting while a seat stands empty.
+CREATE FUNCTION promote_waitlist(target_class_id INT) RETURNS SETOF VARCHAR AS $$
+    WITH queue AS (
+        SELECT waitlist_id, email, row_number() OVER (ORDER BY waitlist_id) AS n
+        FROM class_waitlist
+        WHERE class_id = target_class_id
+    ), free AS (
+        SELECT seat_no, row_number() OVER (ORDER BY seat_no) AS n
+        FROM (
+            SELECT seat_no
+            FROM class_seats
+            WHERE class_id = target_class_id AND email IS NULL
+            ORDER BY seat_no
+            FOR UPDATE SKIP LOCKED
+        ) unclaimed
+    ), moved AS (
+        DELETE FROM class_waitlist w
+        USING queue q JOIN free f ON f.n = q.n
+        WHERE w.waitlist_id = q.waitlist_id
+        RETURNING q.email, f.seat_no
+    )
+    UPDATE class_seats s
+    SET email = moved.email, enrolled_at = now()
+    FROM moved
+    WHERE s.class_id = target_class_id AND s.seat_no = moved.seat_no AND s.email IS NULL
+    RETURNING s.email
+$$ LANGUAGE SQL;
+
+-- New classes get their seats in one statement per insert
+CREATE FUNCTION create_class_seats() RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO class_seats (class_id, seat_no)
+    SELECT c.class_id, g
+    FROM new_classes c, generate_series(1, c.capacity) g;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER class_schedule_create_seats
+    AFTER INSERT ON class_schedule
+    REFERENCING NEW TABLE AS new_classes
+    FOR EACH STATEMENT EXECUTE FUNCTION create_class_seats();
+
+-- A bigger class gets the extra seats and fills them from the waitlist; a smaller one drops its free seats
+-- above the new capacity (taken ones stay until they are cancelled)
+CREATE FUNCTION resize_class_seats() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(3006, NEW.class_id);
+    INSERT INTO class_seats (class_id, seat_no)
+    SELECT NEW.class_id, g
+    FROM generate_series(1, NEW.capacity) g
+    ON CONFLICT DO NOTHING;
+    DELETE FROM class_seats
+    WHERE class_id = NEW.class_id AND seat_no > NEW.capacity AND email IS NULL;
+    PERFORM promote_waitlist(NEW.class_id);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER class_schedule_resize_seats
+    AFTER UPDATE OF capacity ON class_schedule
+    FOR EACH ROW WHEN (NEW.capacity IS DISTINCT FROM OLD.capacity)
+    EXECUTE FUNCTION resize_class_seats();
+
+-- Create Payment Table (range-partitioned by month of payment_date)
 CREATE TABLE payments (
-    payment_id SERIAL PRIMARY KEY,
+    payment_id SERIAL,
     email VARCHAR(255) REFERENCES member_accounts(email),
     amount DECIMAL(10, 2) NOT NULL,
     payment_date DATE NOT NULL,
     payment_type VARCHAR(255) NOT NULL,
-    status VARCHAR(50) NOT NULL
-);
\ No newline at end of file
+    status VARCHAR(50) NOT NULL,
+    billing_period DATE, -- Set only for recurring membership charges created by a billing run
+    PRIMARY KEY (payment_id, payment_date)
+) PARTITION BY RANGE (payment_date);
+
+-- Catches payments for months whose partition has not been created yet
+CREATE TABLE payments_default PARTITION OF payments DEFAULT;
+
+CREATE INDEX payments_email_idx ON payments (email);
+CREATE INDEX payments_status_idx ON payments (status, payment_date);
+
+-- One recurring charge per member per billing period, so billing runs are restartable
+-- (billing charges are dated on their billing period, so including payment_date keeps the same guarantee)
+CREATE UNIQUE INDEX payments_email_billing_period_key ON payments (email, billing_period, payment_date);
+
+-- Creates the monthly partition holding month_start, moving any matching rows out of the default partition
+CREATE FUNCTION create_payment_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    first_day DATE := date_trunc('month', month_start)::DATE;
+    next_day DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := 'payments_' || to_char(date_trunc('month', month_start), 'YYYY_MM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE payments INCLUDING DEFAULTS)', partition_name);
+    EXECUTE format(
+        'WITH moved AS (DELETE FROM payments_default WHERE payment_date >= %L AND payment_date < %L RETURNING *) '
+        'INSERT INTO %I SELECT * FROM moved', first_day, next_day, partition_name);
+    EXECUTE format('ALTER TABLE payments ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, first_day, next_day);
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Payment Archives (monthly partitions moved out of the database into compressed files)
+CREATE TABLE payment_archives (
+    partition_name TEXT PRIMARY KEY,
+    range_start DATE NOT NULL,
+    range_end DATE NOT NULL,
+    row_count BIGINT NOT NULL,
+    file_path TEXT NOT NULL,
+    archived_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- Schedule Version (bumped whenever bookings or classes change so cached reports can be invalidated)
+CREATE TABLE schedule_version (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO schedule_version DEFAULT VALUES;
+
+CREATE FUNCTION bump_schedule_version() RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE schedule_version SET version = version + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_schedule_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON bookings
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version();
+
+CREATE TRIGGER class_schedule_schedule_version
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON class_schedule
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_schedule_version();
+
+-- Every added, edited or deleted booking or class is announced on `schedule_changes` so the in-memory
+-- timetable (see Timetable.py) repaints just that session; a TRUNCATE asks for a full reload. The trigger
+-- argument names the table's id column.
+CREATE FUNCTION notify_schedule_change() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_LEVEL = 'STATEMENT' THEN
+        PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME)::TEXT);
+    ELSE
+        -- Identical notifications in one transaction are sent once, so an update normally sends one
+        IF TG_OP <> 'INSERT' THEN
+            PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME,
+                'id', to_jsonb(OLD) -> TG_ARGV[0])::TEXT);
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            PERFORM pg_notify('schedule_changes', json_build_object('table', TG_TABLE_NAME,
+                'id', to_jsonb(NEW) -> TG_ARGV[0])::TEXT);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bookings_schedule_change
+    AFTER INSERT OR UPDATE OR DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION notify_schedule_change('booking_id');
+
+CREATE TRIGGER bookings_schedule_truncate
+    AFTER TRUNCATE ON bookings
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_schedule_change();
+
+CREATE TRIGGER class_schedule_schedule_change
+    AFTER INSERT OR UPDATE OF class_name, trainer_id, room_id, day_of_week, start_time, duration, capacity OR DELETE ON class_schedule
+    FOR EACH ROW EXECUTE FUNCTION notify_schedule_change('class_id');
+
+CREATE TRIGGER class_schedule_schedule_truncate
+    AFTER TRUNCATE ON class_schedule
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_schedule_change();
+
+-- Schema Migrations (versions of migrations/*.sql already reflected in this file)
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+INSERT INTO schema_migrations (version, name) VALUES
+    (1, 'schedule_version'),
+    (2, 'partitioned_payments'),
+    (3, 'foreign_key_indexes'),
+    (4, 'achievement_bitmask'),
+    (5, 'leaderboards'),
+    (6, 'workouts'),
+    (7, 'equipment_telemetry'),
+    (8, 'equipment_alerts'),
+    (9, 'catalog_notifications'),
+    (10, 'trainer_availability_bitmask'),
+    (11, 'schedule_ranges'),
+    (12, 'class_enrollment'),
+    (13, 'schedule_notifications'),
+    (14, 'room_occupancy'),
+    (15, 'member_check_in'),
+    (16, 'day_passes'),
+    (17, 'stamina_recovery'),
+    (18, 'waitlist_promotion'),
+    (19, 'schedule_week_end'),
+    (20, 'day_pass_timestamptz'),
+    (21, 'leaderboard_score_counts');